@@ -0,0 +1,188 @@
+"""
+AMOKK Backend - Authenticated sessions
+Bearer tokens issued at login, kept in an in-memory index with expiry
+"""
+
+import hashlib
+import json
+import logging
+import secrets
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional
+
+from persistence import atomic_write_json
+
+logger = logging.getLogger("amokk")
+
+
+class TokenEntry(NamedTuple):
+    email: str
+    expires_at: float  # Wall-clock (time.time()) expiry
+
+
+def token_digest(token: str) -> str:
+    """Index key of a token: its SHA-256, so neither memory lookups nor the file hold it"""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class TokenStore:
+    """
+    Issued bearer tokens and the account each one belongs to
+
+    Tokens are looked up by digest in a dict: one hash and one dict probe
+    per request, whatever the number of tokens, and no disk access. A
+    lookup by digest can't leak how much of a guessed token matched.
+
+    Every token gets the same lifetime, so the dict's insertion order is
+    also expiry order: expired tokens are dropped when they are presented
+    and, from the oldest end, whenever a new one is issued. No timer scans
+    the index.
+
+    The index is written to `path` (digest -> [email, expires_at]) when a
+    token is issued or revoked, which is rare, so sessions survive a
+    restart of the backend.
+
+    With several worker processes (`lock`, an inter-process lock), the
+    file is the source of truth between them: issue/revoke re-read it and
+    save under the lock, and a lookup re-reads it when another worker has
+    changed it since (one stat() per lookup, the file is only read then).
+    """
+
+    def __init__(self, path: Path, ttl: float, lock=None):
+        self.path = path
+        self.ttl = ttl
+        self.lock = lock
+        self._tokens: Dict[str, TokenEntry] = {}
+        self._loaded_stamp = None
+        self.issued = 0
+        self.revoked = 0
+        self.expired = 0
+        self.rejected = 0
+
+    def load(self):
+        """Read persisted tokens, skipping expired ones"""
+        if not self.path.exists():
+            return
+        try:
+            self._loaded_stamp = self._stamp()
+            with open(self.path, 'r') as f:
+                stored = json.load(f)
+        except Exception as e:
+            logger.warning(f"⚠️  Error loading sessions: {e}. Starting without any.")
+            return
+        now = time.time()
+        entries = sorted(
+            (expires_at, digest, email)
+            for digest, (email, expires_at) in stored.items()
+            if expires_at > now
+        )
+        self._tokens = {digest: TokenEntry(email, expires_at) for expires_at, digest, email in entries}
+        if self._tokens and self.lock is None:
+            logger.info(f"✅ {len(self._tokens)} session(s) restored")
+
+    def _stamp(self) -> tuple:
+        # Saves replace the file, so the inode changes even within the mtime granularity
+        stat = self.path.stat()
+        return stat.st_ino, stat.st_mtime_ns
+
+    def _reload_if_changed(self) -> bool:
+        """Re-read the file if another process saved it since (multi-worker mode)"""
+        try:
+            stamp = self._stamp()
+        except OSError:
+            return False
+        if stamp == self._loaded_stamp:
+            return False
+        self.load()
+        return True
+
+    def issue(self, email: str) -> str:
+        """Mint a token for email; returns the token itself (never stored)"""
+        token = secrets.token_urlsafe(32)
+        with self._locked():
+            self._sweep(time.time())
+            self._tokens[token_digest(token)] = TokenEntry(email, time.time() + self.ttl)
+            self.issued += 1
+            self._save()
+        return token
+
+    def validate(self, token: str) -> Optional[TokenEntry]:
+        """Entry of a live token, or None if unknown or expired"""
+        if self.lock is not None:
+            self._reload_if_changed()  # Tokens issued or revoked by another worker
+        digest = token_digest(token)
+        entry = self._tokens.get(digest)
+        if entry is None:
+            self.rejected += 1
+            return None
+        if entry.expires_at <= time.time():
+            # Dropped from memory now, from the file at the next issue/revoke
+            del self._tokens[digest]
+            self.expired += 1
+            self.rejected += 1
+            return None
+        return entry
+
+    def revoke(self, token: str) -> bool:
+        """Invalidate token; returns whether it was live"""
+        with self._locked():
+            entry = self._tokens.pop(token_digest(token), None)
+            if entry is None:
+                return False
+            self.revoked += 1
+            self._save()
+        return True
+
+    def revoke_all(self, email: str) -> int:
+        """Invalidate every token of email; returns how many were dropped"""
+        with self._locked():
+            digests = [digest for digest, entry in self._tokens.items() if entry.email == email]
+            for digest in digests:
+                del self._tokens[digest]
+            if digests:
+                self.revoked += len(digests)
+                self._save()
+        return len(digests)
+
+    def __len__(self) -> int:
+        return len(self._tokens)
+
+    def _sweep(self, now: float):
+        """Drop expired tokens from the oldest end of the index"""
+        while self._tokens:
+            digest = next(iter(self._tokens))
+            if self._tokens[digest].expires_at > now:
+                break
+            del self._tokens[digest]
+            self.expired += 1
+
+    @contextmanager
+    def _locked(self):
+        """Inter-process lock held around a read-modify-save of the file (no-op with one process)"""
+        if self.lock is None:
+            yield
+            return
+        with self.lock:
+            self._reload_if_changed()
+            yield
+
+    def _save(self):
+        try:
+            atomic_write_json(self.path, {
+                digest: [entry.email, entry.expires_at] for digest, entry in self._tokens.items()
+            })
+            self._loaded_stamp = self._stamp()
+        except OSError as e:
+            logger.error(f"❌ Could not save sessions: {e}")
+
+
+def bearer_token(authorization: Optional[str]) -> Optional[str]:
+    """Token from an "Authorization: Bearer <token>" header value"""
+    if not authorization:
+        return None
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    return token.strip()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark: overhead of session token validation on GET /get_local_data
+
+Alternates rounds with authentication disabled and enabled (in-process,
+ASGI transport, token sent as a bearer header) and reports the
+per-request difference, plus the cost of TokenStore.validate() alone
+with 1 and --tokens live tokens in the index (it should not grow).
+
+Usage:
+    pip install -r backend/requirements-bench.txt
+    python backend/benchmarks/bench_auth_overhead.py [--requests 2000] [--rounds 5] [--tokens 10000]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("STATE_FILE", str(Path(tempfile.mkdtemp()) / "state.json"))
+os.environ.setdefault("RATE_LIMIT", "0")  # Measures the endpoints, not the limiter; see bench_rate_limit.py
+
+import logging  # noqa: E402
+import httpx  # noqa: E402
+import main  # noqa: E402
+from auth import TokenStore  # noqa: E402
+
+logging.getLogger("amokk").setLevel(logging.WARNING)
+
+
+async def per_request_us(client: httpx.AsyncClient, requests: int) -> float:
+    started = time.perf_counter()
+    for _ in range(requests):
+        await client.get("/get_local_data")
+    return (time.perf_counter() - started) / requests * 1e6
+
+
+def validate_us(tokens: int) -> float:
+    """Cost of one validate() with `tokens` live tokens in the index"""
+    store = TokenStore(Path(tempfile.mkdtemp()) / "sessions.json", ttl=3600)
+    store._save = lambda: None  # Measure the index, not the file writes
+    token = store.issue("bench@amokk.fr")
+    for i in range(tokens - 1):
+        store.issue(f"user{i}@amokk.fr")
+    return timeit.timeit(lambda: store.validate(token), number=100_000) / 100_000 * 1e6
+
+
+async def run(requests: int, rounds: int, tokens: int):
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        response = await client.post("/login", json={"email": "admin@amokk.fr", "password": "admin"})
+        client.headers["Authorization"] = f"Bearer {response.json()['token']}"
+        for _ in range(200):  # warm-up
+            await client.get("/get_local_data")
+        timings = {False: [], True: []}
+        for _ in range(rounds):
+            for enabled in (False, True):
+                main.AUTH_ENABLED = enabled
+                timings[enabled].append(await per_request_us(client, requests))
+
+    off = statistics.median(timings[False])
+    on = statistics.median(timings[True])
+
+    print(f"\nGET /get_local_data, median of {rounds} rounds x {requests} requests")
+    print(f"  auth off: {off:8.1f} us/request")
+    print(f"  auth on:  {on:8.1f} us/request")
+    print(f"  overhead: {on - off:8.1f} us/request ({(on - off) / off * 100:+.1f}%)")
+    print(f"  validate() alone, 1 token:       {validate_us(1):.2f} us")
+    print(f"  validate() alone, {tokens} tokens: {validate_us(tokens):.2f} us\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Session token validation overhead on /get_local_data")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--tokens", type=int, default=10_000)
+    args = parser.parse_args()
+    asyncio.run(run(args.requests, args.rounds, args.tokens))
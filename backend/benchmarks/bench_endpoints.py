@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Latency / throughput benchmark suite for the backend endpoints
+
+Drives every hot endpoint with a configurable number of concurrent clients
+and records throughput and p50/p95/p99 latency, over two transports:
+- asgi: the app in-process through httpx's ASGI transport (no sockets),
+  isolates the cost of main.py itself
+- http: a real uvicorn server in a child process over loopback HTTP,
+  includes the server, parsing and socket overhead the frontend sees
+
+Results are written as JSON. With --baseline, they are compared against a
+previous result file and regressions beyond --threshold are flagged (exit
+status 1), so a change to main.py can be checked before it ships.
+
+Both transports run against throwaway state files, with a session token
+from POST /login sent on every request (as the frontend does).
+
+Usage:
+    pip install -r backend/requirements-bench.txt
+    python backend/benchmarks/bench_endpoints.py [--requests 2000] [--concurrency 1,8]
+        [--transport asgi,http] [--output results.json] [--baseline baseline.json]
+    python backend/benchmarks/bench_endpoints.py --compare results.json --baseline baseline.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+os.environ.setdefault("STATE_FILE", str(Path(tempfile.mkdtemp()) / "state.json"))
+os.environ.setdefault("RATE_LIMIT", "0")  # Measures the endpoints, not the limiter; see bench_rate_limit.py
+
+import logging  # noqa: E402
+import httpx  # noqa: E402
+import main  # noqa: E402
+
+logging.getLogger("amokk").setLevel(logging.WARNING)
+
+DEFAULT_OUTPUT = BACKEND_DIR / "benchmarks" / "results" / "endpoints.json"
+
+# Metrics compared against the baseline; True when higher is better
+COMPARED_METRICS = {"rps": True, "p50_ms": False, "p95_ms": False, "p99_ms": False}
+
+
+class Scenario(NamedTuple):
+    name: str
+    method: str
+    path: str
+    # Request body for the i-th request (None for no body)
+    body: Optional[Callable[[int], dict]] = None
+
+
+SCENARIOS = [
+    Scenario("get_local_data", "GET", "/get_local_data"),
+    Scenario("status", "GET", "/status"),
+    Scenario("session", "GET", "/session"),
+    Scenario("coach_toggle", "PUT", "/coach_toggle", lambda i: {"active": i % 2 == 0}),
+    Scenario("assistant_toggle", "PUT", "/assistant_toggle", lambda i: {"active": i % 2 == 0}),
+    Scenario("amokk_toggle", "PUT", "/amokk_toggle", lambda i: {"active": i % 2 == 0}),
+    Scenario("proactive_coach_toggle", "PUT", "/mock_proactive_coach_toggle"),
+    Scenario("update_ptt_key", "PUT", "/update_ptt_key", lambda i: {"ptt_key": "V" if i % 2 else "T"}),
+    Scenario("update_volume", "PUT", "/update_volume", lambda i: {"volume": i % 101}),
+    Scenario("patch_config", "PATCH", "/config", lambda i: {"coach_toggle": i % 2 == 0, "tts_volume": i % 101}),
+    Scenario("login", "POST", "/login", lambda i: {"email": "admin@amokk.fr", "password": "admin"}),
+    Scenario("select_plan", "POST", "/mock_select_plan", lambda i: {"plan_id": 1 + i % 3}),
+]
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[rank]
+
+
+async def run_scenario(client: httpx.AsyncClient, scenario: Scenario, requests: int, concurrency: int) -> dict:
+    """Issue `requests` requests from `concurrency` concurrent clients"""
+    latencies: List[float] = []
+    errors = 0
+    next_index = 0
+
+    async def worker():
+        nonlocal next_index, errors
+        while next_index < requests:
+            i = next_index
+            next_index += 1
+            body = scenario.body(i) if scenario.body is not None else None
+            started = time.perf_counter()
+            response = await client.request(scenario.method, scenario.path, json=body)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+
+    # Warm-up (connection setup, first-call caches)
+    for i in range(min(50, requests)):
+        body = scenario.body(i) if scenario.body is not None else None
+        await client.request(scenario.method, scenario.path, json=body)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 1),
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 4),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 4),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 4),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 4),
+        "max_ms": round(latencies[-1] * 1000, 4),
+    }
+
+
+async def authenticate(client: httpx.AsyncClient):
+    """Log in once and send the session token with every later request"""
+    response = await client.post("/login", json={"email": "admin@amokk.fr", "password": "admin"})
+    response.raise_for_status()
+    client.headers["Authorization"] = f"Bearer {response.json()['token']}"
+
+
+async def run_suite(client: httpx.AsyncClient, scenarios: List[Scenario], requests: int,
+                    concurrency_levels: List[int]) -> Dict[str, dict]:
+    await authenticate(client)
+    results = {}
+    for concurrency in concurrency_levels:
+        for scenario in scenarios:
+            key = f"{scenario.name}@c{concurrency}"
+            results[key] = await run_scenario(client, scenario, requests, concurrency)
+            print(f"  {key:<32}{results[key]['rps']:>10.0f} req/s"
+                  f"  p50 {results[key]['p50_ms']:.3f} ms  p99 {results[key]['p99_ms']:.3f} ms")
+    return results
+
+
+async def bench_asgi(scenarios, requests, concurrency_levels) -> Dict[str, dict]:
+    # No lifespan events through the ASGI transport: start what startup would
+    main.app_state.writer.start()
+    main.event_hub.bind(asyncio.get_running_loop())
+    try:
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            return await run_suite(client, scenarios, requests, concurrency_levels)
+    finally:
+        main.app_state.close()
+
+
+def free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def bench_http(scenarios, requests, concurrency_levels) -> Dict[str, dict]:
+    port = free_port()
+    env = dict(os.environ, STATE_FILE=str(Path(tempfile.mkdtemp()) / "state.json"))
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1",
+         "--port", str(port), "--log-level", "warning"],
+        cwd=str(BACKEND_DIR), env=env, stdout=subprocess.DEVNULL,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    limits = httpx.Limits(max_connections=max(concurrency_levels), max_keepalive_connections=max(concurrency_levels))
+    try:
+        async with httpx.AsyncClient(base_url=base_url, limits=limits) as client:
+            deadline = time.monotonic() + 20
+            while True:
+                try:
+                    if (await client.get("/status")).status_code == 200:
+                        break
+                except httpx.TransportError:
+                    pass
+                if server.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError("uvicorn did not start")
+                await asyncio.sleep(0.05)
+            return await run_suite(client, scenarios, requests, concurrency_levels)
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+
+TRANSPORTS = {"asgi": bench_asgi, "http": bench_http}
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> List[str]:
+    """Return one line per metric that got worse than baseline by more than threshold"""
+    regressions = []
+    for transport, results in current["results"].items():
+        for key, metrics in results.items():
+            reference = baseline.get("results", {}).get(transport, {}).get(key)
+            if reference is None:
+                continue
+            for metric, higher_is_better in COMPARED_METRICS.items():
+                old, new = reference.get(metric), metrics.get(metric)
+                if not old or new is None:
+                    continue
+                change = (new - old) / old
+                worse = -change if higher_is_better else change
+                if worse > threshold:
+                    regressions.append(f"{transport} {key} {metric}: {old} -> {new} ({change:+.1%})")
+    return regressions
+
+
+async def run(args) -> dict:
+    scenarios = [s for s in SCENARIOS if not args.only or s.name in args.only]
+    results = {}
+    for transport in args.transport:
+        print(f"\n[{transport}] {args.requests} requests per endpoint")
+        results[transport] = await TRANSPORTS[transport](scenarios, args.requests, args.concurrency)
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+        },
+        "results": results,
+    }
+
+
+def csv_list(value: str) -> List[str]:
+    return [item for item in value.split(",") if item]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backend endpoint latency/throughput benchmark")
+    parser.add_argument("--requests", type=int, default=2000, help="requests per endpoint and concurrency level")
+    parser.add_argument("--concurrency", type=lambda v: [int(c) for c in csv_list(v)], default=[1, 8],
+                        help="comma-separated concurrency levels (default: 1,8)")
+    parser.add_argument("--transport", type=csv_list, default=["asgi", "http"],
+                        help="comma-separated transports: asgi, http (default: both)")
+    parser.add_argument("--only", type=csv_list, default=[], help="comma-separated scenario names")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT, help="where to write the JSON results")
+    parser.add_argument("--baseline", type=Path, help="result file to compare against")
+    parser.add_argument("--compare", type=Path, help="compare this result file to --baseline without running")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="relative change counted as a regression (default: 0.15)")
+    args = parser.parse_args()
+
+    unknown = set(args.transport) - set(TRANSPORTS)
+    if unknown:
+        parser.error(f"unknown transport(s): {', '.join(sorted(unknown))}")
+
+    if args.compare:
+        if not args.baseline:
+            parser.error("--compare requires --baseline")
+        current = json.loads(args.compare.read_text())
+    else:
+        current = asyncio.run(run(args))
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(current, indent=2) + "\n")
+        print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        regressions = compare(current, json.loads(args.baseline.read_text()), args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) beyond {args.threshold:.0%} vs {args.baseline}:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"\n✅ No regression beyond {args.threshold:.0%} vs {args.baseline}")
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Benchmark: POST /ingest cost and behaviour under a lagging consumer
+
+1. Cost: --requests batches from GameSimulator (gen_game_events.py) through
+   the app, binary vs JSON bodies, per request and per event; plus
+   EventRing.put() alone and the consumer's apply() per event.
+2. Lag: a producer at --hz batches/s for --seconds against a consumer
+   draining only --consumer-rate events/s from a --ring slot ring, once
+   with INGEST_OVERFLOW drop_oldest and once with reject; reports what
+   was accepted, dropped and refused, and the backlog at the end.
+
+In-process (ASGI transport), AUTH=0, RATE_LIMIT=0.
+
+Usage:
+    pip install -r backend/requirements-bench.txt
+    python backend/benchmarks/bench_ingest.py [--requests 2000] [--hz 30] [--players 10] [--seconds 5] [--ring 512]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+os.environ.setdefault("STATE_FILE", str(Path(tempfile.mkdtemp()) / "state.json"))
+os.environ.setdefault("AUTH", "0")
+os.environ.setdefault("RATE_LIMIT", "0")
+
+import logging  # noqa: E402
+import httpx  # noqa: E402
+import main  # noqa: E402
+from gen_game_events import GameSimulator  # noqa: E402
+from ingest import DROP_OLDEST, RECORD, REJECT, EventRing, LiveGame  # noqa: E402
+
+BINARY = {"Content-Type": "application/octet-stream"}
+
+
+async def cost(client: httpx.AsyncClient, requests: int, players: int):
+    simulator = GameSimulator(players)
+    batches = [simulator.tick() for _ in range(requests)]
+    bodies = [b"".join(RECORD.pack(*event) for event in batch) for batch in batches]
+    events = sum(len(batch) for batch in batches)
+
+    results = {}
+    for name, send in (
+        ("binary", lambda i: client.post("/ingest", content=bodies[i], headers=BINARY)),
+        ("json", lambda i: client.post("/ingest", json={"events": batches[i]})),
+    ):
+        for i in range(min(200, requests)):  # warm-up
+            await send(i)
+        started = time.perf_counter()
+        for i in range(requests):
+            await send(i)
+        elapsed = time.perf_counter() - started
+        results[name] = elapsed
+        main.ingest_consumer.tick()
+
+    print(f"\nPOST /ingest, {requests} batches of ~{events / requests:.0f} events ({players} players)")
+    for name, elapsed in results.items():
+        print(f"  {name:<7}{elapsed / requests * 1e6:9.1f} us/request{elapsed / events * 1e6:8.2f} us/event")
+
+    ring = EventRing(capacity=1 << 16)
+    body = bodies[0]
+    per_put = timeit.timeit(lambda: ring.put(body), number=20000) / 20000
+    per_pack = timeit.timeit(lambda: ring.put_events(batches[0]), number=20000) / 20000
+    chunk = b"".join(bodies[:100])
+    game = LiveGame()
+    per_apply = timeit.timeit(lambda: game.apply(chunk), number=200) / 200
+    count = len(body) // RECORD.size
+    print(f"  EventRing.put() (binary):  {per_put / count * 1e9:7.0f} ns/event")
+    print(f"  EventRing.put_events():    {per_pack / count * 1e9:7.0f} ns/event")
+    print(f"  LiveGame.apply():          {per_apply / (len(chunk) // RECORD.size) * 1e9:7.0f} ns/event")
+
+
+async def lag(client: httpx.AsyncClient, hz: float, players: int, seconds: float, consumer_rate: int, size: int):
+    consumer = main.ingest_consumer
+    print(f"\nLagging consumer: {hz:g} batches/s of {players} players for {seconds:g} s, "
+          f"consumer {consumer_rate} events/s, ring of {size}")
+    for overflow in (DROP_OLDEST, REJECT):
+        ring = EventRing(capacity=size, overflow=overflow)
+        main.event_ring = consumer.ring = ring
+        consumer.batch = max(1, int(consumer_rate * consumer.interval))
+        simulator = GameSimulator(players, hz)
+        sent = refused = 0
+        started = time.perf_counter()
+        due = started
+        while due < started + seconds:
+            await asyncio.sleep(max(0.0, due - time.perf_counter()))
+            due += 1 / hz
+            body = simulator.tick_binary()
+            sent += len(body) // RECORD.size
+            response = await client.post("/ingest", content=body, headers=BINARY)
+            refused += response.status_code == 429
+        print(f"  {overflow:<12} sent {sent}, accepted {ring.received}, dropped {ring.dropped}, "
+              f"refused {refused} batches ({ring.rejected} events), backlog {ring.depth}")
+
+
+async def run(requests: int, hz: float, players: int, seconds: float, consumer_rate: int, size: int):
+    logging.getLogger("amokk").setLevel(logging.WARNING)
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        main.ingest_consumer.start()
+        await cost(client, requests, players)
+        await lag(client, hz, players, seconds, consumer_rate, size)
+        await main.ingest_consumer.stop()
+    print()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="POST /ingest cost and lagging-consumer behaviour")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--hz", type=float, default=30)
+    parser.add_argument("--players", type=int, default=10)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--consumer-rate", type=int, default=200, help="events/s the slowed consumer drains")
+    parser.add_argument("--ring", type=int, default=512, help="ring capacity (events) in the lag runs")
+    args = parser.parse_args()
+    asyncio.run(run(args.requests, args.hz, args.players, args.seconds, args.consumer_rate, args.ring))
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Benchmark: read latency while logins are being verified
+
+A dashboard poller issues GET /get_local_data every --interval ms while
+--concurrency login loops keep POST /login busy with the scrypt hash of
+the credential store. Reports the poller's p50/p99/max, counted from when
+each poll was due, in three runs:
+- idle:   no logins (baseline)
+- pool:   logins verified on the credential pool (CredentialStore.verify)
+- inline: the same hash computed on the event loop, as a plain password
+          check in the endpoint would
+
+In-process (ASGI transport), AUTH=0, RATE_LIMIT=0, login backoff off.
+
+Usage:
+    pip install -r backend/requirements-bench.txt
+    python backend/benchmarks/bench_login.py [--seconds 5] [--concurrency 4] [--interval 5]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("STATE_FILE", str(Path(tempfile.mkdtemp()) / "state.json"))
+os.environ.setdefault("AUTH", "0")
+os.environ.setdefault("RATE_LIMIT", "0")
+
+import logging  # noqa: E402
+import httpx  # noqa: E402
+import main  # noqa: E402
+
+LOGIN = {"email": "admin@amokk.fr", "password": "admin"}
+
+
+async def verify_inline(email: str, password: str) -> bool:
+    """CredentialStore.verify without the pool: hashes on the event loop"""
+    return main.credential_store._check(email, password)
+
+
+async def poll(client: httpx.AsyncClient, seconds: float, interval: float) -> list:
+    """
+    Latency of each poll measured from when it was due (fixed schedule), so
+    polls that couldn't even start while the loop was blocked count too
+    """
+    latencies = []
+    started = time.perf_counter()
+    due = started
+    while due < started + seconds:
+        await asyncio.sleep(max(0.0, due - time.perf_counter()))
+        await client.get("/get_local_data")
+        now = time.perf_counter()
+        while due <= now and due < started + seconds:
+            latencies.append((now - due) * 1000)
+            due += interval
+    return latencies
+
+
+async def logins(client: httpx.AsyncClient, seconds: float) -> int:
+    count = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        response = await client.post("/login", json=LOGIN)
+        count += response.status_code == 200
+    return count
+
+
+async def scenario(client: httpx.AsyncClient, seconds: float, concurrency: int, interval: float):
+    results = await asyncio.gather(
+        poll(client, seconds, interval),
+        *(logins(client, seconds) for _ in range(concurrency)),
+    )
+    latencies = sorted(results[0])
+    p99 = latencies[max(0, int(len(latencies) * 0.99) - 1)]
+    return statistics.median(latencies), p99, latencies[-1], sum(results[1:]) / seconds
+
+
+async def run(seconds: float, concurrency: int, interval: float):
+    logging.getLogger("amokk").setLevel(logging.WARNING)
+    main.login_backoff.free_attempts = 10 ** 9
+    store = main.credential_store
+    pooled = store.verify
+
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.post("/login", json=LOGIN)  # Hashes the default account, starts the pool
+        for _ in range(200):
+            await client.get("/get_local_data")
+
+        print(f"\nGET /get_local_data every {interval * 1000:g} ms for {seconds:g} s, "
+              f"{concurrency} login loops, scrypt n={store.params.n}, {store.workers} pool threads, "
+              f"{os.cpu_count()} CPU(s)")
+        print(f"{'':8}{'p50 ms':>9}{'p99 ms':>9}{'max ms':>9}{'logins/s':>10}")
+        for name, verify, loops in (("idle", pooled, 0), ("pool", pooled, concurrency),
+                                    ("inline", verify_inline, concurrency)):
+            store.verify = verify
+            p50, p99, worst, rate = await scenario(client, seconds, loops, interval)
+            print(f"{name:<8}{p50:>9.2f}{p99:>9.2f}{worst:>9.2f}{rate:>10.1f}")
+        store.verify = pooled
+    store.close()
+    print()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Read latency with logins in flight: pool vs inline hashing")
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--concurrency", type=int, default=4, help="concurrent login loops")
+    parser.add_argument("--interval", type=float, default=5, help="ms between polls")
+    args = parser.parse_args()
+    asyncio.run(run(args.seconds, args.concurrency, args.interval / 1000))
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark: overhead of the metrics middleware on GET /get_local_data
+
+Alternates rounds with the middleware disabled and enabled (in-process,
+ASGI transport) and reports the per-request difference, plus the cost of
+the recording step alone (counter + histogram update).
+
+Usage:
+    pip install -r backend/requirements-bench.txt
+    python backend/benchmarks/bench_metrics_overhead.py [--requests 2000] [--rounds 5]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("STATE_FILE", str(Path(tempfile.mkdtemp()) / "state.json"))
+os.environ.setdefault("RATE_LIMIT", "0")  # Measures the endpoints, not the limiter; see bench_rate_limit.py
+os.environ.setdefault("AUTH", "0")  # Isolates the metrics middleware; see bench_auth_overhead.py
+
+import logging  # noqa: E402
+import httpx  # noqa: E402
+import main  # noqa: E402
+
+logging.getLogger("amokk").setLevel(logging.WARNING)
+
+
+async def per_request_us(client: httpx.AsyncClient, requests: int) -> float:
+    started = time.perf_counter()
+    for _ in range(requests):
+        await client.get("/get_local_data")
+    return (time.perf_counter() - started) / requests * 1e6
+
+
+async def run(requests: int, rounds: int):
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(200):  # warm-up
+            await client.get("/get_local_data")
+        timings = {False: [], True: []}
+        for _ in range(rounds):
+            for enabled in (False, True):
+                main.metrics_registry.enabled = enabled
+                timings[enabled].append(await per_request_us(client, requests))
+
+    off = statistics.median(timings[False])
+    on = statistics.median(timings[True])
+
+    record_us = timeit.timeit(
+        lambda: (main.HTTP_REQUESTS.inc("GET", "/get_local_data", 200),
+                 main.HTTP_LATENCY.observe(0.0004, "/get_local_data")),
+        number=100_000,
+    ) / 100_000 * 1e6
+
+    print(f"\nGET /get_local_data, median of {rounds} rounds x {requests} requests")
+    print(f"  middleware off: {off:8.1f} us/request")
+    print(f"  middleware on:  {on:8.1f} us/request")
+    print(f"  overhead:       {on - off:8.1f} us/request ({(on - off) / off * 100:+.1f}%)")
+    print(f"  recording step alone: {record_us:.2f} us\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Metrics middleware overhead on /get_local_data")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(run(args.requests, args.rounds))
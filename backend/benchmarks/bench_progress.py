@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark: GET /progress queries against years of history
+
+Fills a throwaway history.db with --years of synthetic games and toggles
+(--per-day events a day), written in batches through HistoryStore so the
+rollups are maintained as in production, then compares, per query:
+- rollups: HistoryStore.rollups() / totals() (primary-key range over buckets)
+- scan:    the same numbers aggregated from the raw events table
+
+Usage:
+    python backend/benchmarks/bench_progress.py [--years 5] [--per-day 20] [--number 200]
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import logging  # noqa: E402
+from history import GAME, TOGGLE, WEEK, HistoryEvent, HistoryStore  # noqa: E402
+from metrics import process_rss_bytes  # noqa: E402
+
+logging.getLogger("amokk").setLevel(logging.WARNING)
+
+EMAIL = "bench@amokk.fr"
+
+
+def fill(store: HistoryStore, years: int, per_day: int) -> int:
+    """Write `years` of events ending now, one batch per day"""
+    rng = random.Random(42)
+    now = time.time()
+    days = years * 365
+    total = 0
+    for day in range(days, 0, -1):
+        day_start = now - day * 86400
+        batch = []
+        for _ in range(per_day):
+            ts = day_start + rng.uniform(0, 86400)
+            if rng.random() < 0.3:
+                duration = rng.uniform(900, 2700)
+                batch.append(HistoryEvent(ts, EMAIL, GAME, value=duration,
+                                          coached=duration if rng.random() < 0.8 else 0.0))
+            else:
+                batch.append(HistoryEvent(ts, EMAIL, TOGGLE, name="coach_toggle", value=1.0))
+        store._write(batch)
+        total += len(batch)
+    return total
+
+
+def scan_days(store: HistoryStore, days: int) -> list:
+    """Daily numbers aggregated from the raw events"""
+    since = time.time() - days * 86400
+    return store._db.execute(
+        "SELECT date(ts, 'unixepoch', 'localtime') AS day,"
+        " SUM(kind = ?), SUM(CASE WHEN kind = ? THEN value ELSE 0 END), SUM(coached), SUM(kind = ?) "
+        "FROM events WHERE email = ? AND ts >= ? GROUP BY day ORDER BY day",
+        (GAME, GAME, TOGGLE, EMAIL, since),
+    ).fetchall()
+
+
+def scan_totals(store: HistoryStore) -> tuple:
+    return store._db.execute(
+        "SELECT SUM(kind = ?), SUM(CASE WHEN kind = ? THEN value ELSE 0 END), SUM(coached), SUM(kind = ?) "
+        "FROM events WHERE email = ?",
+        (GAME, GAME, TOGGLE, EMAIL),
+    ).fetchone()
+
+
+def main_bench(years: int, per_day: int, number: int):
+    path = Path(tempfile.mkdtemp()) / "history.db"
+    # Keep every raw event, so the scan has the whole history to go through
+    store = HistoryStore(path, retention_days=years * 366 + 1)
+
+    started = time.perf_counter()
+    events = fill(store, years, per_day)
+    fill_s = time.perf_counter() - started
+    size = sum(p.stat().st_size for p in path.parent.iterdir())
+    print(f"\n{events} events over {years} years, written in {fill_s:.1f} s "
+          f"({fill_s / (years * 365) * 1000:.2f} ms per daily batch), {size / 1e6:.1f} MB on disk")
+
+    cases = [
+        ("last 30 days", lambda: store.rollups(EMAIL, "day", 30), lambda: scan_days(store, 30)),
+        ("last 365 days", lambda: store.rollups(EMAIL, "day", 365), lambda: scan_days(store, 365)),
+        ("last 52 weeks", lambda: store.rollups(EMAIL, WEEK, 52), lambda: scan_days(store, 364)),
+        ("all-time totals", lambda: store.totals(EMAIL), lambda: scan_totals(store)),
+    ]
+    print(f"\n{'':18}{'rollups':>12}{'raw scan':>12}{'speedup':>10}")
+    for name, rollups, scan in cases:
+        fast = timeit.timeit(rollups, number=number) / number * 1e3
+        slow = timeit.timeit(scan, number=max(1, number // 10)) / max(1, number // 10) * 1e3
+        print(f"{name:<18}{fast:>9.3f} ms{slow:>9.3f} ms{slow / fast:>9.1f}x")
+
+    rss = process_rss_bytes()
+    if rss:
+        print(f"\nprocess RSS after the run: {rss / 1e6:.1f} MB")
+    print()
+    store.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="GET /progress: rollups vs scanning raw events")
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--per-day", type=int, default=20, help="events per day")
+    parser.add_argument("--number", type=int, default=200, help="queries per timing")
+    args = parser.parse_args()
+    main_bench(args.years, args.per_day, args.number)
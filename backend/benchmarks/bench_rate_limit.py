@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Benchmark: rate limiter cost and behaviour under a flooding client
+
+1. Overhead: GET /get_local_data with the limiter off and on (limits high
+   enough that nothing is rejected), median of --rounds rounds, plus the
+   cost of one TokenBuckets.take() with 1 and 4096 live buckets.
+2. Flood: a runaway client fires --flood concurrent /get_local_data and
+   PUT /coach_toggle requests while a well-behaved client polls
+   /get_local_data and /healthz; reports what each client got.
+
+In-process (ASGI transport), AUTH=0.
+
+Usage:
+    pip install -r backend/requirements-bench.txt
+    python backend/benchmarks/bench_rate_limit.py [--requests 2000] [--rounds 5] [--flood 2000]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+import timeit
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("STATE_FILE", str(Path(tempfile.mkdtemp()) / "state.json"))
+os.environ.setdefault("AUTH", "0")
+
+import logging  # noqa: E402
+import httpx  # noqa: E402
+import main  # noqa: E402
+from ratelimit import Limit, TokenBuckets  # noqa: E402
+
+logging.getLogger("amokk").setLevel(logging.ERROR)
+
+
+async def per_request_us(client: httpx.AsyncClient, requests: int) -> float:
+    started = time.perf_counter()
+    for _ in range(requests):
+        await client.get("/get_local_data")
+    return (time.perf_counter() - started) / requests * 1e6
+
+
+def take_us(buckets: int) -> float:
+    """Cost of one take() with `buckets` live buckets"""
+    store = TokenBuckets(capacity=buckets)
+    limit = Limit(1e9, 1e9)
+    for i in range(buckets):
+        store.take((f"client{i}", "/get_local_data"), limit, time.monotonic())
+    key = ("client0", "/get_local_data")
+    return timeit.timeit(lambda: store.take(key, limit, time.monotonic()), number=200_000) / 200_000 * 1e6
+
+
+async def overhead(client: httpx.AsyncClient, requests: int, rounds: int):
+    limiter = main.rate_limiter
+    limiter.read = Limit(1e9, 1e9)
+    for _ in range(200):  # warm-up
+        await client.get("/get_local_data")
+    timings = {False: [], True: []}
+    for _ in range(rounds):
+        for enabled in (False, True):
+            limiter.enabled = enabled
+            timings[enabled].append(await per_request_us(client, requests))
+    off = statistics.median(timings[False])
+    on = statistics.median(timings[True])
+    print(f"\nGET /get_local_data, median of {rounds} rounds x {requests} requests")
+    print(f"  limiter off: {off:8.1f} us/request")
+    print(f"  limiter on:  {on:8.1f} us/request ({on - off:+.1f} us, {(on - off) / off * 100:+.1f}%)")
+    print(f"  take() alone, 1 bucket:     {take_us(1):.2f} us")
+    print(f"  take() alone, 4096 buckets: {take_us(4096):.2f} us")
+
+
+async def flood(client: httpx.AsyncClient, requests: int):
+    limiter = main.rate_limiter
+    limiter.enabled = True
+    limiter.read = Limit(20, 40)
+    limiter.write = Limit(10, 20)
+    runaway = {"X-Client-Id": "runaway"}
+    polite = {"X-Client-Id": "polite"}
+
+    async def hammer(i: int):
+        if i % 2:
+            response = await client.put("/coach_toggle", json={"active": bool(i % 4)}, headers=runaway)
+        else:
+            response = await client.get("/get_local_data", headers=runaway)
+        return response.status_code
+
+    async def poll(duration: float):
+        results = Counter()
+        latencies = []
+        deadline = time.perf_counter() + duration
+        while time.perf_counter() < deadline:
+            for path in ("/get_local_data", "/healthz"):
+                started = time.perf_counter()
+                response = await client.get(path, headers=polite)
+                latencies.append((time.perf_counter() - started) * 1000)
+                results[(path, response.status_code)] += 1
+            await asyncio.sleep(0.1)
+        return results, latencies
+
+    started = time.perf_counter()
+    poller = asyncio.create_task(poll(1.5))
+    statuses = Counter(await asyncio.gather(*(hammer(i) for i in range(requests))))
+    flood_s = time.perf_counter() - started
+    polite_results, latencies = await poller
+
+    print(f"\nFlood: {requests} concurrent requests from one client in {flood_s:.2f} s")
+    print(f"  runaway client: " + ", ".join(f"{count} x {status}" for status, count in sorted(statuses.items())))
+    print(f"  polite client:  " + ", ".join(
+        f"{path} {status}: {count}" for (path, status), count in sorted(polite_results.items())))
+    print(f"  polite latency: median {statistics.median(latencies):.2f} ms, max {max(latencies):.2f} ms")
+    print(f"  limiter: {limiter.limited} limited, {limiter.shed} shed\n")
+
+
+async def run(requests: int, rounds: int, flood_requests: int):
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await overhead(client, requests, rounds)
+        await flood(client, flood_requests)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rate limiter overhead and flood behaviour")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--flood", type=int, default=2000, help="concurrent requests of the runaway client")
+    args = parser.parse_args()
+    asyncio.run(run(args.requests, args.rounds, args.flood))
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the hot read endpoints (/get_local_data, /status, /)
+Compares the pre-serialized response cache off and on:
+- full requests/sec through the app, in-process (ASGI transport, no sockets)
+- body build + encode cost alone, per call
+
+Runs against a throwaway state file.
+
+Usage:
+    pip install -r backend/requirements-bench.txt
+    python backend/benchmarks/bench_read_endpoints.py [--requests 5000]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("STATE_FILE", str(Path(tempfile.mkdtemp()) / "state.json"))
+os.environ.setdefault("RATE_LIMIT", "0")  # Measures the endpoints, not the limiter; see bench_rate_limit.py
+os.environ.setdefault("AUTH", "0")  # Isolates the response cache; see bench_auth_overhead.py
+
+import logging  # noqa: E402
+import httpx  # noqa: E402
+import main  # noqa: E402
+
+logging.getLogger("amokk").setLevel(logging.WARNING)
+
+ENDPOINTS = ["/get_local_data", "/status", "/"]
+
+
+async def measure(client: httpx.AsyncClient, path: str, requests: int) -> float:
+    """Return requests/sec for `requests` sequential GETs"""
+    for _ in range(50):  # warm-up
+        await client.get(path)
+    started = time.perf_counter()
+    for _ in range(requests):
+        response = await client.get(path)
+        assert response.status_code == 200
+    return requests / (time.perf_counter() - started)
+
+
+BODY_BUILDERS = {
+    "/get_local_data": lambda: main.response_cache.get(
+        "get_local_data", (main.app_state.version, main.live_game_timer(main.app_state.snapshot().data)),
+        lambda: main.build_local_data(main.app_state.snapshot()).model_dump()),
+    "/status": lambda: main.response_cache.get(
+        "status", (main.app_state.version, main.app_state.writer.flushes, main.app_state.writer.errors,
+                   main.live_game_timer(main.app_state.snapshot().data)),
+        main.status_payload),
+    "/": lambda: main.response_cache.get("root", None, main.root_payload),
+}
+
+
+def measure_body(path: str, calls: int) -> float:
+    """Return microseconds per body build + encode"""
+    return timeit.timeit(BODY_BUILDERS[path], number=calls) / calls * 1e6
+
+
+async def run(requests: int):
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        results = {}
+        for enabled in (False, True):
+            main.response_cache.enabled = enabled
+            main.response_cache.invalidate()
+            for path in ENDPOINTS:
+                results[(path, enabled)] = await measure(client, path, requests)
+                results[(path, enabled, "body")] = measure_body(path, requests * 10)
+
+    encoder = main.response_cache.stats()["encoder"]
+    print(f"\nRead endpoints, {requests} sequential requests each (encoder: {encoder})\n")
+    print(f"{'endpoint':<18}{'no cache req/s':>16}{'cache req/s':>14}{'speedup':>10}")
+    for path in ENDPOINTS:
+        before = results[(path, False)]
+        after = results[(path, True)]
+        print(f"{path:<18}{before:>16.0f}{after:>14.0f}{after / before:>9.2f}x")
+
+    print(f"\n{'body only':<18}{'no cache us':>16}{'cache us':>14}{'speedup':>10}")
+    for path in ENDPOINTS:
+        before = results[(path, False, "body")]
+        after = results[(path, True, "body")]
+        print(f"{path:<18}{before:>16.2f}{after:>14.2f}{before / after:>9.1f}x")
+    print()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000, help="requests per endpoint and mode")
+    args = parser.parse_args()
+    asyncio.run(run(args.requests))
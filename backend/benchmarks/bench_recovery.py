@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark: startup recovery time versus journal length
+
+Builds a snapshot + journal of N mutation records for several N and times
+AppState construction (snapshot load + journal replay). With compaction,
+the journal never exceeds STATE_JOURNAL_COMPACT_RECORDS (plus one flush
+batch), which bounds recovery time no matter how long the app has run.
+
+Usage:
+    python backend/benchmarks/bench_recovery.py [--lengths 0,100,1000,10000,100000]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("STATE_FILE", str(Path(tempfile.mkdtemp()) / "state.json"))
+
+import logging  # noqa: E402
+import main  # noqa: E402
+from persistence import StateJournal, atomic_write_json  # noqa: E402
+
+logging.getLogger("amokk").setLevel(logging.WARNING)
+
+
+def random_change() -> dict:
+    kind = random.random()
+    if kind < 0.5:
+        return {"volume": random.randint(0, 100)}
+    if kind < 0.8:
+        return {"proactive_coach_active": random.random() < 0.5}
+    return {"ptt_key": random.choice("ABCDEFGV"), "assistant_active": random.random() < 0.5}
+
+
+def build_files(directory: Path, length: int) -> Path:
+    state_file = directory / "state.json"
+    atomic_write_json(state_file, {**main.AppState(state_file).as_dict(), "version": 0})
+    journal = StateJournal(state_file.with_suffix(".journal"))
+    batch = []
+    for version in range(1, length + 1):
+        batch.append((version, random_change()))
+        if len(batch) == 500:
+            journal.append(batch)
+            batch = []
+    journal.append(batch)
+    journal.close()
+    return state_file
+
+
+def time_recovery(state_file: Path, runs: int) -> float:
+    """Median milliseconds to construct AppState from disk"""
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        main.AppState(state_file)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Startup recovery time versus journal length")
+    parser.add_argument("--lengths", default="0,100,1000,10000,100000")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    compact_every = int(os.environ.get("STATE_JOURNAL_COMPACT_RECORDS", 1000))
+    print(f"\n{'journal records':>16}{'journal KB':>12}{'recovery ms':>14}")
+    for length in [int(value) for value in args.lengths.split(",")]:
+        with tempfile.TemporaryDirectory() as directory:
+            state_file = build_files(Path(directory), length)
+            journal_file = state_file.with_suffix(".journal")
+            size_kb = journal_file.stat().st_size / 1024 if journal_file.exists() else 0.0
+            elapsed = time_recovery(state_file, args.runs)
+            marker = "  <- compaction bound" if length == compact_every else ""
+            print(f"{length:>16}{size_kb:>12.1f}{elapsed:>14.2f}{marker}")
+    print(f"\nCompaction every {compact_every} records caps replay at that length.\n")
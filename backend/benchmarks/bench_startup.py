@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Cold-start-to-ready benchmark for launcher.py
+
+Spawns `python launcher.py` repeatedly and measures the time until the
+AMOKK_READY handshake line and until GET /status answers, in each
+dependency mode:
+- stamped:   dependency stamp present (normal launch)
+- unstamped: no stamp, installed distributions checked against requirements.txt
+- pip:       the `pip install -r requirements.txt` step alone, which the
+             launcher used to run on every launch (dependencies already
+             installed, so this is its best case)
+
+The launcher's phase report and the backend startup profile (import,
+state load, app build, bind) are collected as well. Uses a throwaway
+state file and stamp, and a free port.
+
+Usage:
+    python backend/benchmarks/bench_startup.py [--runs 5]
+"""
+
+import argparse
+import json
+import os
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from startup import READY_PREFIX  # noqa: E402
+
+PHASES_LINE = re.compile(r"\[LAUNCHER\] Startup phases: (.*)")
+PHASE_ITEM = re.compile(r"(\w+) ([\d.]+) ms")
+
+
+def free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_ready(port: int, process: subprocess.Popen, timeout: float = 60) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline and process.poll() is None:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/status", timeout=1) as response:
+                if response.status == 200:
+                    return True
+        except OSError:
+            pass
+        time.sleep(0.01)
+    return False
+
+
+def launch_once(stamp: Path, keep_stamp: bool) -> dict:
+    """Start launcher.py, wait until ready, stop it; returns timings in ms"""
+    if not keep_stamp and stamp.exists():
+        stamp.unlink()
+    port = free_port()
+    workdir = Path(tempfile.mkdtemp())
+    env = dict(
+        os.environ,
+        BACKEND_PORT=str(port),
+        STATE_FILE=str(workdir / "state.json"),
+        LAUNCHER_STAMP=str(stamp),
+        PYTHONUNBUFFERED="1",
+    )
+    phases = {}
+
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, str(BACKEND_DIR / "launcher.py")],
+        cwd=str(BACKEND_DIR), env=env,
+        stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, encoding="utf-8", errors="replace",
+    )
+
+    def read_output():
+        for line in process.stdout:
+            if line.startswith(READY_PREFIX):
+                phases["handshake"] = (time.perf_counter() - started) * 1000
+                backend = json.loads(line[len(READY_PREFIX):])["startup"]["phases_ms"]
+                phases.update({f"backend_{name}": ms for name, ms in backend.items()})
+            match = PHASES_LINE.search(line)
+            if match:
+                phases.update({name: float(ms) for name, ms in PHASE_ITEM.findall(match.group(1))})
+
+    reader = threading.Thread(target=read_output, daemon=True)
+    reader.start()
+    try:
+        if not wait_ready(port, process):
+            raise RuntimeError("backend did not become ready")
+        ready_ms = (time.perf_counter() - started) * 1000
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+        reader.join(timeout=5)
+    return {"ready_ms": ready_ms, **phases}
+
+
+def pip_step_ms() -> float:
+    started = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-m", "pip", "install", "-q", "--disable-pip-version-check",
+         "-r", str(BACKEND_DIR / "requirements.txt")],
+        check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    return (time.perf_counter() - started) * 1000
+
+
+def summarize(label: str, runs: list):
+    ready = statistics.median(run["ready_ms"] for run in runs)
+    phase_names = [name for name in runs[0] if name != "ready_ms"]
+    phases = ", ".join(
+        f"{name} {statistics.median(run.get(name, 0.0) for run in runs):.1f}" for name in phase_names
+    )
+    print(f"{label:<12}{ready:>12.0f}   {phases}")
+
+
+def run(runs: int, with_pip: bool):
+    stamp = Path(tempfile.mkdtemp()) / "deps-stamp"
+    launch_once(stamp, keep_stamp=False)  # Warm OS file cache, write the stamp
+
+    results = {"stamped": [], "unstamped": []}
+    for _ in range(runs):
+        results["unstamped"].append(launch_once(stamp, keep_stamp=False))
+        results["stamped"].append(launch_once(stamp, keep_stamp=True))
+
+    print(f"\nCold start to ready (median of {runs} runs)\n")
+    print(f"{'mode':<12}{'ready ms':>12}   phases (ms)")
+    summarize("stamped", results["stamped"])
+    summarize("unstamped", results["unstamped"])
+    if with_pip:
+        pip_ms = statistics.median(pip_step_ms() for _ in range(runs))
+        print(f"{'pip step':<12}{pip_ms:>12.0f}   (previously paid on every launch)")
+    print()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Launcher cold-start-to-ready benchmark")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--no-pip", action="store_true", help="skip measuring the pip install step")
+    args = parser.parse_args()
+    run(args.runs, not args.no_pip)
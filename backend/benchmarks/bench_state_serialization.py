@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Benchmark: state serialization through the schema vs the previous path
+
+Compares, per operation, time and memory allocated (tracemalloc peak):
+- save:  json.dumps(indent=2) of the state dict (the original state.json
+         format) vs STATE_SCHEMA.encode (compact, typed, schema-tagged)
+- load:  json.loads + field-by-field copy vs STATE_SCHEMA.decode
+         (migration check + typed load)
+- read:  pydantic LocalDataResponse built per read, then model_dump +
+         JSON encode (the original /get_local_data body) vs
+         main.local_data_payload + the response cache encoder
+
+Runs against a throwaway state file; nothing is written to disk.
+
+Usage:
+    pip install -r backend/requirements-bench.txt
+    python backend/benchmarks/bench_state_serialization.py [--number 20000]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import timeit
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("STATE_FILE", str(Path(tempfile.mkdtemp()) / "state.json"))
+
+import logging  # noqa: E402
+from pydantic import BaseModel  # noqa: E402
+import main  # noqa: E402
+from response_cache import dumps  # noqa: E402
+from schema import STATE_SCHEMA  # noqa: E402
+
+logging.getLogger("amokk").setLevel(logging.WARNING)
+
+
+class LegacyLocalDataResponse(BaseModel):
+    """LocalDataResponse as a hand-written model, built on every read"""
+    remaining_games: int
+    first_launch: bool
+    game_timer: int
+    email: str
+    coach_toggle: bool
+    assistant_toggle: bool
+    amokk_toggle: bool
+    ptt_key: str
+    tts_volume: int
+    session_state: str
+    version: int
+
+
+def legacy_read(current) -> bytes:
+    data = current.data
+    model = LegacyLocalDataResponse(
+        remaining_games=data['remaining_games'],
+        first_launch=data['first_launch'],
+        game_timer=int(data['game_timer']),
+        email=data['email'],
+        coach_toggle=data['coach_active'],
+        assistant_toggle=data['assistant_active'],
+        amokk_toggle=data['amokk_toggle'],
+        ptt_key=data['ptt_key'],
+        tts_volume=data['volume'],
+        session_state=data['session_state'],
+        version=current.version,
+    )
+    return json.dumps(model.model_dump()).encode("utf-8")
+
+
+def legacy_load(raw: str) -> dict:
+    data = main.app_state.default_values()
+    stored = json.loads(raw)
+    data.update({field: stored[field] for field in data if field in stored})
+    return data
+
+
+def allocated_bytes(fn, repeat: int = 200) -> float:
+    """Average peak of memory allocated by one call (tracemalloc)"""
+    fn()  # Warm caches first
+    total = 0
+    for _ in range(repeat):
+        tracemalloc.start()
+        fn()
+        total += tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return total / repeat
+
+
+def measure(fn, number: int) -> tuple:
+    us = timeit.timeit(fn, number=number) / number * 1e6
+    return us, allocated_bytes(fn)
+
+
+def main_bench(number: int):
+    current = main.app_state.snapshot()
+    data = dict(current.data)
+    legacy_raw = json.dumps({**data, 'version': current.version}, indent=2)
+    schema_raw = STATE_SCHEMA.encode(current.data, current.version)
+
+    cases = [
+        ("save", lambda: json.dumps({**data, 'version': current.version}, indent=2),
+                 lambda: STATE_SCHEMA.encode(current.data, current.version)),
+        ("load", lambda: legacy_load(legacy_raw),
+                 lambda: STATE_SCHEMA.decode(schema_raw)),
+        ("read", lambda: legacy_read(current),
+                 lambda: dumps(main.local_data_payload(current, 0))),
+    ]
+
+    print(f"\n{'':6}{'previous':>22}{'schema':>22}{'speedup':>10}")
+    print(f"{'':6}{'us/op':>11}{'bytes':>11}{'us/op':>11}{'bytes':>11}")
+    for name, before, after in cases:
+        old_us, old_bytes = measure(before, number)
+        new_us, new_bytes = measure(after, number)
+        print(f"{name:<6}{old_us:>11.2f}{old_bytes:>11.0f}{new_us:>11.2f}{new_bytes:>11.0f}"
+              f"{old_us / new_us:>9.1f}x")
+
+    print(f"\nstored size: {len(legacy_raw.encode('utf-8'))} bytes (indent=2) "
+          f"-> {len(schema_raw)} bytes (schema {STATE_SCHEMA.version})\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="State serialization: schema vs previous path")
+    parser.add_argument("--number", type=int, default=20000, help="calls per timing")
+    args = parser.parse_args()
+    main_bench(args.number)
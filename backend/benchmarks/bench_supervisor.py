@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Recovery time of the supervised backend (launcher.py, LAUNCHER_SUPERVISE=1)
+
+Starts the launcher as Electron does, then --rounds times each:
+- crash: SIGKILL the backend process;
+- hang:  SIGSTOP it, so it still holds its port but answers nothing, and
+         only the health watchdog can notice.
+Reports, per round, the time until the supervisor reacted (exit noticed /
+watchdog verdict), until the new AMOKK_READY line and until GET /healthz
+answers again, with the backoff applied. Then stops the launcher with
+SIGINT and checks the backend went with it, and shows the resident memory
+of the launcher next to the backend's.
+
+POSIX only (signals, /proc for memory). The watchdog runs every
+--watchdog seconds here (5 s by default in the app).
+
+Usage:
+    pip install -r backend/requirements-bench.txt
+    python backend/benchmarks/bench_supervisor.py [--rounds 3] [--watchdog 1] [--stable 60]
+"""
+
+import argparse
+import json
+import os
+import queue
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from launcher import SUPERVISOR_PREFIX  # noqa: E402
+from startup import READY_PREFIX  # noqa: E402
+
+
+class Launcher:
+    """launcher.py in supervised mode; its stdout lines parsed into a queue"""
+
+    def __init__(self, workdir: Path, watchdog: float, stable: float):
+        env = dict(
+            os.environ,
+            LAUNCHER_SUPERVISE="1",
+            LAUNCHER_STAMP=str(workdir / "deps-stamp"),
+            LAUNCHER_WATCHDOG_SECONDS=str(watchdog),
+            LAUNCHER_WATCHDOG_TIMEOUT_SECONDS=str(min(2.0, watchdog / 2)),
+            LAUNCHER_WATCHDOG_FAILURES="2",
+            LAUNCHER_STOP_GRACE_SECONDS="1",
+            LAUNCHER_STABLE_SECONDS=str(stable),
+            BACKEND_PORT="0",
+            STATE_FILE=str(workdir / "state.json"),
+            AUTH="0",
+            PYTHONUNBUFFERED="1",
+        )
+        self.process = subprocess.Popen(
+            [sys.executable, str(BACKEND_DIR / "launcher.py")],
+            cwd=str(BACKEND_DIR), env=env,
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, encoding="utf-8", errors="replace",
+        )
+        self.lines: queue.Queue = queue.Queue()
+        threading.Thread(target=self._read, daemon=True).start()
+
+    def _read(self):
+        for line in self.process.stdout:
+            now = time.perf_counter()
+            for prefix in (READY_PREFIX, SUPERVISOR_PREFIX):
+                if line.startswith(prefix):
+                    self.lines.put((now, prefix, json.loads(line[len(prefix):])))
+        self.lines.put((time.perf_counter(), None, None))
+
+    def wait_for(self, prefix: str, event: str = None, timeout: float = 60) -> tuple:
+        """(time, payload) of the next line with prefix (and event name)"""
+        deadline = time.monotonic() + timeout
+        while True:
+            at, kind, payload = self.lines.get(timeout=max(0.0, deadline - time.monotonic()))
+            if kind is None:
+                raise RuntimeError("launcher exited")
+            if kind == prefix and (event is None or payload.get("event") == event):
+                return at, payload
+
+
+def wait_healthy(url: str, timeout: float = 30) -> float:
+    import httpx
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{url}/healthz", timeout=1).status_code == 200:
+                return time.perf_counter()
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.01)
+    raise RuntimeError("backend never became healthy")
+
+
+def rss_mb(pid: int) -> float:
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return float("nan")
+
+
+def run(rounds: int, watchdog: float, stable: float):
+    launcher = Launcher(Path(tempfile.mkdtemp()), watchdog, stable)
+    _, ready = launcher.wait_for(READY_PREFIX)
+    wait_healthy(ready["url"])
+    print(f"\nSupervised backend pid {ready['pid']} on {ready['url']}, watchdog every {watchdog:g} s (2 failures)")
+    print(f"  memory: launcher {rss_mb(launcher.process.pid):.1f} MB, backend {rss_mb(ready['pid']):.1f} MB")
+
+    print(f"\n{'round':<8}{'noticed ms':>11}{'backoff s':>10}{'ready ms':>10}{'healthz ms':>11}")
+    for kind, sig in (("crash", signal.SIGKILL), ("hang", signal.SIGSTOP)):
+        for _ in range(rounds):
+            started = time.perf_counter()
+            os.kill(ready["pid"], sig)
+            if kind == "hang":
+                # Noticed at the watchdog's verdict, before the stop grace
+                noticed, _ = launcher.wait_for(SUPERVISOR_PREFIX, "unresponsive")
+                _, restarting = launcher.wait_for(SUPERVISOR_PREFIX, "restarting")
+            else:
+                noticed, restarting = launcher.wait_for(SUPERVISOR_PREFIX, "restarting")
+            ready_at, ready = launcher.wait_for(READY_PREFIX)
+            healthy_at = wait_healthy(ready["url"])
+            print(f"{kind:<8}{(noticed - started) * 1000:>11.0f}{restarting['backoff']:>10.2f}"
+                  f"{(ready_at - started) * 1000:>10.0f}{(healthy_at - started) * 1000:>11.0f}")
+
+    backend_pid = ready["pid"]
+    launcher.process.send_signal(signal.SIGINT)
+    _, stopped = launcher.wait_for(SUPERVISOR_PREFIX, "stopped")
+    code = launcher.process.wait(timeout=30)
+    try:
+        os.kill(backend_pid, 0)
+        orphan = True
+    except OSError:
+        orphan = False
+    print(f"\nSIGINT: launcher exit code {code}, backend exit code {stopped['exit_code']}, "
+          f"backend {'STILL RUNNING' if orphan else 'gone'}")
+    print(f"  stats: {stopped['stats']}")
+    print()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Crash and hang recovery time of the supervised backend")
+    parser.add_argument("--rounds", type=int, default=3, help="crashes and hangs to inject (each)")
+    parser.add_argument("--watchdog", type=float, default=1, help="health check interval (s)")
+    parser.add_argument("--stable", type=float, default=60, help="uptime (s) after which the backoff starts over")
+    args = parser.parse_args()
+    run(args.rounds, args.watchdog, args.stable)
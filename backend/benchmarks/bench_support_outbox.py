@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Benchmark: POST /mock_contact_support with a slow, flaky support sink
+
+Starts a stand-in HTTP sink on localhost that takes --sink-delay seconds
+per batch and fails one batch in --fail-every, points SUPPORT_SINK at it,
+then submits --tickets distinct tickets (in-process, ASGI transport) and
+waits for the outbox to drain. Reports the request latency, which should
+not depend on the sink, the delivery latency and batch counts, and checks
+that resubmitting a ticket returns the same id.
+
+Usage:
+    pip install -r backend/requirements-bench.txt
+    python backend/benchmarks/bench_support_outbox.py [--tickets 200] [--sink-delay 0.5] [--fail-every 3]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+class StandInSink(BaseHTTPRequestHandler):
+    """Accepts POST {"tickets": [...]}; slow, and failing every `fail_every`-th batch"""
+
+    delay = 0.0
+    fail_every = 0
+    batches = 0
+    received = {}  # ticket id -> reception time
+    lock = threading.Lock()
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        time.sleep(self.delay)
+        with self.lock:
+            StandInSink.batches += 1
+            failing = self.fail_every and StandInSink.batches % self.fail_every == 0
+            if not failing:
+                for ticket in body["tickets"]:
+                    self.received.setdefault(ticket["ticket_id"], time.time())
+        self.send_response(503 if failing else 204)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+def start_sink(delay: float, fail_every: int) -> str:
+    StandInSink.delay = delay
+    StandInSink.fail_every = fail_every
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInSink)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_address[1]}/tickets"
+
+
+async def run(tickets: int, timeout: float):
+    import logging
+    import httpx
+    import main
+
+    logging.getLogger("amokk").setLevel(logging.WARNING)
+
+    outbox = main.support_outbox
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await main.startup_event()
+        try:
+            latencies = []
+            ids = []
+            for i in range(tickets):
+                started = time.perf_counter()
+                response = await client.post("/mock_contact_support", json={
+                    "subject": f"Ticket {i}", "message": "The volume control is not working"})
+                latencies.append((time.perf_counter() - started) * 1000)
+                ids.append(response.json()["ticket_id"])
+
+            again = (await client.post("/mock_contact_support", json={
+                "subject": "Ticket 0", "message": "The volume control is not working"})).json()
+
+            submitted_at = time.perf_counter()
+            while outbox.depth and time.perf_counter() - submitted_at < timeout:
+                await asyncio.sleep(0.05)
+            drained_s = time.perf_counter() - submitted_at
+            stats = outbox.stats()
+        finally:
+            await main.shutdown_event()
+
+    latencies.sort()
+    delivered = sum(1 for ticket_id in ids if ticket_id in StandInSink.received)
+    print(f"\n{tickets} tickets, sink delay {StandInSink.delay * 1000:.0f} ms/batch, "
+          f"1 batch in {StandInSink.fail_every or 'never'} failing")
+    print(f"  request:  p50 {statistics.median(latencies):.2f} ms, "
+          f"p99 {latencies[int(len(latencies) * 0.99) - 1]:.2f} ms, max {latencies[-1]:.2f} ms")
+    print(f"  delivery: {delivered}/{tickets} delivered, drained {drained_s:.2f} s after the last submit")
+    print(f"  batches:  {stats['batches']} delivered, {stats['failures']} failed (retried), "
+          f"{len(StandInSink.received)} unique tickets at the sink")
+    print(f"  dedupe:   resubmission -> {again['ticket_id']} "
+          f"({'same id' if again['ticket_id'] == ids[0] and again['duplicate'] else 'NEW TICKET'})\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Support outbox: request latency vs a slow, flaky sink")
+    parser.add_argument("--tickets", type=int, default=200)
+    parser.add_argument("--sink-delay", type=float, default=0.5, help="seconds per batch at the sink")
+    parser.add_argument("--fail-every", type=int, default=3, help="fail one sink batch in N (0: never)")
+    parser.add_argument("--timeout", type=float, default=120, help="seconds to wait for the outbox to drain")
+    args = parser.parse_args()
+
+    state_dir = Path(tempfile.mkdtemp())
+    os.environ.setdefault("STATE_FILE", str(state_dir / "state.json"))
+    os.environ["AUTH"] = "0"
+    os.environ["RATE_LIMIT"] = "0"
+    os.environ["SUPPORT_SINK"] = start_sink(args.sink_delay, args.fail_every)
+    os.environ.setdefault("SUPPORT_RETRY_BASE_SECONDS", "0.2")
+
+    asyncio.run(run(args.tickets, args.timeout))
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Latency of GET /get_local_data over a Unix domain socket vs loopback TCP
+
+Starts `python main.py` with BACKEND_PORT=0 and BACKEND_SOCKET set, reads
+both endpoints from its AMOKK_READY line, then issues the same sequential
+keep-alive requests over each transport (alternating rounds) and reports
+req/s and p50/p95/p99. Unix sockets are not available on Windows.
+
+Usage:
+    pip install -r backend/requirements-bench.txt
+    python backend/benchmarks/bench_transport.py [--requests 5000] [--rounds 3]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+import httpx  # noqa: E402
+from startup import READY_PREFIX  # noqa: E402
+
+
+def start_backend(workdir: Path):
+    env = dict(
+        os.environ,
+        BACKEND_PORT="0",
+        BACKEND_SOCKET=str(workdir / "backend.sock"),
+        STATE_FILE=str(workdir / "state.json"),
+        AUTH="0",
+        RATE_LIMIT="0",
+        PYTHONUNBUFFERED="1",
+    )
+    process = subprocess.Popen(
+        [sys.executable, str(BACKEND_DIR / "main.py")],
+        cwd=str(BACKEND_DIR), env=env,
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, encoding="utf-8", errors="replace",
+    )
+    for line in process.stdout:
+        if line.startswith(READY_PREFIX):
+            # Keep draining logs so the backend never blocks on a full pipe
+            threading.Thread(target=process.stdout.read, daemon=True).start()
+            return process, json.loads(line[len(READY_PREFIX):])
+    raise RuntimeError("backend exited before the ready line")
+
+
+async def measure(client: httpx.AsyncClient, requests: int) -> list:
+    latencies = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        response = await client.get("/get_local_data")
+        latencies.append(time.perf_counter() - started)
+        assert response.status_code == 200
+    return latencies
+
+
+async def run(requests: int, rounds: int):
+    if not hasattr(__import__("socket"), "AF_UNIX"):
+        sys.exit("Unix domain sockets are not available on this platform")
+
+    process, ready = start_backend(Path(tempfile.mkdtemp()))
+    if not ready["socket"]:
+        process.terminate()
+        sys.exit("backend did not bind the Unix socket")
+    try:
+        clients = {
+            "tcp": httpx.AsyncClient(base_url=ready["url"]),
+            "uds": httpx.AsyncClient(transport=httpx.AsyncHTTPTransport(uds=ready["socket"]),
+                                     base_url="http://amokk"),
+        }
+        latencies = {name: [] for name in clients}
+        for client in clients.values():
+            await measure(client, 200)  # Warm-up
+        for _ in range(rounds):
+            for name, client in clients.items():
+                latencies[name] += await measure(client, requests)
+        for client in clients.values():
+            await client.aclose()
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+    print(f"\nGET /get_local_data, {rounds} x {requests} sequential keep-alive requests per transport\n")
+    print(f"{'transport':<10}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, values in latencies.items():
+        cuts = statistics.quantiles(values, n=100)
+        print(f"{name:<10}{len(values) / sum(values):>10.0f}"
+              f"{cuts[49] * 1000:>10.3f}{cuts[94] * 1000:>10.3f}{cuts[98] * 1000:>10.3f}")
+    print()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="UDS vs loopback TCP latency for /get_local_data")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(run(args.requests, args.rounds))
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Throughput of the backend with 1, 2, 4... worker processes
+
+For each --workers count, starts `python main.py` with BACKEND_WORKERS
+set, then --clients client processes each hammer it over keep-alive
+connections for --seconds: reads only (GET /get_local_data), then a mix
+with one PUT /coach_toggle every --write-every requests. Reports req/s
+and p50/p99, and checks that the state file holds the last version once
+the backend has stopped. Worker scaling needs as many free cores as
+workers plus clients.
+
+Also times the shared segment alone: snapshot() while unchanged, a full
+seqlock read(), and a write() under the lock.
+
+Usage:
+    pip install -r backend/requirements-bench.txt
+    python backend/benchmarks/bench_workers.py [--workers 1 2 4] [--clients 4] [--seconds 5]
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import timeit
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from startup import READY_PREFIX  # noqa: E402
+
+
+def start_backend(workdir: Path, workers: int):
+    env = dict(
+        os.environ,
+        BACKEND_PORT="0",
+        BACKEND_WORKERS=str(workers),
+        STATE_FILE=str(workdir / "state.json"),
+        AUTH="0",
+        RATE_LIMIT="0",
+        PYTHONUNBUFFERED="1",
+    )
+    process = subprocess.Popen(
+        [sys.executable, str(BACKEND_DIR / "main.py")],
+        cwd=str(BACKEND_DIR), env=env,
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, encoding="utf-8", errors="replace",
+    )
+    for line in process.stdout:
+        if line.startswith(READY_PREFIX):
+            threading.Thread(target=process.stdout.read, daemon=True).start()
+            return process, json.loads(line[len(READY_PREFIX):])
+    raise RuntimeError("backend exited before the ready line")
+
+
+def wait_workers(url: str, workers: int, timeout: float = 30):
+    """Wait until every worker answers (the ready line comes before they start)"""
+    import httpx
+
+    pids = set()
+    deadline = time.monotonic() + timeout
+    while len(pids) < workers and time.monotonic() < deadline:
+        try:
+            with httpx.Client(base_url=url) as client:
+                pids.add(client.get("/status").json()["pid"])
+        except httpx.HTTPError:
+            time.sleep(0.05)
+
+
+def client_run(args) -> list:
+    """One client process: sequential keep-alive requests until the deadline; latencies in ms"""
+    import httpx
+
+    url, seconds, write_every = args
+    latencies = []
+    with httpx.Client(base_url=url) as client:
+        client.get("/get_local_data")
+        deadline = time.perf_counter() + seconds
+        i = 0
+        while time.perf_counter() < deadline:
+            i += 1
+            started = time.perf_counter()
+            if write_every and i % write_every == 0:
+                client.put("/coach_toggle", json={"active": bool(i % (2 * write_every))})
+            else:
+                client.get("/get_local_data")
+            latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+
+def load(url: str, clients: int, seconds: float, write_every: int) -> tuple:
+    with multiprocessing.Pool(clients) as pool:
+        results = pool.map(client_run, [(url, seconds, write_every)] * clients)
+    latencies = sorted(latency for result in results for latency in result)
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    return len(latencies) / seconds, statistics.median(latencies), p99
+
+
+def bench_segment(number: int):
+    from schema import STATE_SCHEMA
+    from shared_state import SharedStateSegment
+
+    segment = SharedStateSegment(Path(tempfile.mkdtemp()) / "state.shm", STATE_SCHEMA)
+    data = STATE_SCHEMA.defaults()
+    segment.create(data, 1)
+    segment.snapshot()
+
+    def write():
+        with segment.lock:
+            segment.write(data, 2)
+
+    print("\nShared segment")
+    for name, fn in (("snapshot(), unchanged", segment.snapshot), ("read()", segment.read), ("write() + lock", write)):
+        print(f"  {name:<24}{timeit.timeit(fn, number=number) / number * 1e6:8.2f} us")
+    segment.close()
+
+
+def run(workers_counts: list, clients: int, seconds: float, write_every: int):
+    print(f"\n{os.cpu_count()} CPU(s), {clients} client processes, {seconds:g} s per run")
+    print(f"{'workers':>8}{'workload':>10}{'req/s':>10}{'p50 ms':>9}{'p99 ms':>9}")
+    for workers in workers_counts:
+        workdir = Path(tempfile.mkdtemp())
+        process, ready = start_backend(workdir, workers)
+        try:
+            wait_workers(ready["url"], workers)
+            for workload, every in (("read", 0), ("mixed", write_every)):
+                rate, p50, p99 = load(ready["url"], clients, seconds, every)
+                print(f"{workers:>8}{workload:>10}{rate:>10.0f}{p50:>9.2f}{p99:>9.2f}")
+            import httpx
+            version = httpx.get(ready["url"] + "/status").json()["version"]
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+        saved = json.loads((workdir / "state.json").read_text())["version"]
+        if saved != version:
+            print(f"  state.json at version {saved}, expected {version}")
+    bench_segment(200_000)
+    print()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backend throughput per number of worker processes")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--clients", type=int, default=4, help="client processes")
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--write-every", type=int, default=10, help="one write every N requests in the mixed run")
+    args = parser.parse_args()
+    run(args.workers, args.clients, args.seconds, args.write_every)
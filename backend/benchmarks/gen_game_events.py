@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Synthetic live game events for POST /ingest
+
+GameSimulator plays a fake game: --players participants wandering the map
+(positions every tick), their gold growing (every second) and the game
+timer (every second). Run directly, it drives a running backend at --hz
+batches per second, as the game client would, and prints what the
+backend accepted, dropped or refused once a second.
+
+Usage:
+    pip install -r backend/requirements-bench.txt
+    python backend/benchmarks/gen_game_events.py --url http://127.0.0.1:8000 [--token ...]
+        [--hz 30] [--players 10] [--seconds 30] [--format binary|json]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from ingest import GOLD, POSITION, RECORD, TIMER  # noqa: E402
+
+MAP_SIZE = 15000.0
+
+
+class GameSimulator:
+    """Deterministic (seeded) stream of event batches, one per tick"""
+
+    def __init__(self, players: int = 10, hz: float = 30, seed: int = 42):
+        self.players = players
+        self.hz = hz
+        self.rng = random.Random(seed)
+        self.game_time = 0.0
+        self.positions = [[self.rng.uniform(0, MAP_SIZE), self.rng.uniform(0, MAP_SIZE)] for _ in range(players)]
+        self.gold = [500.0] * players
+        self._next_second = 1.0
+
+    def tick(self) -> list:
+        """Advance one tick; returns its events as [ts, kind, entity, a, b] lists"""
+        self.game_time += 1 / self.hz
+        ts = self.game_time
+        events = []
+        for entity, position in enumerate(self.positions):
+            position[0] = min(MAP_SIZE, max(0.0, position[0] + self.rng.uniform(-12, 12)))
+            position[1] = min(MAP_SIZE, max(0.0, position[1] + self.rng.uniform(-12, 12)))
+            events.append([ts, POSITION, entity, position[0], position[1]])
+        if ts >= self._next_second:
+            self._next_second += 1
+            for entity in range(self.players):
+                self.gold[entity] += self.rng.uniform(1, 40)
+                events.append([ts, GOLD, entity, self.gold[entity], 0.0])
+            events.append([ts, TIMER, 0, ts, 0.0])
+        return events
+
+    def tick_binary(self) -> bytes:
+        """tick() as packed records (the octet-stream body)"""
+        return b"".join(RECORD.pack(*event) for event in self.tick())
+
+
+def drive(url: str, token: str, hz: float, players: int, seconds: float, fmt: str):
+    import httpx
+
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    simulator = GameSimulator(players, hz)
+    totals = {"sent": 0, "accepted": 0, "dropped": 0, "refused": 0}
+    with httpx.Client(base_url=url, headers=headers) as client:
+        started = time.perf_counter()
+        due = started
+        report_at = started + 1
+        while due < started + seconds:
+            time.sleep(max(0.0, due - time.perf_counter()))
+            due += 1 / hz
+            if fmt == "binary":
+                body = simulator.tick_binary()
+                totals["sent"] += len(body) // RECORD.size
+                response = client.post("/ingest", content=body, headers={"Content-Type": "application/octet-stream"})
+            else:
+                events = simulator.tick()
+                totals["sent"] += len(events)
+                response = client.post("/ingest", json={"events": events})
+            if response.status_code == 200:
+                result = response.json()
+                totals["accepted"] += result["accepted"]
+                totals["dropped"] += result["dropped"]
+            else:
+                totals["refused"] += 1
+            if time.perf_counter() >= report_at:
+                report_at += 1
+                print(f"{time.perf_counter() - started:5.1f} s  " + "  ".join(f"{k} {v}" for k, v in totals.items()))
+        print(client.get("/ingest").json())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Send synthetic live game events to a running backend")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--token", default="", help="session token (unless the backend runs with AUTH=0)")
+    parser.add_argument("--hz", type=float, default=30, help="batches per second")
+    parser.add_argument("--players", type=int, default=10)
+    parser.add_argument("--seconds", type=float, default=30)
+    parser.add_argument("--format", choices=("binary", "json"), default="binary")
+    args = parser.parse_args()
+    drive(args.url, args.token, args.hz, args.players, args.seconds, args.format)
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Stress test for the AppState single-writer model
+
+Fires thousands of concurrent toggles and config updates at the app
+in-process (ASGI transport) while the write-behind writer flushes
+aggressively and a separate thread keeps re-reading state.json. Checks:
+- no lost updates: N proactive toggles flip the flag N times and bump the
+  version exactly once per effective change
+- no torn state.json: every read of the file parses, versions never go
+  backwards, and the final file matches the in-memory state
+- recovery: snapshot + journal replay rebuilds exactly the in-memory state
+
+Exits with status 1 on any violation.
+
+Usage:
+    pip install -r backend/requirements-bench.txt
+    python backend/benchmarks/stress_state.py [--toggles 5000] [--updates 2000]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("STATE_FILE", str(Path(tempfile.mkdtemp()) / "state.json"))
+os.environ.setdefault("STATE_FLUSH_DEBOUNCE_MS", "1")
+os.environ.setdefault("STATE_FLUSH_MAX_LATENCY_MS", "5")
+os.environ.setdefault("AUTH", "0")
+os.environ.setdefault("RATE_LIMIT", "0")
+
+import logging  # noqa: E402
+import httpx  # noqa: E402
+import main  # noqa: E402
+from schema import STATE_SCHEMA  # noqa: E402
+
+logging.getLogger("amokk").setLevel(logging.WARNING)
+
+
+class FileWatcher(threading.Thread):
+    """Re-reads state.json in a loop, recording parse failures and version regressions"""
+
+    def __init__(self, path: Path):
+        super().__init__(daemon=True)
+        self.path = path
+        self.stop_event = threading.Event()
+        self.reads = 0
+        self.errors = []
+        self.last_version = -1
+
+    def run(self):
+        while not self.stop_event.is_set():
+            try:
+                data = json.loads(self.path.read_text())
+            except FileNotFoundError:
+                continue
+            except Exception as e:
+                self.errors.append(f"unreadable state.json: {e}")
+                continue
+            self.reads += 1
+            if data["version"] < self.last_version:
+                self.errors.append(f"version went backwards: {self.last_version} -> {data['version']}")
+            self.last_version = data["version"]
+
+
+async def run(toggles: int, updates: int) -> list:
+    errors = []
+    state = main.app_state
+    state.writer.start()
+    watcher = FileWatcher(state.state_file)
+    watcher.start()
+
+    start_version = state.version
+    start_proactive = state.proactive_coach_active
+
+    transport = httpx.ASGITransport(app=main.app)
+    limits = httpx.Limits(max_connections=None)
+    async with httpx.AsyncClient(transport=transport, base_url="http://stress", limits=limits) as client:
+
+        async def toggle():
+            response = await client.put("/mock_proactive_coach_toggle", json={"active": True})
+            return "toggle", response.status_code, None
+
+        async def update():
+            fields = {"tts_volume": random.randint(0, 100), "assistant_toggle": random.random() < 0.5}
+            response = await client.patch("/config", json=fields)
+            return "config update", response.status_code, response.json().get("changed")
+
+        async def read():
+            response = await client.get("/status")
+            return "read", response.status_code, None
+
+        tasks = [toggle() for _ in range(toggles)]
+        tasks += [update() for _ in range(updates)]
+        tasks += [read() for _ in range(updates)]
+        random.shuffle(tasks)
+        results = await asyncio.gather(*tasks)
+
+    effective_updates = 0
+    for kind, status_code, changed in results:
+        if status_code != 200:
+            errors.append(f"{kind} returned {status_code}")
+        if changed:
+            effective_updates += 1
+
+    expected_proactive = start_proactive ^ (toggles % 2 == 1)
+    if state.proactive_coach_active != expected_proactive:
+        errors.append(f"lost toggle: proactive_coach_active={state.proactive_coach_active}, expected {expected_proactive}")
+
+    expected_version = start_version + toggles + effective_updates
+    if state.version != expected_version:
+        errors.append(f"lost update: version={state.version}, expected {expected_version}")
+
+    # Journal flushed but not compacted: snapshot + journal replay must rebuild the state
+    state.writer.stop()
+    recovered = main.AppState(state.state_file).snapshot()
+    if recovered != state.snapshot():
+        errors.append(f"recovery from snapshot + journal gave version {recovered.version}, expected {state.version}")
+
+    state.close()
+    watcher.stop_event.set()
+    watcher.join()
+    errors.extend(watcher.errors[:10])
+
+    on_disk = STATE_SCHEMA.decode(state.state_file.read_bytes())
+    if on_disk != (state.as_dict(), state.version):
+        errors.append("state.json does not match the in-memory state after final compaction")
+
+    stats = state.persistence_stats()
+    print(f"\n{toggles} toggles + {updates} config updates + {updates} reads, all concurrent")
+    print(f"  version {start_version} -> {state.version} ({effective_updates} effective config updates)")
+    print(f"  flushes: {stats['flushes']} ({stats['coalesced']} mutations coalesced), compactions: {stats['compactions']}")
+    print(f"  state.json reads while writing: {watcher.reads}")
+    return errors
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stress test for concurrent AppState mutations")
+    parser.add_argument("--toggles", type=int, default=5000)
+    parser.add_argument("--updates", type=int, default=2000)
+    args = parser.parse_args()
+
+    failures = asyncio.run(run(args.toggles, args.updates))
+    if failures:
+        print("\nFAILED")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print("\nOK: no lost updates, no torn state\n")
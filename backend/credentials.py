@@ -0,0 +1,256 @@
+"""
+AMOKK Backend - Credential store
+Salted scrypt password hashes kept in a local file, verified off the event
+loop, with a per-account backoff after repeated failures
+"""
+
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Mapping, NamedTuple, Optional
+
+from persistence import atomic_write_json
+
+logger = logging.getLogger("amokk")
+
+SALT_BYTES = 16
+KEY_BYTES = 32
+
+
+class ScryptParams(NamedTuple):
+    n: int = 2 ** 14  # CPU/memory cost: 128 * n * r bytes (16 MB) per verification
+    r: int = 8
+    p: int = 1
+
+
+class CredentialsBusy(RuntimeError):
+    """Too many verifications already queued; the caller should retry later"""
+
+
+def _b64(raw: bytes) -> str:
+    return base64.b64encode(raw).decode("ascii")
+
+
+def hash_password(password: str, params: ScryptParams = ScryptParams(), salt: Optional[bytes] = None) -> str:
+    """Encoded hash: "scrypt$<n>$<r>$<p>$<salt>$<key>" (base64 salt and key)"""
+    salt = salt or os.urandom(SALT_BYTES)
+    key = hashlib.scrypt(password.encode("utf-8"), salt=salt, n=params.n, r=params.r, p=params.p,
+                         maxmem=256 * params.n * params.r, dklen=KEY_BYTES)
+    return "$".join(("scrypt", str(params.n), str(params.r), str(params.p), _b64(salt), _b64(key)))
+
+
+def parse_hash(encoded: str):
+    """(params, salt, key) of an encoded hash; ValueError if malformed"""
+    scheme, n, r, p, salt, key = encoded.split("$")
+    if scheme != "scrypt":
+        raise ValueError(f"Unknown password hash scheme {scheme!r}")
+    return ScryptParams(int(n), int(r), int(p)), base64.b64decode(salt), base64.b64decode(key)
+
+
+def verify_password(password: str, encoded: str) -> bool:
+    """Whether password matches the encoded hash (constant-time comparison)"""
+    try:
+        params, salt, key = parse_hash(encoded)
+    except ValueError:
+        return False
+    candidate = hashlib.scrypt(password.encode("utf-8"), salt=salt, n=params.n, r=params.r, p=params.p,
+                               maxmem=256 * params.n * params.r, dklen=len(key))
+    return hmac.compare_digest(candidate, key)
+
+
+def _lower_priority():
+    """Pool thread initializer: run hashing below the event loop where the OS allows it (Linux)"""
+    try:
+        os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 10)
+    except (AttributeError, OSError):
+        pass
+
+
+class CredentialStore:
+    """
+    Password hashes of the accounts that can log in, keyed by email
+
+    Hashes are scrypt (memory-hard, salted per account), so checking a
+    password costs tens of milliseconds of CPU: verify() runs it on a
+    small pool of `workers` threads (hashlib releases the GIL while
+    hashing, so the event loop keeps serving) and refuses with
+    CredentialsBusy once `max_pending` verifications are queued, instead
+    of letting a login burst build an unbounded backlog.
+
+    Unknown accounts are checked against a dummy hash, so the response
+    time doesn't tell which emails exist. Hashes made with weaker params
+    than the current ones are upgraded on the next successful login.
+
+    The file (email -> encoded hash) is read on first use; `defaults`
+    (email -> password) are hashed into it then if missing.
+    """
+
+    def __init__(self, path: Path, defaults: Optional[Mapping[str, str]] = None,
+                 params: ScryptParams = ScryptParams(), workers: int = 2, max_pending: int = 16):
+        self.path = path
+        self.defaults = dict(defaults or {})
+        self.params = params
+        self.workers = workers
+        self.max_pending = max_pending
+        self._hashes: Optional[Dict[str, str]] = None
+        self._dummy: Optional[str] = None
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.pending = 0
+        self.verified = 0
+        self.failed = 0
+        self.busy = 0
+
+    # ------------------------------------------------------------------
+    # Storage (pool threads)
+    # ------------------------------------------------------------------
+
+    def _load(self) -> Dict[str, str]:
+        with self._lock:
+            if self._hashes is not None:
+                return self._hashes
+            hashes = {}
+            if self.path.exists():
+                try:
+                    with open(self.path, 'r') as f:
+                        hashes = json.load(f)
+                except Exception as e:
+                    logger.warning(f"⚠️  Error loading credentials: {e}. Using the default accounts.")
+            missing = {email: password for email, password in self.defaults.items() if email not in hashes}
+            for email, password in missing.items():
+                hashes[email] = hash_password(password, self.params)
+            if missing:
+                self._save(hashes)
+            self._dummy = hash_password(secrets.token_urlsafe(16), self.params)
+            self._hashes = hashes
+            return hashes
+
+    def _save(self, hashes: Dict[str, str]):
+        try:
+            atomic_write_json(self.path, hashes)
+        except OSError as e:
+            logger.error(f"❌ Could not save credentials: {e}")
+
+    def set_password(self, email: str, password: str):
+        """Store a new hash for email (blocking: hashes in the calling thread)"""
+        encoded = hash_password(password, self.params)
+        hashes = self._load()
+        with self._lock:
+            hashes[email] = encoded
+            self._save(hashes)
+
+    def _check(self, email: str, password: str) -> bool:
+        hashes = self._load()
+        encoded = hashes.get(email)
+        if encoded is None:
+            verify_password(password, self._dummy)
+            return False
+        if not verify_password(password, encoded):
+            return False
+        try:
+            outdated = parse_hash(encoded)[0] != self.params
+        except ValueError:
+            outdated = True
+        if outdated:
+            self.set_password(email, password)
+        return True
+
+    # ------------------------------------------------------------------
+    # Verification (event loop)
+    # ------------------------------------------------------------------
+
+    async def verify(self, email: str, password: str) -> bool:
+        """Whether password is email's; raises CredentialsBusy when the pool is saturated"""
+        if self.pending >= self.max_pending:
+            self.busy += 1
+            raise CredentialsBusy()
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="amokk-credentials", initializer=_lower_priority)
+        self.pending += 1
+        try:
+            ok = await asyncio.get_running_loop().run_in_executor(self._executor, self._check, email, password)
+        finally:
+            self.pending -= 1
+        if ok:
+            self.verified += 1
+        else:
+            self.failed += 1
+        return ok
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict:
+        return {
+            "pending": self.pending,
+            "verified": self.verified,
+            "failed": self.failed,
+            "busy": self.busy,
+        }
+
+
+class LoginBackoff:
+    """
+    Per-account delay after repeated failed logins
+
+    After `free_attempts` consecutive failures, each further failure locks
+    the account for base * 2^(extra failures - 1) seconds, capped at
+    max_delay; a successful login clears it. Attempts while locked are
+    refused without hashing anything. At most `capacity` accounts are
+    tracked (least recently failed dropped first), so a stream of made-up
+    emails can't grow it without bound.
+    """
+
+    def __init__(self, free_attempts: int = 3, base: float = 1.0, max_delay: float = 300.0, capacity: int = 4096):
+        self.free_attempts = free_attempts
+        self.base = base
+        self.max_delay = max_delay
+        self.capacity = capacity
+        # email -> [consecutive failures, locked until (time.monotonic())]
+        self._accounts: "OrderedDict[str, list]" = OrderedDict()
+        self.refused = 0
+
+    def retry_after(self, email: str, now: Optional[float] = None) -> float:
+        """Seconds until email may try again (0 if it may now)"""
+        entry = self._accounts.get(email)
+        if entry is None:
+            return 0.0
+        wait = entry[1] - (time.monotonic() if now is None else now)
+        if wait > 0:
+            self.refused += 1
+            return wait
+        return 0.0
+
+    def failure(self, email: str, now: Optional[float] = None) -> float:
+        """Record a failed attempt; returns the lock it triggers (seconds, 0 for none)"""
+        entry = self._accounts.pop(email, None) or [0, 0.0]
+        self._accounts[email] = entry
+        if len(self._accounts) > self.capacity:
+            self._accounts.popitem(last=False)
+        entry[0] += 1
+        extra = entry[0] - self.free_attempts
+        if extra <= 0:
+            return 0.0
+        delay = min(self.max_delay, self.base * 2 ** (extra - 1))
+        entry[1] = (time.monotonic() if now is None else now) + delay
+        return delay
+
+    def success(self, email: str):
+        self._accounts.pop(email, None)
+
+    def locked(self, now: Optional[float] = None) -> int:
+        now = time.monotonic() if now is None else now
+        return sum(1 for _, until in self._accounts.values() if until > now)
@@ -0,0 +1,99 @@
+"""
+AMOKK Backend - State change fan-out
+Server-Sent Events hub used by GET /stream to push AppState changes
+"""
+
+import asyncio
+import json
+import logging
+from typing import Optional, Set
+
+logger = logging.getLogger("amokk")
+
+
+def format_sse(event: str, data: dict, event_id: Optional[int] = None) -> bytes:
+    """Encode one Server-Sent Events frame"""
+    frame = f"event: {event}\n"
+    if event_id is not None:
+        frame += f"id: {event_id}\n"
+    frame += f"data: {json.dumps(data, separators=(',', ':'))}\n\n"
+    return frame.encode("utf-8")
+
+
+HEARTBEAT_FRAME = b"event: heartbeat\ndata: {}\n\n"
+
+
+class Subscriber:
+    """One connected stream client: a bounded queue of pre-encoded frames"""
+
+    def __init__(self, max_queue: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.overflowed = False
+
+
+class StateEventHub:
+    """
+    Fan-out of state change frames to every connected stream subscriber
+
+    Frames are encoded once by the publisher and the same bytes object is
+    queued for every subscriber. Publishers normally run on the event loop
+    (AppState listeners are called from mutate(), which the async handlers
+    await) and fan out directly; a call from another thread is handed over
+    to the loop the hub was bound to at startup, where delivery always
+    happens.
+
+    A subscriber whose queue fills up (client not reading) is disconnected
+    rather than blocking the publisher; EventSource reconnects on its own and
+    receives a fresh snapshot.
+    """
+
+    def __init__(self, max_queue: int = 256):
+        self.max_queue = max_queue
+        self._subscribers: Set[Subscriber] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.published = 0
+        self.dropped_subscribers = 0
+
+    def bind(self, loop: asyncio.AbstractEventLoop):
+        """Attach the hub to the server event loop (called on startup)"""
+        self._loop = loop
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self) -> Subscriber:
+        subscriber = Subscriber(self.max_queue)
+        self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        self._subscribers.discard(subscriber)
+
+    def publish(self, frame: bytes):
+        """Queue a pre-encoded frame for every subscriber (thread-safe)"""
+        if self._loop is None or not self._subscribers:
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            self._fanout(frame)
+        else:
+            try:
+                self._loop.call_soon_threadsafe(self._fanout, frame)
+            except RuntimeError:
+                # Loop already closed (shutdown in progress)
+                pass
+
+    def _fanout(self, frame: bytes):
+        self.published += 1
+        for subscriber in list(self._subscribers):
+            try:
+                subscriber.queue.put_nowait(frame)
+            except asyncio.QueueFull:
+                subscriber.overflowed = True
+                self._subscribers.discard(subscriber)
+                self.dropped_subscribers += 1
+                logger.warning("⚠️  Stream subscriber too slow, disconnecting")
@@ -0,0 +1,242 @@
+"""
+AMOKK Backend - Coaching history
+Append-only log of finished games and toggle changes, with per-day and
+per-week rollups maintained on write for GET /progress
+"""
+
+import logging
+import threading
+import time
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+from persistence import StateWriter
+
+logger = logging.getLogger("amokk")
+
+# Event kinds
+GAME = 1    # A finished game: value = duration (s), coached = coached part (s)
+TOGGLE = 2  # A feature switched on/off: name = API name, value = 1/0
+
+DAY = "day"
+WEEK = "week"
+PERIODS = (DAY, WEEK)
+
+# Rollup bucket holding the all-time totals
+TOTAL = "total"
+
+# Counters of a rollup row, in column order
+ROLLUP_COLUMNS = ("games", "played_seconds", "coached_seconds", "toggles")
+
+
+class HistoryEvent(NamedTuple):
+    ts: float  # Wall-clock time (time.time())
+    email: str
+    kind: int
+    name: Optional[str] = None
+    value: float = 0.0
+    coached: float = 0.0
+
+
+def bucket_of(ts: float, period: str) -> int:
+    """Rollup bucket of a timestamp: ordinal of its local day, or of the Monday of its week"""
+    day = date.fromtimestamp(ts).toordinal()
+    if period == WEEK:
+        return day - date.fromordinal(day).weekday()
+    return day
+
+
+def event_counters(event: HistoryEvent) -> tuple:
+    """What an event adds to its rollups, in ROLLUP_COLUMNS order"""
+    if event.kind == GAME:
+        return (1, event.value, event.coached, 0)
+    if event.kind == TOGGLE:
+        return (0, 0.0, 0.0, 1)
+    return (0, 0.0, 0.0, 0)
+
+
+class HistoryStore:
+    """
+    Per-account history of games and toggles, in SQLite (WAL)
+
+    record() only queues the event: a StateWriter thread writes queued
+    events in batches, and in the same transaction adds them to the
+    rollup rows of their day, their week and the account's all-time
+    totals. Rollups are keyed (email, period, bucket) in a WITHOUT ROWID
+    table, so a GET /progress range is one primary-key range scan over
+    the buckets asked for, however long the history: years of daily
+    rollups are a few hundred short rows per year.
+
+    Raw events older than `retention_days` are pruned (rollups are kept);
+    nothing is held in memory beyond the batch being written.
+
+    Like the profile store, the database is opened on first use.
+    """
+
+    def __init__(self, path: Path, retention_days: int = 400, debounce: float = 1.0, max_latency: float = 5.0):
+        self.path = path
+        self.retention_days = retention_days
+        self.writer = StateWriter(self._write, debounce=debounce, max_latency=max_latency)
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pruned_day = 0
+        self.events = 0
+
+    @property
+    def _db(self):
+        if self._conn is None:
+            import sqlite3  # Deferred with the connection
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS events ("
+                " ts REAL NOT NULL,"
+                " email TEXT NOT NULL,"
+                " kind INTEGER NOT NULL,"
+                " name TEXT,"
+                " value REAL NOT NULL,"
+                " coached REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS events_ts ON events (ts)")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS rollups ("
+                " email TEXT NOT NULL,"
+                " period TEXT NOT NULL,"
+                " bucket INTEGER NOT NULL,"
+                " games INTEGER NOT NULL,"
+                " played_seconds REAL NOT NULL,"
+                " coached_seconds REAL NOT NULL,"
+                " toggles INTEGER NOT NULL,"
+                " PRIMARY KEY (email, period, bucket)) WITHOUT ROWID"
+            )
+        return self._conn
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+
+    def record(self, event: HistoryEvent):
+        """Queue an event; written (and rolled up) by the writer thread"""
+        self.writer.mark_dirty(event)
+
+    def record_game(self, email: str, duration: float, coached: bool):
+        self.record(HistoryEvent(time.time(), email, GAME, value=duration, coached=duration if coached else 0.0))
+
+    def record_toggle(self, email: str, name: str, active: bool):
+        self.record(HistoryEvent(time.time(), email, TOGGLE, name=name, value=1.0 if active else 0.0))
+
+    def start(self):
+        self.writer.start()
+
+    def close(self):
+        """Write queued events and close the database"""
+        self.writer.stop()
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _write(self, events: List[HistoryEvent]):
+        # Sum the batch per rollup row first: one upsert per touched row
+        rollups: Dict[tuple, list] = {}
+        for event in events:
+            counters = event_counters(event)
+            for period, bucket in ((DAY, bucket_of(event.ts, DAY)), (WEEK, bucket_of(event.ts, WEEK)), (TOTAL, 0)):
+                row = rollups.setdefault((event.email, period, bucket), [0, 0.0, 0.0, 0])
+                for i, amount in enumerate(counters):
+                    row[i] += amount
+
+        with self._lock:
+            db = self._db
+            db.execute("BEGIN")
+            try:
+                db.executemany("INSERT INTO events VALUES (?, ?, ?, ?, ?, ?)", events)
+                db.executemany(
+                    "INSERT INTO rollups VALUES (?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT(email, period, bucket) DO UPDATE SET"
+                    " games = games + excluded.games,"
+                    " played_seconds = played_seconds + excluded.played_seconds,"
+                    " coached_seconds = coached_seconds + excluded.coached_seconds,"
+                    " toggles = toggles + excluded.toggles",
+                    [key + tuple(row) for key, row in rollups.items()],
+                )
+                db.execute("COMMIT")
+            except Exception:
+                db.execute("ROLLBACK")
+                raise
+            self.events += len(events)
+            self._prune()
+
+    def _prune(self):
+        """
+        Drop raw events past the retention period, at most once a day
+
+        Runs after the batch is committed: a failure is logged and retried
+        with a later batch, never raised, or the writer would re-queue a
+        batch that is already counted in the rollups.
+        """
+        today = date.today().toordinal()
+        if self._pruned_day == today:
+            return
+        cutoff = time.time() - self.retention_days * 86400
+        try:
+            self._db.execute("DELETE FROM events WHERE ts < ?", (cutoff,))
+        except Exception as e:
+            logger.error(f"❌ History pruning failed (retried with the next batch): {e}")
+            return
+        self._pruned_day = today
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def rollups(self, email: str, period: str, buckets: int, now: Optional[float] = None) -> List[dict]:
+        """
+        The last `buckets` days or weeks of email's history, oldest first,
+        including empty ones (events still queued are written first)
+        """
+        self.writer.flush()
+        last = bucket_of(time.time() if now is None else now, period)
+        step = 7 if period == WEEK else 1
+        first = last - (buckets - 1) * step
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT bucket, games, played_seconds, coached_seconds, toggles FROM rollups "
+                "WHERE email = ? AND period = ? AND bucket BETWEEN ? AND ?",
+                (email, period, first, last),
+            ).fetchall()
+        by_bucket = {row[0]: row[1:] for row in rows}
+        return [
+            rollup_view(date.fromordinal(bucket).isoformat(), by_bucket.get(bucket, (0, 0.0, 0.0, 0)))
+            for bucket in range(first, last + 1, step)
+        ]
+
+    def totals(self, email: str) -> dict:
+        """All-time totals of email (one row)"""
+        self.writer.flush()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT games, played_seconds, coached_seconds, toggles FROM rollups "
+                "WHERE email = ? AND period = ? AND bucket = 0",
+                (email, TOTAL),
+            ).fetchone()
+        view = rollup_view(None, row or (0, 0.0, 0.0, 0))
+        del view["start"]
+        return view
+
+    def stats(self) -> dict:
+        return {**self.writer.stats(), "events": self.events}
+
+
+def rollup_view(start: Optional[str], row: Sequence) -> dict:
+    """API shape of a rollup row (durations in minutes)"""
+    games, played_seconds, coached_seconds, toggles = row
+    return {
+        "start": start,
+        "games": games,
+        "played_minutes": round(played_seconds / 60, 1),
+        "coached_minutes": round(coached_seconds / 60, 1),
+        "toggles": toggles,
+    }
@@ -0,0 +1,271 @@
+"""
+AMOKK Backend - Live game event ingestion
+Fixed-size event records batched by a local game client into a bounded ring,
+drained by a consumer that keeps the live game summary the coach reads
+"""
+
+import asyncio
+import logging
+import struct
+import time
+from collections import deque
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger("amokk")
+
+# One event: timestamp (game clock, s), kind, entity (participant id), a, b.
+# Little-endian and unpadded: a batch is these 20-byte records back to back.
+RECORD = struct.Struct("<dHHff")
+
+# Event kinds and what a/b hold
+POSITION = 1  # a = x, b = y (map units)
+GOLD = 2      # a = current gold
+TIMER = 3     # a = game timer (s)
+KINDS = {POSITION: "position", GOLD: "gold", TIMER: "timer"}
+
+DROP_OLDEST = "drop_oldest"
+REJECT = "reject"
+
+
+class IngestError(ValueError):
+    """Malformed batch (the client's fault: 400)"""
+
+
+class EventRing:
+    """
+    Bounded ring of packed event records
+
+    The ring is one preallocated bytearray of `capacity` record slots.
+    A binary batch is copied in with at most two slice assignments (one
+    if it doesn't wrap): no object is created per event. JSON batches are
+    packed with RECORD.pack_into into a scratch buffer first, then copied
+    in like a binary one, so a malformed batch is refused before anything
+    in the ring is overwritten.
+
+    When a batch doesn't fit in the free slots:
+    - drop_oldest: the oldest unread records are overwritten (counted in
+      `dropped`), so the consumer always gets the latest data;
+    - reject: the whole batch is refused (counted in `rejected`) and the
+      caller tells the client to back off.
+
+    Used from the event loop only (ingest endpoint and consumer), so it
+    takes no lock.
+    """
+
+    def __init__(self, capacity: int = 8192, overflow: str = DROP_OLDEST):
+        if overflow not in (DROP_OLDEST, REJECT):
+            raise ValueError(f"Unknown overflow policy {overflow!r}")
+        self.capacity = capacity
+        self.overflow = overflow
+        self._buffer = bytearray(capacity * RECORD.size)
+        self._view = memoryview(self._buffer)
+        # Total records ever written / read; slot = count % capacity
+        self._head = 0
+        self._tail = 0
+        self.received = 0
+        self.dropped = 0
+        self.rejected = 0
+        self.batches = 0
+        self.meter = RateMeter()
+
+    @property
+    def depth(self) -> int:
+        return self._head - self._tail
+
+    @property
+    def free(self) -> int:
+        return self.capacity - self.depth
+
+    def _reserve(self, count: int) -> Tuple[int, int]:
+        """
+        Make room for count records; returns (records to skip from the
+        start of the batch, records to write), (0, 0) when rejected
+        """
+        skip = 0
+        if count > self.free:
+            if self.overflow == REJECT:
+                self.rejected += count
+                return 0, 0
+            if count > self.capacity:
+                # Only the newest `capacity` records of the batch can be kept
+                skip = count - self.capacity
+                self.dropped += skip
+                count = self.capacity
+            overwritten = count - self.free
+            if overwritten > 0:
+                self._tail += overwritten
+                self.dropped += overwritten
+        return skip, count
+
+    def put(self, data) -> int:
+        """Append a binary batch (bytes-like, whole records); returns how many records were stored"""
+        view = memoryview(data)
+        size = RECORD.size
+        if len(view) % size:
+            raise IngestError(f"Batch size {len(view)} is not a multiple of {size} bytes")
+        skip, count = self._reserve(len(view) // size)
+        if not count:
+            return 0
+        view = view[skip * size:]
+        start = (self._head % self.capacity) * size
+        first = min(count * size, len(self._buffer) - start)
+        self._view[start:start + first] = view[:first]
+        if first < count * size:
+            self._view[:count * size - first] = view[first:count * size]
+        self._commit(count)
+        return count
+
+    def put_events(self, events: list) -> int:
+        """Append [ts, kind, entity, a, b] lists (JSON batches); returns how many were stored"""
+        size = RECORD.size
+        pack_into = RECORD.pack_into
+        batch = bytearray(len(events) * size)
+        try:
+            for i, event in enumerate(events):
+                pack_into(batch, i * size, *event)
+        except (struct.error, TypeError) as e:
+            # Nothing reserved yet: the ring (and its unread events) is untouched
+            raise IngestError(f"Invalid event #{i}: {e}") from None
+        return self.put(batch)
+
+    def _commit(self, count: int):
+        self._head += count
+        self.received += count
+        self.batches += 1
+        self.meter.add(count)
+
+    def drain(self, limit: int) -> bytes:
+        """Copy out and release up to `limit` of the oldest records (one allocation)"""
+        count = min(limit, self.depth)
+        if not count:
+            return b""
+        size = RECORD.size
+        start = (self._tail % self.capacity) * size
+        end = start + count * size
+        if end <= len(self._buffer):
+            chunk = bytes(self._view[start:end])
+        else:
+            chunk = b"".join((self._view[start:], self._view[:end - len(self._buffer)]))
+        self._tail += count
+        return chunk
+
+
+class RateMeter:
+    """Events per second over the last `window` whole seconds (one bucket per second)"""
+
+    def __init__(self, window: int = 5):
+        self.window = window
+        self._buckets: deque = deque(maxlen=window + 1)  # [second, count]
+
+    def add(self, count: int, now: Optional[float] = None):
+        second = int(time.monotonic() if now is None else now)
+        if self._buckets and self._buckets[-1][0] == second:
+            self._buckets[-1][1] += count
+        else:
+            self._buckets.append([second, count])
+
+    def rate(self, now: Optional[float] = None) -> float:
+        """Average over the last `window` complete seconds"""
+        current = int(time.monotonic() if now is None else now)
+        total = sum(count for second, count in self._buckets if current - self.window <= second < current)
+        return total / self.window
+
+
+class LiveGame:
+    """What the coach features know about the game in progress, from the events"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.game_time = 0.0
+        self.gold: Dict[int, float] = {}
+        self.positions: Dict[int, Tuple[float, float]] = {}
+        self.events = 0
+        self.unknown = 0
+        self.last_event_at: Optional[float] = None  # time.time() of the last applied batch
+
+    def apply(self, chunk: bytes):
+        """Fold drained records into the summary (latest value per entity wins)"""
+        gold = self.gold
+        positions = self.positions
+        game_time = self.game_time
+        count = 0
+        for ts, kind, entity, a, b in RECORD.iter_unpack(chunk):
+            count += 1
+            if kind == POSITION:
+                positions[entity] = (a, b)
+            elif kind == GOLD:
+                gold[entity] = a
+            elif kind == TIMER:
+                game_time = a
+            else:
+                self.unknown += 1
+                continue
+            if ts > game_time:
+                game_time = ts
+        self.game_time = game_time
+        self.events += count
+        if count:
+            self.last_event_at = time.time()
+
+    def view(self) -> dict:
+        return {
+            "game_time": round(self.game_time, 2),
+            "events": self.events,
+            "entities": len(self.positions.keys() | self.gold.keys()),
+            "gold": {str(entity): round(value) for entity, value in sorted(self.gold.items())},
+            "positions": {str(entity): [round(x, 1), round(y, 1)] for entity, (x, y) in sorted(self.positions.items())},
+            "last_event_at": self.last_event_at,
+        }
+
+
+class IngestConsumer:
+    """
+    Drains the ring into a LiveGame every `interval` seconds, at most
+    `batch` records per tick
+
+    A consumer slower than the producers leaves records in the ring (its
+    depth is the backlog); the ring's overflow policy decides what happens
+    when it fills up.
+    """
+
+    def __init__(self, ring: EventRing, game: LiveGame, interval: float = 0.05, batch: int = 4096):
+        self.ring = ring
+        self.game = game
+        self.interval = interval
+        self.batch = batch
+        self.consumed = 0
+        self.ticks = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def tick(self) -> int:
+        chunk = self.ring.drain(self.batch)
+        if not chunk:
+            return 0
+        count = len(chunk) // RECORD.size
+        try:
+            self.game.apply(chunk)
+        except Exception as e:
+            logger.error(f"❌ Event consumer error: {e}")
+        self.consumed += count
+        self.ticks += 1
+        return count
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            self.tick()
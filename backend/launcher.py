@@ -1,40 +1,199 @@
 #!/usr/bin/env python3
 """
-AMOKK Backend Launcher - Auto-installs dependencies and launches backend
+AMOKK Backend Launcher - Ensures dependencies are installed and launches backend
+
+pip only runs when needed: a stamp file records a fingerprint of
+requirements.txt plus the interpreter, and launches with a matching stamp
+skip straight to the server. Without a stamp, the installed distributions
+are checked against requirements.txt first; pip runs only if something is
+missing, from the local wheelhouse (offline) when there is one.
+
+The backend then runs in this interpreter, or, with LAUNCHER_SUPERVISE=1
+(set by Electron), in a child process this launcher supervises: restarted
+with exponential backoff when it crashes, recycled when it stops answering
+GET /healthz, with one "AMOKK_SUPERVISOR {...}" JSON line on stdout per
+supervisor event (see Supervisor).
+
+Environment:
+    LAUNCHER_STAMP       stamp file (default: backend/.deps-stamp, or
+                         ~/.amokk/deps-stamp if the backend dir is read-only)
+    LAUNCHER_WHEELHOUSE  directory of wheels for offline installs
+                         (default: backend/wheelhouse)
+    LAUNCHER_SUPERVISE   1 to run the backend in a supervised child process
+    LAUNCHER_RESTART_BASE_SECONDS, LAUNCHER_RESTART_MAX_SECONDS
+                         restart backoff: base * 2^(crashes in a row - 1), capped
+    LAUNCHER_STABLE_SECONDS
+                         uptime after which the crash count starts over
+    LAUNCHER_MAX_RESTARTS
+                         crashes in a row before giving up (0 for no limit)
+    LAUNCHER_WATCHDOG_SECONDS, LAUNCHER_WATCHDOG_TIMEOUT_SECONDS, LAUNCHER_WATCHDOG_FAILURES
+                         health check interval, timeout and failures in a
+                         row before the backend is recycled (0 s disables)
+    LAUNCHER_STARTUP_TIMEOUT_SECONDS
+                         time allowed until the ready line before recycling
+    LAUNCHER_STOP_GRACE_SECONDS
+                         time a recycled backend gets to exit before it is killed
 """
+import hashlib
+import json
+import os
+import platform
+import re
+import runpy
+import signal
 import subprocess
 import sys
-import os
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Optional
 
-def install_dependencies():
-    """Install required dependencies if needed"""
-    backend_dir = Path(__file__).parent
-    requirements_file = backend_dir / 'requirements.txt'
+BACKEND_DIR = Path(__file__).parent
+REQUIREMENTS_FILE = BACKEND_DIR / 'requirements.txt'
 
-    print(f"[LAUNCHER] Backend directory: {backend_dir}")
-    print(f"[LAUNCHER] Requirements file: {requirements_file}")
+# "name[extras]==version" (version optional); anything else forces a pip run
+REQUIREMENT_LINE = re.compile(r'^([A-Za-z0-9][A-Za-z0-9._-]*)(\[[^\]]*\])?\s*(?:==\s*([^\s;#]+))?\s*$')
 
-    if not requirements_file.exists():
-        print(f"[LAUNCHER] ERROR: requirements.txt not found at {requirements_file}")
-        return False
+# Seconds spent in each launcher phase, reported before the server starts
+phase_times = {}
+
+# Backend ready line (see startup.py; not imported, the supervisor stays light)
+READY_PREFIX = 'AMOKK_READY '
+# Supervisor events for Electron: prefix + one JSON object per line
+SUPERVISOR_PREFIX = 'AMOKK_SUPERVISOR '
+# Set for the supervised backend: it shuts down when its stdin (our pipe) closes
+SUPERVISED_ENV = 'AMOKK_SUPERVISED'
 
-    print("[LAUNCHER] Installing dependencies...")
+
+@contextmanager
+def phase(name: str):
+    """Time one launcher phase into phase_times"""
+    started = time.perf_counter()
     try:
-        result = subprocess.run(
-            [sys.executable, '-m', 'pip', 'install', '-r', str(requirements_file), '-q'],
-            check=True
-        )
-        print("[LAUNCHER] ✓ Dependencies installed successfully")
+        yield
+    finally:
+        phase_times[name] = time.perf_counter() - started
+
+
+def stamp_path() -> Path:
+    if os.environ.get('LAUNCHER_STAMP'):
+        return Path(os.environ['LAUNCHER_STAMP'])
+    if os.access(BACKEND_DIR, os.W_OK):
+        return BACKEND_DIR / '.deps-stamp'
+    # Installed app (read-only resources): keep the stamp in the user's home
+    return Path.home() / '.amokk' / 'deps-stamp'
+
+
+def wheelhouse_path() -> Path:
+    return Path(os.environ.get('LAUNCHER_WHEELHOUSE', BACKEND_DIR / 'wheelhouse'))
+
+
+def fingerprint(requirements: bytes) -> str:
+    """Hash of requirements.txt and the interpreter that would install them"""
+    digest = hashlib.sha256(requirements)
+    for part in (sys.executable, sys.version, sys.implementation.cache_tag, platform.machine()):
+        digest.update(b'\0' + str(part).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def read_stamp(path: Path) -> str:
+    try:
+        return json.loads(path.read_text()).get('fingerprint', '')
+    except (OSError, ValueError, AttributeError):
+        return ''
+
+
+def write_stamp(path: Path, value: str):
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({'fingerprint': value, 'python': sys.executable, 'created': time.time()}))
+    except OSError as e:
+        print(f"[LAUNCHER] WARNING: could not write dependency stamp {path}: {e}")
+
+
+def requirements_satisfied(requirements: str) -> bool:
+    """True if every requirement is installed at the pinned version (no pip involved)"""
+    from importlib import metadata
+
+    for line in requirements.splitlines():
+        line = line.split('#', 1)[0].strip()
+        if not line:
+            continue
+        match = REQUIREMENT_LINE.match(line)
+        if match is None:
+            return False  # Options, URLs, markers...: let pip decide
+        name, _, version = match.groups()
+        try:
+            installed = metadata.version(name)
+        except metadata.PackageNotFoundError:
+            return False
+        if version is not None and installed != version:
+            return False
+    return True
+
+
+def run_pip(args) -> bool:
+    command = [sys.executable, '-m', 'pip', 'install', '-q', '--disable-pip-version-check', *args,
+               '-r', str(REQUIREMENTS_FILE)]
+    try:
+        subprocess.run(command, check=True)
         return True
     except Exception as e:
-        print(f"[LAUNCHER] ERROR: Failed to install dependencies: {e}")
+        print(f"[LAUNCHER] ERROR: pip failed: {e}")
+        return False
+
+
+def install_dependencies():
+    """Install required dependencies if needed"""
+    print(f"[LAUNCHER] Backend directory: {BACKEND_DIR}")
+    print(f"[LAUNCHER] Requirements file: {REQUIREMENTS_FILE}")
+
+    if not REQUIREMENTS_FILE.exists():
+        print(f"[LAUNCHER] ERROR: requirements.txt not found at {REQUIREMENTS_FILE}")
         return False
 
+    with phase('fingerprint'):
+        requirements = REQUIREMENTS_FILE.read_bytes()
+        current = fingerprint(requirements)
+        stamp = stamp_path()
+        stamped = read_stamp(stamp) == current
+    if stamped:
+        print("[LAUNCHER] ✓ Dependencies up to date (stamp match), skipping pip")
+        return True
+
+    with phase('dependency_check'):
+        satisfied = requirements_satisfied(requirements.decode('utf-8'))
+    if satisfied:
+        print("[LAUNCHER] ✓ Dependencies already installed, skipping pip")
+        write_stamp(stamp, current)
+        return True
+
+    with phase('install'):
+        wheelhouse = wheelhouse_path()
+        installed = False
+        if wheelhouse.is_dir():
+            print(f"[LAUNCHER] Installing dependencies from local wheelhouse {wheelhouse}...")
+            installed = run_pip(['--no-index', '--find-links', str(wheelhouse)])
+        if not installed:
+            print("[LAUNCHER] Installing dependencies...")
+            installed = run_pip(['--timeout', '15'])
+    if installed:
+        print("[LAUNCHER] ✓ Dependencies installed successfully")
+        write_stamp(stamp, current)
+    return installed
+
+
+def report_phases():
+    """One line with the time spent in each launcher phase (milliseconds)"""
+    timings = ", ".join(f"{name} {seconds * 1000:.1f} ms" for name, seconds in phase_times.items())
+    print(f"[LAUNCHER] Startup phases: {timings}")
+
+
 def launch_main():
-    """Launch main.py using subprocess"""
-    backend_dir = Path(__file__).parent
-    main_py = backend_dir / 'main.py'
+    """Run main.py in this interpreter (no second Python process to start)"""
+    main_py = BACKEND_DIR / 'main.py'
 
     print(f"[LAUNCHER] Attempting to launch main.py: {main_py}")
 
@@ -45,23 +204,267 @@ def launch_main():
     print("[LAUNCHER] ✓ main.py found, starting server...")
     print("[LAUNCHER] ==========================================")
 
-    # Run main.py with current Python interpreter
+    # Command-line flags (e.g. --startup-profile) are passed through to main.py
+    sys.argv = [str(main_py)] + sys.argv[1:]
     try:
-        result = subprocess.run([sys.executable, str(main_py)], check=False)
-        print(f"[LAUNCHER] Backend exited with code: {result.returncode}")
+        runpy.run_path(str(main_py), run_name='__main__')
+        print("[LAUNCHER] Backend exited with code: 0")
+    except SystemExit as e:
+        print(f"[LAUNCHER] Backend exited with code: {e.code}")
+        raise
     except Exception as e:
         print(f"[LAUNCHER] ERROR: {e}")
         sys.exit(1)
 
+
+# ============================================================================
+# Supervisor
+# ============================================================================
+
+class Supervisor:
+    """
+    Runs main.py in a child process and keeps it running
+
+    - Crash (non-zero exit): restarted after base * 2^(n - 1) seconds for
+      the n-th crash in a row (capped at max_delay); a child that stayed
+      up `stable` seconds resets n. After max_restarts crashes in a row
+      the supervisor gives up and exits with the child's code.
+    - Hang: once the child printed its ready line, GET /healthz every
+      `watchdog` seconds; `failures` timeouts/errors in a row, or no ready
+      line within `startup_timeout`, and the child is recycled (stopped,
+      killed if needed, restarted).
+    - A clean exit (code 0) ends supervision; so does SIGINT/SIGTERM:
+      the child is asked to shut down (its stdin closed, plus SIGINT
+      outside Windows) and only terminated if it hasn't exited within
+      `grace` seconds.
+
+    The child's stdout is relayed line by line (so Electron still gets the
+    AMOKK_READY line, once per start); its stdin is a pipe that closes if
+    the supervisor dies, which makes the child shut down instead of
+    outliving it. Restarts keep the port of the first start.
+    """
+
+    def __init__(self, command: list, base: float = 0.5, max_delay: float = 30.0, stable: float = 60.0,
+                 max_restarts: int = 10, watchdog: float = 5.0, watchdog_timeout: float = 2.0,
+                 failures: int = 3, startup_timeout: float = 60.0, grace: float = 5.0):
+        self.command = command
+        self.base = base
+        self.max_delay = max_delay
+        self.stable = stable
+        self.max_restarts = max_restarts
+        self.watchdog = watchdog
+        self.watchdog_timeout = watchdog_timeout
+        self.failures = failures
+        self.startup_timeout = startup_timeout
+        self.grace = grace
+
+        self.process: Optional[subprocess.Popen] = None
+        self.ready: Optional[dict] = None
+        self.port: Optional[int] = None
+        self.starts = 0
+        self.restarts = 0
+        self.crashes = 0
+        self.hangs = 0
+        self.consecutive = 0
+        self._ready_event = threading.Event()
+        self._stop = threading.Event()
+        self._stop_deadline = None
+
+    def emit(self, event: str, **fields):
+        """One supervisor event line on stdout (single write, so it can't interleave)"""
+        stats = {"starts": self.starts, "restarts": self.restarts, "crashes": self.crashes, "hangs": self.hangs}
+        line = SUPERVISOR_PREFIX + json.dumps({"event": event, **fields, "stats": stats}, separators=(',', ':'))
+        sys.stdout.write(line + "\n")
+        sys.stdout.flush()
+
+    def stop(self, *_):
+        """
+        Signal handler: stop supervising and let the child shut down
+
+        Graceful on every platform: the child exits on EOF on its stdin
+        (main.py watch_supervisor), with its final state flush. On Windows
+        send_signal() could only TerminateProcess it, so it is used only
+        after `grace` seconds (see _watch).
+        """
+        self._stop.set()
+        self._stop_deadline = time.monotonic() + self.grace
+        process = self.process
+        if process is None or process.poll() is not None:
+            return
+        try:
+            process.stdin.close()
+        except OSError:
+            pass
+        if os.name != 'nt':
+            try:
+                process.send_signal(signal.SIGINT)
+            except OSError:
+                pass
+
+    def _spawn(self):
+        env = dict(os.environ, PYTHONUNBUFFERED='1')
+        env[SUPERVISED_ENV] = '1'
+        if self.port is not None:
+            env['BACKEND_PORT'] = str(self.port)
+        self.ready = None
+        self._ready_event.clear()
+        self.process = subprocess.Popen(
+            self.command, cwd=str(BACKEND_DIR), env=env,
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=None,
+            text=True, encoding='utf-8', errors='replace',
+        )
+        self.starts += 1
+        threading.Thread(target=self._relay, args=(self.process,), name='launcher-relay', daemon=True).start()
+        self.emit("started", pid=self.process.pid)
+
+    def _relay(self, process: subprocess.Popen):
+        """Copy the child's stdout to ours, noting its ready line"""
+        for line in process.stdout:
+            sys.stdout.write(line)
+            sys.stdout.flush()
+            if line.startswith(READY_PREFIX) and process is self.process:
+                try:
+                    self.ready = json.loads(line[len(READY_PREFIX):])
+                    self.port = self.ready.get('port', self.port)
+                except ValueError:
+                    self.ready = {}
+                self._ready_event.set()
+
+    def _healthy(self) -> bool:
+        url = f"http://{self.ready.get('host', '127.0.0.1')}:{self.ready.get('port', self.port)}/healthz"
+        try:
+            with urllib.request.urlopen(url, timeout=self.watchdog_timeout) as response:
+                return response.status == 200
+        except Exception:
+            return False
+
+    def _watch(self) -> Optional[int]:
+        """Wait for the child to exit (returns its code) or hang (returns None)"""
+        process = self.process
+        started = time.monotonic()
+        failed = 0
+        next_check = None
+        while True:
+            try:
+                return process.wait(timeout=0.2)
+            except subprocess.TimeoutExpired:
+                pass
+            now = time.monotonic()
+            if self._stop.is_set():
+                if self._stop_deadline is not None and now > self._stop_deadline:
+                    print(f"[LAUNCHER] Backend still running {self.grace:g} s after stop, terminating")
+                    self._stop_deadline = None
+                    self._terminate()
+                continue
+            if not self._ready_event.is_set():
+                if self.startup_timeout and now - started > self.startup_timeout:
+                    self.emit("unresponsive", pid=process.pid, reason="startup_timeout")
+                    return None
+                continue
+            if not self.watchdog:
+                continue
+            if next_check is None:
+                next_check = now + self.watchdog
+            if now < next_check:
+                continue
+            next_check = now + self.watchdog
+            if self._healthy():
+                failed = 0
+                continue
+            failed += 1
+            if failed >= self.failures:
+                self.emit("unresponsive", pid=process.pid, reason="healthz", failures=failed)
+                return None
+
+    def _terminate(self):
+        """Stop a hung child: SIGTERM (TerminateProcess on Windows), then kill after `grace` seconds"""
+        process = self.process
+        process.terminate()
+        try:
+            process.wait(timeout=self.grace)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+    def run(self) -> int:
+        """Supervise until a clean exit, a stop signal or too many crashes; returns the exit code"""
+        while True:
+            self._spawn()
+            started = time.monotonic()
+            code = self._watch()
+            uptime = round(time.monotonic() - started, 3)
+            if code is None:
+                self._terminate()
+                self.hangs += 1
+                reason = "hung"
+                code = self.process.returncode
+            else:
+                reason = "crash"
+            pid = self.process.pid
+            if self._stop.is_set() or reason == "crash" and code == 0:
+                self.emit("stopped", pid=pid, exit_code=code, uptime=uptime)
+                return code or 0
+
+            if reason == "crash":
+                self.crashes += 1
+            if uptime >= self.stable:
+                self.consecutive = 0
+            self.consecutive += 1
+            if self.max_restarts and self.consecutive > self.max_restarts:
+                self.emit("gave_up", pid=pid, reason=reason, exit_code=code, uptime=uptime)
+                return code if code and code > 0 else 1
+
+            delay = min(self.max_delay, self.base * 2 ** (self.consecutive - 1))
+            self.emit("restarting", pid=pid, reason=reason, exit_code=code, uptime=uptime, backoff=delay)
+            if self._stop.wait(delay):
+                self.emit("stopped", pid=pid, exit_code=code, uptime=uptime)
+                return 0
+            self.restarts += 1
+
+
+def supervise_main() -> int:
+    """Run main.py in a supervised child process (see Supervisor)"""
+    main_py = BACKEND_DIR / 'main.py'
+    if not main_py.exists():
+        print(f"[LAUNCHER] ERROR: main.py not found at {main_py}")
+        return 1
+
+    env = os.environ.get
+    supervisor = Supervisor(
+        [sys.executable, str(main_py)] + sys.argv[1:],
+        base=float(env('LAUNCHER_RESTART_BASE_SECONDS', 0.5)),
+        max_delay=float(env('LAUNCHER_RESTART_MAX_SECONDS', 30)),
+        stable=float(env('LAUNCHER_STABLE_SECONDS', 60)),
+        max_restarts=int(env('LAUNCHER_MAX_RESTARTS', 10)),
+        watchdog=float(env('LAUNCHER_WATCHDOG_SECONDS', 5)),
+        watchdog_timeout=float(env('LAUNCHER_WATCHDOG_TIMEOUT_SECONDS', 2)),
+        failures=int(env('LAUNCHER_WATCHDOG_FAILURES', 3)),
+        startup_timeout=float(env('LAUNCHER_STARTUP_TIMEOUT_SECONDS', 60)),
+        grace=float(env('LAUNCHER_STOP_GRACE_SECONDS', 5)),
+    )
+    signal.signal(signal.SIGINT, supervisor.stop)
+    signal.signal(signal.SIGTERM, supervisor.stop)
+    print("[LAUNCHER] ✓ main.py found, starting supervised server...")
+    print("[LAUNCHER] ==========================================")
+    code = supervisor.run()
+    print(f"[LAUNCHER] Backend exited with code: {code}")
+    return code
+
+
 if __name__ == '__main__':
+    launcher_started = time.perf_counter()
     print("[LAUNCHER] Starting AMOKK Backend Launcher")
     print(f"[LAUNCHER] Python: {sys.executable}")
-    print(f"[LAUNCHER] Working directory: {Path(__file__).parent}")
+    print(f"[LAUNCHER] Working directory: {BACKEND_DIR}")
 
     # Ensure dependencies are installed
     install_dependencies()
+    phase_times['launcher_total'] = time.perf_counter() - launcher_started
+    report_phases()
 
-    # Launch the backend
+    # Launch the backend (--startup-profile always runs in-process: it measures one start)
+    if os.environ.get('LAUNCHER_SUPERVISE', '0') == '1' and '--startup-profile' not in sys.argv:
+        sys.exit(supervise_main())
     launch_main()
 
     print("[LAUNCHER] Backend launcher exiting")
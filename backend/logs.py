@@ -0,0 +1,203 @@
+"""
+AMOKK Backend - Logging pipeline
+Queue-based "amokk" logger: request handlers only enqueue records, a
+background listener formats and writes them (console, rotating file) and
+keeps the most recent ones in memory for GET /logs
+"""
+
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Dict, List, Optional
+
+CONSOLE_FORMAT = '[%(asctime)s] %(message)s'
+CONSOLE_DATEFMT = '%H:%M:%S'
+
+# Standard LogRecord attributes; anything else was passed with extra= and
+# is kept as a structured field
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+def record_fields(record: logging.LogRecord) -> dict:
+    """Structured view of a record: time, level, logger, message and extra fields"""
+    fields = {
+        "ts": round(record.created, 3),
+        "level": record.levelname,
+        "logger": record.name,
+        "msg": record.getMessage(),
+    }
+    for key, value in vars(record).items():
+        if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+            fields[key] = value
+    return fields
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line (LOG_FORMAT=json)"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        return json.dumps(record_fields(record), ensure_ascii=False, default=str, separators=(',', ':'))
+
+
+class RingBufferHandler(logging.Handler):
+    """
+    The last `capacity` records, as structured dicts, for GET /logs
+
+    Each record gets a sequence number, so a client can poll with
+    ?since=<last seq> and only receive what is new.
+    """
+
+    def __init__(self, capacity: int = 500):
+        super().__init__()
+        self._records = deque(maxlen=capacity)
+        self._seq = 0
+
+    def emit(self, record: logging.LogRecord):
+        # Called by the listener thread only (handle() holds self.lock)
+        self._seq += 1
+        self._records.append({"seq": self._seq, **record_fields(record)})
+
+    @property
+    def last_seq(self) -> int:
+        return self._seq
+
+    def records(self, since: int = 0, level: int = logging.NOTSET, limit: Optional[int] = None) -> List[dict]:
+        """Records newer than sequence number `since`, at `level` or above, oldest first"""
+        with self.lock:
+            snapshot = list(self._records)
+        selected = [
+            entry for entry in snapshot
+            if entry["seq"] > since and logging.getLevelName(entry["level"]) >= level
+        ]
+        return selected[-limit:] if limit else selected
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep 1 record in `every` per route, for high-frequency routes
+
+    Applies to records carrying a `route` extra field (access log); routes
+    not listed, warnings and errors always pass. Cheap enough to run on the
+    request path: one dict update per sampled record.
+    """
+
+    def __init__(self, routes: Dict[str, int]):
+        super().__init__()
+        self.routes = routes
+        self._counts: Dict[str, int] = {}
+        self.dropped = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        every = self.routes.get(getattr(record, "route", None))
+        if not every or record.levelno >= logging.WARNING:
+            return True
+        count = self._counts.get(record.route, 0)
+        self._counts[record.route] = count + 1
+        if count % every == 0:
+            record.sampled = every
+            return True
+        self.dropped += 1
+        return False
+
+
+class LogPipeline:
+    """
+    QueueHandler on the logger, QueueListener thread behind it
+
+    logger.info() from a request handler costs one LogRecord and one queue
+    put; formatting and I/O happen on the listener thread. Records emitted
+    before start() wait in the queue.
+    """
+
+    def __init__(self, logger: logging.Logger, json_format: bool = False, ring_size: int = 500):
+        self.logger = logger
+        self.queue = queue.SimpleQueue()
+        self.queue_handler = logging.handlers.QueueHandler(self.queue)
+        self.ring = RingBufferHandler(ring_size)
+
+        self.formatter = JsonFormatter() if json_format else logging.Formatter(CONSOLE_FORMAT, datefmt=CONSOLE_DATEFMT)
+        console = logging.StreamHandler(sys.stdout)
+        console.setFormatter(self.formatter)
+
+        self.listener = logging.handlers.QueueListener(
+            self.queue, console, self.ring, respect_handler_level=True)
+        self._lock = threading.Lock()
+        self._started = False
+
+        for handler in list(logger.handlers):
+            logger.removeHandler(handler)
+        logger.addHandler(self.queue_handler)
+        logger.propagate = False
+
+    def add_file(self, path: Path, max_bytes: int, backups: int):
+        """Also write to a rotating log file (rotation happens on the listener thread)"""
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            handler = logging.handlers.RotatingFileHandler(
+                str(path), maxBytes=max_bytes, backupCount=backups, encoding="utf-8", delay=True)
+        except OSError as e:
+            self.logger.warning(f"⚠️  Could not open log file {path}: {e}")
+            return
+        handler.setFormatter(self.formatter)
+        # Replacing the tuple is atomic; the listener picks it up on its next record
+        self.listener.handlers = self.listener.handlers + (handler,)
+
+    def add_filter(self, log_filter: logging.Filter):
+        """Filter applied before records are queued (runs on the caller's thread)"""
+        self.queue_handler.addFilter(log_filter)
+
+    def start(self):
+        with self._lock:
+            if not self._started:
+                self.listener.start()
+                self._started = True
+
+    def stop(self):
+        """Drain the queue and stop the listener (idempotent)"""
+        with self._lock:
+            if self._started:
+                self.listener.stop()
+                self._started = False
+                for handler in self.listener.handlers:
+                    handler.flush()
+
+
+class AccessLogMiddleware:
+    """
+    Pure ASGI middleware: one "amokk.access" record per request
+    (method, route template, status, duration), logged when the response
+    headers are sent: at ERROR for 5xx, WARNING for 4xx, INFO otherwise, so
+    SamplingFilter (sampling high-frequency routes) always keeps failures.
+    """
+
+    def __init__(self, app, logger: logging.Logger):
+        self.app = app
+        self.logger = logger
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                route = scope.get("route")
+                path = route.path if route is not None else scope["path"]
+                ms = round((time.perf_counter() - started) * 1000, 2)
+                status = message["status"]
+                level = logging.ERROR if status >= 500 else logging.WARNING if status >= 400 else logging.INFO
+                self.logger.log(
+                    level, f"{scope['method']} {path} {status} {ms} ms",
+                    extra={"route": path, "status": status, "duration_ms": ms},
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
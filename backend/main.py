@@ -1,18 +1,60 @@
 """
 AMOKK Mock Backend - FastAPI Server
 Provides local coaching data endpoints for the React frontend
+
+Run directly (python main.py) to serve on BACKEND_PORT (an ephemeral port
+if it is taken) and, with BACKEND_SOCKET, a Unix domain socket; once the
+sockets are listening, a single "AMOKK_READY {...}" JSON line with the
+bound port, socket path and the startup profile is printed to stdout. --startup-profile prints the
+profile and exits once ready. --workers N (BACKEND_WORKERS) serves with N
+worker processes sharing the state through a memory-mapped segment.
 """
 
-from fastapi import FastAPI, HTTPException, Request
+import sys
+
+# Spawned workers run this file as "__mp_main__": make it the "main" module
+# uvicorn imports, so each worker builds the app once
+if __name__ in ("__main__", "__mp_main__"):
+    sys.modules.setdefault("main", sys.modules[__name__])
+
+# Started first, so the import phase covers FastAPI / pydantic
+from startup import Endpoint, StartupProfile, ready_message, serve
+startup_profile = StartupProfile()
+
+from fastapi import Depends, FastAPI, Header, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import Optional
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, StrictBool, create_model
+from types import MappingProxyType
+from typing import Mapping, NamedTuple, Optional, Tuple
+import asyncio
+import atexit
 import json
 from pathlib import Path
 import logging
-import sys
+import math
+import os
+import signal
+import time
 from datetime import datetime
 
+from auth import TokenEntry, TokenStore, bearer_token
+from credentials import CredentialsBusy, CredentialStore, LoginBackoff, ScryptParams
+from events import HEARTBEAT_FRAME, StateEventHub, format_sse
+import history
+from history import HistoryStore
+from ingest import RECORD, EventRing, IngestConsumer, IngestError, LiveGame
+from logs import AccessLogMiddleware, LogPipeline, SamplingFilter
+from metrics import Counter, Histogram, MetricsMiddleware, Observed, Registry, process_rss_bytes
+from outbox import SupportOutbox, sink_from_url
+from persistence import StateJournal, StateWriter, atomic_write_bytes
+from profiles import ProfileStore
+from ratelimit import Limit, RateLimiter, RateLimitMiddleware, parse_limit
+from response_cache import ResponseCache
+from schema import STATE_SCHEMA, SchemaError
+from shared_state import FileLock, SegmentPersister, SharedStateSegment
+import session
+
 # ============================================================================
 # Logging Configuration - Clean and readable logs
 # ============================================================================
@@ -26,27 +68,35 @@ logging.getLogger("fastapi").setLevel(logging.WARNING)
 logger = logging.getLogger("amokk")
 logger.setLevel(logging.INFO)
 
-# Console handler with clean format
-console_handler = logging.StreamHandler(sys.stdout)
-console_handler.setLevel(logging.INFO)
-formatter = logging.Formatter('[%(asctime)s] %(message)s', datefmt='%H:%M:%S')
-console_handler.setFormatter(formatter)
-logger.addHandler(console_handler)
+# Handlers only enqueue; a listener thread writes to stdout (clean format,
+# or one JSON object per line with LOG_FORMAT=json), to the rotating log
+# file (added once the state directory is known) and to the ring buffer
+# served by GET /logs
+log_pipeline = LogPipeline(
+    logger,
+    json_format=os.environ.get("LOG_FORMAT", "text") == "json",
+    ring_size=int(os.environ.get("LOG_RING_SIZE", 500)),
+)
+log_pipeline.start()
+atexit.register(log_pipeline.stop)
+
+startup_profile.mark("import")
 
 # ============================================================================
 # Pydantic Models (Request/Response schemas)
 # ============================================================================
 
+# StrictBool: lax parsing would read the strings "false" and "0" as true
 class CoachToggleRequest(BaseModel):
-    active: bool
+    active: StrictBool
 
 
 class AssistantToggleRequest(BaseModel):
-    active: bool
+    active: StrictBool
 
 
 class AmokkToggleRequest(BaseModel):
-    active: bool
+    active: StrictBool
 
 
 class PTTKeyRequest(BaseModel):
@@ -57,6 +107,14 @@ class VolumeRequest(BaseModel):
     volume: int  # 0-100
 
 
+# Any subset of the configurable fields (same names as LocalDataResponse)
+ConfigPatchRequest = create_model(
+    "ConfigPatchRequest",
+    **{api: (Optional[StrictBool if field.type is bool else field.type], None)
+       for api, field in STATE_SCHEMA.config_fields.items()},
+)
+
+
 class PlanSelectionRequest(BaseModel):
     plan_id: int
 
@@ -78,117 +136,528 @@ class LoginResponse(BaseModel):
     email: str
 
 
-class LocalDataResponse(BaseModel):
-    remaining_games: int
-    first_launch: bool
-    game_timer: int
-    email: str
-    coach_toggle: bool
-    assistant_toggle: bool
-    amokk_toggle: bool
-    ptt_key: str
-    tts_volume: int
+# Dashboard payload, for the API docs: bodies are encoded straight from
+# the state snapshot (see local_data_payload), never through this model
+LocalDataResponse = create_model(
+    "LocalDataResponse",
+    **{field.api: (field.api_type, ...) for field in STATE_SCHEMA.fields if field.read},
+    version=(int, ...),
+)
 
 
 # ============================================================================
 # Authentication (Simple mock for development)
 # ============================================================================
 
+# Development accounts, hashed into the credential store (credentials.json)
+# the first time it is used; the store checks passwords, not this dict
 VALID_USERS = {
     "admin@amokk.fr": "admin",
 }
 
 
-def generate_mock_token(email: str) -> str:
-    """Generate a mock JWT token for development"""
-    import secrets
-    return f"mock-jwt-token-{secrets.token_hex(16)}"
-
-
 # ============================================================================
 # Application State (In-memory storage for demo)
 # ============================================================================
 
+class VersionConflict(Exception):
+    """Raised when a conditional update targets an outdated state version"""
+
+    def __init__(self, current_version: int):
+        super().__init__(f"State is at version {current_version}")
+        self.current_version = current_version
+
+
+class StateSnapshot(NamedTuple):
+    """Immutable view of the whole state at one version"""
+    data: Mapping
+    version: int
+
+
 class AppState:
-    """Mock application state - persisted to JSON file"""
+    """
+    Mock application state - persisted to JSON file
+
+    Single-writer model: the current state is an immutable StateSnapshot
+    that is swapped in one assignment. Reads (snapshot(), attribute access)
+    never lock and always see a consistent version; every write goes through
+    the async apply()/mutate() path, serialized by one asyncio lock.
+
+    Durability: state.json is a snapshot tagged with its version, and
+    state.journal holds every later mutation (appended and fsynced in
+    batches by the write-behind writer). Once the journal reaches
+    STATE_JOURNAL_COMPACT_RECORDS it is folded into a new snapshot, so
+    startup replays a bounded number of records.
+
+    Multi-worker mode (`shared` segment): the current state is the one in
+    the shared-memory segment. snapshot() checks the segment's sequence
+    number and picks up (and notifies) writes made by other workers;
+    mutations are serialized across processes by the segment lock and
+    published to the segment, and the parent process saves it to
+    state.json (see serve_workers).
+    """
 
-    def __init__(self):
-        self.state_file = Path(__file__).parent / "state.json"
-        self.load_state()
+    def __init__(self, state_file: Optional[Path] = None, shared: Optional[SharedStateSegment] = None):
+        self.shared = shared
+        self._shared_seq = -1
+        self.state_file = Path(state_file or os.environ.get("STATE_FILE", Path(__file__).parent / "state.json"))
+        self.journal = StateJournal(self.state_file.with_suffix(".journal"))
+        self.compact_every = int(os.environ.get("STATE_JOURNAL_COMPACT_RECORDS", 1000))
+        self.compactions = 0
+        self.last_compaction_ms = 0.0
+        self.writer = StateWriter(
+            self._persist,
+            debounce=int(os.environ.get("STATE_FLUSH_DEBOUNCE_MS", 250)) / 1000,
+            max_latency=int(os.environ.get("STATE_FLUSH_MAX_LATENCY_MS", 2000)) / 1000,
+        )
+        self._listeners = []
+        self._write_lock = asyncio.Lock()
+        # Version at load time and per-field last-modified versions (this process only)
+        self._loaded_version = 0
+        self._field_versions = {}
+        if shared is not None:
+            self._sync_shared()
+        else:
+            self.load_state()
 
     def load_state(self):
-        """Load state from JSON file or create default"""
+        """Load the snapshot (or defaults), then replay newer journal records"""
+        data = self.default_values()
+        version = 0
         if self.state_file.exists():
             try:
-                with open(self.state_file, 'r') as f:
-                    data = json.load(f)
-                    self.remaining_games = data.get('remaining_games', 42)
-                    self.first_launch = data.get('first_launch', True)
-                    self.game_timer = data.get('game_timer', 0)
-                    self.coach_active = data.get('coach_active', True)
-                    self.assistant_active = data.get('assistant_active', True)
-                    self.amokk_toggle = data.get('amokk_toggle', True)
-                    self.proactive_coach_active = data.get('proactive_coach_active', False)
-                    self.ptt_key = data.get('ptt_key', 'v')
-                    self.volume = data.get('volume', 80)
-                    self.plan_id = data.get('plan_id', 1)
-                    self.email = data.get('email', '')
-                    logger.info(f"✅ State loaded from {self.state_file}")
+                data, version = STATE_SCHEMA.decode(self.state_file.read_bytes())
+                logger.info(f"✅ State loaded from {self.state_file}")
+            except SchemaError as e:
+                # Keep the newer file aside instead of overwriting it with defaults
+                backup = self.state_file.with_name(self.state_file.name + ".newer")
+                os.replace(self.state_file, backup)
+                logger.warning(f"⚠️  {e}. Kept as {backup.name}, using defaults.")
             except Exception as e:
                 logger.warning(f"⚠️  Error loading state: {e}. Using defaults.")
-                self._set_defaults()
-        else:
-            self._set_defaults()
-
-    def _set_defaults(self):
-        """Set default application state"""
-        self.remaining_games = 42
-        self.first_launch = True
-        self.game_timer = 0
-        self.coach_active = True
-        self.assistant_active = True
-        self.amokk_toggle = True
-        self.proactive_coach_active = False  # Disabled by default
-        self.ptt_key = 'v'
-        self.volume = 80
-        self.plan_id = 1  # Default: Starter plan
-        self.email = ''
+                data = self.default_values()
+                version = 0
 
-    def save_state(self):
-        """Save state to JSON file"""
         try:
-            state_dict = {
-                'remaining_games': self.remaining_games,
-                'first_launch': self.first_launch,
-                'game_timer': self.game_timer,
-                'coach_active': self.coach_active,
-                'assistant_active': self.assistant_active,
-                'amokk_toggle': self.amokk_toggle,
-                'proactive_coach_active': self.proactive_coach_active,
-                'ptt_key': self.ptt_key,
-                'volume': self.volume,
-                'plan_id': self.plan_id,
-                'email': self.email,
-            }
-            with open(self.state_file, 'w') as f:
-                json.dump(state_dict, f, indent=2)
-            logger.info(f"💾 State saved")
+            records = self.journal.replay(after_version=version)
         except Exception as e:
-            logger.error(f"❌ Error saving state: {e}")
+            logger.warning(f"⚠️  Error reading journal: {e}. Ignoring it.")
+            records = []
+        for record_version, changes in records:
+            data.update({field: value for field, value in changes.items() if field in data})
+            version = record_version
+        if records:
+            logger.info(f"✅ Replayed {len(records)} journal records (version {version})")
+
+        self._current = StateSnapshot(MappingProxyType(data), version)
+        # Per-field history only covers this process; older "since" versions get a full payload
+        self._loaded_version = version
+        self._field_versions = {}
+
+    def default_values(self) -> dict:
+        """Default application state (see schema.STATE_SCHEMA)"""
+        return STATE_SCHEMA.defaults()
+
+    # ------------------------------------------------------------------
+    # Lock-free reads
+    # ------------------------------------------------------------------
+
+    def snapshot(self) -> StateSnapshot:
+        """Current state and its version, consistent with each other"""
+        if self.shared is not None:
+            self._sync_shared()
+        return self._current
+
+    @property
+    def version(self) -> int:
+        """Monotonic state version, bumped on every effective mutation"""
+        return self.snapshot().version
+
+    def __getattr__(self, name):
+        # Field reads (app_state.volume, ...) come from the current snapshot
+        if name.startswith('_'):
+            raise AttributeError(name)
+        try:
+            return self.snapshot().data[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def _sync_shared(self):
+        """Adopt the segment's state if another process changed it (one 8-byte load otherwise)"""
+        data, version, seq = self.shared.snapshot()
+        if seq == self._shared_seq:
+            return
+        self._shared_seq = seq
+        previous = self.__dict__.get('_current')
+        self._current = StateSnapshot(MappingProxyType(data), version)
+        if previous is None:
+            self._loaded_version = version
+            return
+        if version != previous.version:
+            changed = {field: value for field, value in data.items() if previous.data[field] != value}
+            for field in changed:
+                self._field_versions[field] = version
+            self._notify(changed, version)
+
+    def as_dict(self) -> dict:
+        """Persisted fields as a plain dict"""
+        return dict(self._current.data)
+
+    def changed_since(self, since: int) -> Optional[list]:
+        """
+        Fields modified after version `since`
+
+        Returns None when the answer isn't known (version predates this
+        process, or is from the future); callers should send everything.
+        """
+        if since < self._loaded_version or since > self.version:
+            return None
+        return [field for field, version in self._field_versions.items() if version > since]
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def save_state(self):
+        """Write a full snapshot to the JSON file (atomic)"""
+        current = self._current
+        atomic_write_bytes(self.state_file, STATE_SCHEMA.encode(current.data, current.version))
+        logger.info(f"💾 State saved")
+
+    def compact(self):
+        """Fold the journal into a fresh snapshot and empty it"""
+        started = time.perf_counter()
+        self.save_state()
+        self.journal.truncate()
+        self.compactions += 1
+        self.last_compaction_ms = (time.perf_counter() - started) * 1000
+
+    def _persist(self, records: list):
+        """Write-behind flush: append the batch to the journal, compact when it grows too long"""
+        self.journal.append(records)
+        if self.journal.records >= self.compact_every:
+            self.compact()
+
+    def close(self):
+        """Flush pending mutations and leave a compacted snapshot on disk"""
+        self.writer.stop()
+        if self.shared is not None:
+            return  # The parent process saves the segment
+        if self.journal.records:
+            self.compact()
+        self.journal.close()
+
+    def persistence_stats(self) -> dict:
+        """Write-behind and journal counters"""
+        return {
+            **self.writer.stats(),
+            "journal_records": self.journal.records,
+            "journal_bytes": self.journal.bytes,
+            "journal_fsyncs": self.journal.fsyncs,
+            "compactions": self.compactions,
+            "last_compaction_ms": round(self.last_compaction_ms, 3),
+        }
+
+    # ------------------------------------------------------------------
+    # Serialized writes
+    # ------------------------------------------------------------------
+
+    def add_listener(self, listener):
+        """Register a callback invoked with ({field: new_value}, version) after each change"""
+        self._listeners.append(listener)
+
+    async def update(self, **changes) -> dict:
+        """Apply field changes; returns the fields that actually changed"""
+        return (await self.apply(changes))[0]
+
+    async def apply(self, changes: dict, expected_version: Optional[int] = None) -> Tuple[dict, int]:
+        """
+        Apply field changes atomically, schedule a save and notify listeners
+
+        Returns (fields that actually changed, resulting version); a no-op
+        update neither dirties the state nor emits an event. With
+        expected_version, raises VersionConflict (and changes nothing) unless
+        the state is still at that version.
+        """
+        return await self.mutate(lambda data: changes, expected_version)
+
+    async def mutate(self, compute, expected_version: Optional[int] = None) -> Tuple[dict, int]:
+        """
+        Read-modify-write: compute(current data) returns the changes to apply
+
+        compute runs under the write lock against the latest snapshot, so
+        updates derived from the current value (toggles, counters) can't be lost.
+        """
+        async with self._write_lock:
+            if self.shared is None:
+                return self._commit(compute, expected_version)
+            # Held for the read-modify-write only (microseconds): other workers wait on it
+            with self.shared.lock:
+                self._sync_shared()
+                return self._commit(compute, expected_version)
+
+    def _commit(self, compute, expected_version: Optional[int]) -> Tuple[dict, int]:
+        current = self._current
+        if expected_version is not None and expected_version != current.version:
+            raise VersionConflict(current.version)
+
+        changes = compute(current.data)
+        unknown = set(changes) - set(current.data)
+        if unknown:
+            raise AttributeError(f"Unknown state fields: {sorted(unknown)}")
+        changed = {field: value for field, value in changes.items() if current.data[field] != value}
+        if not changed:
+            return changed, current.version
+
+        version = current.version + 1
+        data = {**current.data, **changed}
+        if self.shared is not None:
+            self._shared_seq = self.shared.write(data, version)
+        else:
+            self.writer.mark_dirty((version, changed))
+        self._current = StateSnapshot(MappingProxyType(data), version)
+        for field in changed:
+            self._field_versions[field] = version
+        self._notify(changed, version)
+        return changed, version
+
+    async def reset(self, keep: Tuple[str, ...] = ()) -> dict:
+        """Restore defaults (except the `keep` fields) through the regular update path"""
+        defaults = self.default_values()
+        for name in keep:
+            defaults.pop(name)
+        return await self.update(**defaults)
+
+    def _notify(self, changed: dict, version: int):
+        for listener in self._listeners:
+            try:
+                listener(changed, version)
+            except Exception as e:
+                logger.error(f"❌ State listener error: {e}")
 
 
 # ============================================================================
 # FastAPI Application
 # ============================================================================
 
+# Multi-worker mode: path of the shared state segment, set by the parent
+# process for its workers (see serve_workers)
+SHARED_STATE_ENV = "AMOKK_SHARED_STATE"
+
+
+def attach_shared_state() -> Optional[SharedStateSegment]:
+    path = os.environ.get(SHARED_STATE_ENV)
+    if not path:
+        return None
+    segment = SharedStateSegment(Path(path), STATE_SCHEMA)
+    segment.attach()
+    return segment
+
+
+# Initialize app state
+app_state = AppState(shared=attach_shared_state())
+
+# Rotating log file next to state.json (LOG_FILE= empty to disable); workers
+# of the multi-worker mode don't share it (rotation isn't multi-process safe)
+log_file = os.environ.get(
+    "LOG_FILE", "" if app_state.shared is not None else str(app_state.state_file.with_name("backend.log")))
+if log_file:
+    log_pipeline.add_file(
+        Path(log_file),
+        max_bytes=int(os.environ.get("LOG_FILE_MAX_KB", 1024)) * 1024,
+        backups=int(os.environ.get("LOG_FILE_BACKUPS", 3)),
+    )
+startup_profile.mark("state_load")
+
+# Interactive API docs are a development aid: the packaged (PyInstaller)
+# backend serves no /docs, /redoc or /openapi.json
+API_DOCS = not getattr(sys, "frozen", False)
+
 app = FastAPI(
     title="AMOKK Mock Backend",
     description="Local coaching API for AMOKK React frontend",
-    version="1.0.0"
+    version="1.0.0",
+    docs_url="/docs" if API_DOCS else None,
+    redoc_url="/redoc" if API_DOCS else None,
+    openapi_url="/openapi.json" if API_DOCS else None,
 )
 
-# Initialize app state
-app_state = AppState()
+# Encoded bodies of hot read endpoints, rebuilt when the state changes
+response_cache = ResponseCache(enabled=os.environ.get("RESPONSE_CACHE", "1") != "0")
+app_state.add_listener(response_cache.invalidate)
+
+# ============================================================================
+# Profiles - per-account settings
+# ============================================================================
+
+profile_store = ProfileStore(
+    Path(os.environ.get("PROFILES_DB", app_state.state_file.with_name("profiles.db"))),
+    # Other workers write the same database: no per-process cache in multi-worker mode
+    cache_size=int(os.environ.get("PROFILE_CACHE_SIZE", 0 if app_state.shared is not None else 8)),
+)
+
+
+def profile_of(data) -> dict:
+    """Per-account fields (schema profile=True); first_launch stays per-machine and email is the key"""
+    return STATE_SCHEMA.profile_of(data)
+
+
+async def switch_profile(email: str) -> dict:
+    """
+    Make email the active profile
+
+    Parks the current account's settings in the profile store and loads
+    (or creates) the settings of email, as a single state mutation. The
+    active profile then lives in app_state, so endpoints never query the
+    store per request.
+    """
+    def compute(data):
+        current_email = data['email']
+        if current_email == email:
+            return {}
+        if current_email:
+            profile_store.put(current_email, profile_of(data))
+
+        profile = profile_store.get(email)
+        if profile is not None:
+            # Profiles stored before a field existed get its default
+            profile = {**profile_of(app_state.default_values()), **profile}
+        else:
+            # New account: keep the settings of an anonymous session, defaults otherwise
+            profile = profile_of(app_state.default_values() if current_email else data)
+            profile_store.put(email, profile)
+            logger.info(f"👤 Profile created: {email}")
+        return {**profile, 'email': email}
+
+    changed, _ = await app_state.mutate(compute)
+    return changed
+
+
+# ============================================================================
+# History - finished games and toggles, rolled up per day/week for /progress
+# ============================================================================
+
+history_store = HistoryStore(
+    Path(os.environ.get("HISTORY_DB", app_state.state_file.with_name("history.db"))),
+    retention_days=int(os.environ.get("HISTORY_RETENTION_DAYS", 400)),
+)
+
+# Config fields recorded as toggles (the on/off switches)
+TOGGLE_NAMES = frozenset(api for api, field in STATE_SCHEMA.config_fields.items() if field.type is bool)
+
+
+def record_toggles(changed: Mapping):
+    """History events for the switches among changed config fields (by API name)"""
+    email = app_state.email
+    for name, value in changed.items():
+        if name in TOGGLE_NAMES:
+            history_store.record_toggle(email, name, value)
+
+
+# ============================================================================
+# Sessions - bearer tokens issued by /login
+# ============================================================================
+
+# AUTH=0 leaves every endpoint open (benchmarks, manual testing)
+AUTH_ENABLED = os.environ.get("AUTH", "1") != "0"
+
+sessions_file = Path(os.environ.get("SESSIONS_FILE", app_state.state_file.with_name("sessions.json")))
+token_store = TokenStore(
+    sessions_file,
+    ttl=float(os.environ.get("SESSION_TTL_HOURS", 24 * 30)) * 3600,
+    lock=FileLock(sessions_file.with_name(sessions_file.name + ".lock")) if app_state.shared is not None else None,
+)
+token_store.load()
+
+
+def request_token(request: Request) -> Optional[str]:
+    """
+    Token sent with a request: "Authorization: Bearer <token>", or
+    ?access_token= for clients that can't set headers (EventSource, sendBeacon)
+    """
+    return bearer_token(request.headers.get("authorization")) or request.query_params.get("access_token")
+
+
+async def require_session(request: Request) -> Optional[TokenEntry]:
+    """
+    Dependency of every endpoint that reads or changes account data
+
+    Memory only: one digest and one dict lookup per request. Raises 401
+    when the token is missing, unknown, revoked or expired, or belongs to
+    another account than the active profile (the state is that account's).
+    """
+    if not AUTH_ENABLED:
+        return None
+    token = request_token(request)
+    entry = token_store.validate(token) if token else None
+    if entry is None or entry.email != app_state.email:
+        raise HTTPException(status_code=401, detail="Not authenticated", headers={"WWW-Authenticate": "Bearer"})
+    return entry
+
+
+# dependencies= of the protected routes
+authenticated = [Depends(require_session)]
+
+# Password hashes (scrypt), checked on a small thread pool by /login
+credential_store = CredentialStore(
+    Path(os.environ.get("CREDENTIALS_FILE", app_state.state_file.with_name("credentials.json"))),
+    defaults=VALID_USERS,
+    params=ScryptParams(n=int(os.environ.get("CREDENTIAL_SCRYPT_N", 2 ** 14))),
+    workers=int(os.environ.get("CREDENTIAL_WORKERS", 2)),
+    max_pending=int(os.environ.get("CREDENTIAL_MAX_PENDING", 16)),
+)
+
+login_backoff = LoginBackoff(
+    free_attempts=int(os.environ.get("LOGIN_BACKOFF_FREE_ATTEMPTS", 3)),
+    base=float(os.environ.get("LOGIN_BACKOFF_BASE_SECONDS", 1)),
+    max_delay=float(os.environ.get("LOGIN_BACKOFF_MAX_SECONDS", 300)),
+)
+
+
+# ============================================================================
+# Support outbox - tickets delivered in the background to SUPPORT_SINK
+# ============================================================================
+
+support_outbox = SupportOutbox(
+    Path(os.environ.get("SUPPORT_OUTBOX_DB", app_state.state_file.with_name("outbox.db"))),
+    sink_from_url(os.environ.get("SUPPORT_SINK", ""), timeout=float(os.environ.get("SUPPORT_SINK_TIMEOUT", 10))),
+    batch_size=int(os.environ.get("SUPPORT_BATCH_SIZE", 20)),
+    retry_base=float(os.environ.get("SUPPORT_RETRY_BASE_SECONDS", 2)),
+    retry_max=float(os.environ.get("SUPPORT_RETRY_MAX_SECONDS", 600)),
+    dedupe_window=float(os.environ.get("SUPPORT_DEDUPE_HOURS", 24)) * 3600,
+    poll_interval=int(os.environ.get("SUPPORT_POLL_MS", 1000)) / 1000 if app_state.shared is not None else None,
+)
+
+# Multi-worker mode: every worker queues tickets, the one holding this lock delivers them
+support_delivery_lock = FileLock(support_outbox.path.with_name(support_outbox.path.name + ".lock"))
+
+
+# ============================================================================
+# Rate limiting - per-client token buckets, load shedding
+# ============================================================================
+
+# Never limited nor shed: probes must answer while a client floods the backend
+PRIORITY_ROUTES = ("/healthz", "/readyz", "/startup", "/metrics", "/ratelimit")
+
+rate_limiter = RateLimiter(
+    read=parse_limit(os.environ.get("RATE_LIMIT_READ", ""), Limit(20, 40)),
+    write=parse_limit(os.environ.get("RATE_LIMIT_WRITE", ""), Limit(10, 20)),
+    limits={
+        # Password guessing
+        "/login": parse_limit(os.environ.get("RATE_LIMIT_LOGIN", ""), Limit(1, 5)),
+        # Game client batches, 10-30 per second
+        "/ingest": parse_limit(os.environ.get("RATE_LIMIT_INGEST", ""), Limit(60, 120)),
+    },
+    priority=PRIORITY_ROUTES,
+    long_lived=("/stream",),
+    max_in_flight=int(os.environ.get("RATE_LIMIT_MAX_IN_FLIGHT", 64)),
+    enabled=os.environ.get("RATE_LIMIT", "1") != "0",
+)
+
+# Added before CORS, so it runs inside it: 429/503 responses still carry
+# the CORS headers and the renderer can read them
+app.add_middleware(RateLimitMiddleware, limiter=rate_limiter)
+
 
 # ============================================================================
 # CORS Configuration - Allow frontend on port 8080 and Electron
@@ -210,32 +679,269 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
+)
+
+# ============================================================================
+# Metrics - Prometheus text format at GET /metrics
+# ============================================================================
+
+metrics_registry = Registry()
+metrics_registry.enabled = os.environ.get("METRICS", "1") != "0"
+
+HTTP_REQUESTS = metrics_registry.register(Counter(
+    "amokk_http_requests_total", "HTTP requests by method, route and status",
+    labels=("method", "route", "status"),
+))
+HTTP_LATENCY = metrics_registry.register(Histogram(
+    "amokk_http_request_duration_seconds", "Time until response headers are sent, by route",
+    labels=("route",),
+))
+STATE_FLUSH_SECONDS = metrics_registry.register(Histogram(
+    "amokk_state_flush_duration_seconds", "Duration of write-behind state flushes (journal append + compaction)",
+))
+STATE_FLUSH_BATCH = metrics_registry.register(Histogram(
+    "amokk_state_flush_batch_size", "Mutations written per state flush",
+    buckets=(1, 2, 5, 10, 25, 50, 100, 250, 1000),
+))
+
+
+RATE_LIMITED = metrics_registry.register(Counter(
+    "amokk_ratelimit_rejected_total", "Requests rejected by the rate limiter (429) or shed (503), by route",
+    labels=("route", "status"),
+))
+_route_paths: Optional[frozenset] = None
+
+
+def count_rate_limited(client: str, path: str, status: int):
+    """
+    rate_limiter.on_reject: no client label (X-Client-Id is a new id per page
+    load, the series would grow for the app's lifetime; GET /ratelimit has
+    the per-client counts), and paths outside the app's routes folded into
+    "unmatched" (the limiter runs before routing)
+    """
+    global _route_paths
+    if _route_paths is None:
+        _route_paths = frozenset(route.path for route in app.routes)
+    RATE_LIMITED.inc(path if path in _route_paths else "unmatched", status)
+
+
+rate_limiter.on_reject = count_rate_limited
+
+
+def observe_flush(seconds: float, batch_size: int):
+    STATE_FLUSH_SECONDS.observe(seconds)
+    STATE_FLUSH_BATCH.observe(batch_size)
+
+
+app_state.writer.on_flush = observe_flush
+
+SUPPORT_DELIVERY_SECONDS = metrics_registry.register(Histogram(
+    "amokk_support_delivery_seconds", "Time from support ticket submission to delivery to the sink",
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300, 900, 3600),
+))
+support_outbox.on_delivered = SUPPORT_DELIVERY_SECONDS.observe
+
+LOGIN_VERIFY_SECONDS = metrics_registry.register(Histogram(
+    "amokk_login_verify_seconds", "Password verification time, queueing on the credential pool included",
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+))
+
+for name, help, fn, kind in (
+    ("amokk_state_version", "Current state version", lambda: app_state.version, "gauge"),
+    ("amokk_state_mutations_total", "State mutations", lambda: app_state.writer.mutations, "counter"),
+    ("amokk_state_flushes_total", "State flushes", lambda: app_state.writer.flushes, "counter"),
+    ("amokk_state_coalesced_total", "Mutations coalesced into another flush", lambda: app_state.writer.coalesced, "counter"),
+    ("amokk_state_flush_errors_total", "Failed state flushes", lambda: app_state.writer.errors, "counter"),
+    ("amokk_state_journal_records", "Records in the state journal", lambda: app_state.journal.records, "gauge"),
+    ("amokk_state_compactions_total", "Journal compactions into state.json", lambda: app_state.compactions, "counter"),
+    ("amokk_stream_subscribers", "Connected /stream subscribers", lambda: event_hub.subscriber_count, "gauge"),
+    ("amokk_response_cache_hits_total", "Response cache hits", lambda: response_cache.hits, "counter"),
+    ("amokk_response_cache_misses_total", "Response cache misses", lambda: response_cache.misses, "counter"),
+    ("amokk_profile_cache_hits_total", "Profile LRU hits", lambda: profile_store.hits, "counter"),
+    ("amokk_profile_cache_misses_total", "Profile LRU misses", lambda: profile_store.misses, "counter"),
+    ("amokk_auth_sessions", "Live session tokens", lambda: len(token_store), "gauge"),
+    ("amokk_auth_rejected_total", "Requests with a missing, unknown or expired token",
+     lambda: token_store.rejected, "counter"),
+    ("amokk_login_pending", "Password verifications queued or running", lambda: credential_store.pending, "gauge"),
+    ("amokk_login_failures_total", "Logins with a wrong email or password", lambda: credential_store.failed, "counter"),
+    ("amokk_login_locked_accounts", "Accounts locked by the login backoff", login_backoff.locked, "gauge"),
+    ("amokk_history_events_total", "History events written (games, toggles)", lambda: history_store.events, "counter"),
+    ("amokk_support_outbox_depth", "Support tickets waiting for delivery", lambda: support_outbox.depth, "gauge"),
+    ("amokk_support_outbox_oldest_seconds", "Age of the oldest undelivered support ticket",
+     support_outbox.oldest_pending_age, "gauge"),
+    ("amokk_support_delivery_failures_total", "Failed support sink deliveries (batches)",
+     lambda: support_outbox.failures, "counter"),
+    ("amokk_ingest_events_total", "Game events accepted by POST /ingest", lambda: event_ring.received, "counter"),
+    ("amokk_ingest_dropped_total", "Unread game events overwritten (drop_oldest)", lambda: event_ring.dropped, "counter"),
+    ("amokk_ingest_rejected_total", "Game events refused with 429 (reject)", lambda: event_ring.rejected, "counter"),
+    ("amokk_ingest_ring_depth", "Game events waiting for the consumer", lambda: event_ring.depth, "gauge"),
+    ("amokk_ingest_rate", "Game events accepted per second (5 s average)",
+     lambda: event_ring.meter.rate(), "gauge"),
+    ("amokk_ratelimit_in_flight", "Requests being handled (long-lived streams excluded)",
+     lambda: rate_limiter.in_flight, "gauge"),
+    ("amokk_process_resident_memory_bytes", "Resident memory of the backend process",
+     lambda: process_rss_bytes() or 0, "gauge"),
+):
+    metrics_registry.register(Observed(name, help, fn, type=kind))
+
+app.add_middleware(
+    MetricsMiddleware,
+    registry=metrics_registry,
+    requests=HTTP_REQUESTS,
+    latency=HTTP_LATENCY,
 )
 
 
+@app.get("/ratelimit", tags=["Health"])
+async def ratelimit():
+    """Rate limiter counters and the clients rejected most (per route)"""
+    return rate_limiter.stats()
+
+
+@app.get("/metrics", tags=["Health"])
+async def metrics():
+    """Prometheus text exposition of request, state, stream and process metrics"""
+    if app_state.shared is not None:
+        # Support outbox gauges: other workers queue tickets too
+        await asyncio.to_thread(support_outbox.refresh)
+    return Response(metrics_registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+# ============================================================================
+# Logs - access log and GET /logs for the DebugPanel
+# ============================================================================
+
+# Routes polled often enough to flood the logs: keep 1 access record in
+# LOG_SAMPLE_EVERY (errors are always kept)
+LOG_SAMPLE_EVERY = int(os.environ.get("LOG_SAMPLE_EVERY", 50))
+access_sampler = SamplingFilter({
+    route: LOG_SAMPLE_EVERY
+    for route in ("/get_local_data", "/session", "/status", "/healthz", "/readyz", "/metrics", "/logs", "/ingest")
+})
+log_pipeline.add_filter(access_sampler)
+
+if os.environ.get("LOG_ACCESS", "1") != "0":
+    app.add_middleware(AccessLogMiddleware, logger=logging.getLogger("amokk.access"))
+
+metrics_registry.register(Observed(
+    "amokk_log_sampled_out_total", "Access log records dropped by sampling",
+    lambda: access_sampler.dropped, type="counter",
+))
+
+
+@app.get("/logs", tags=["Health"], dependencies=authenticated)
+async def logs(since: int = 0, level: str = "INFO", limit: int = 200):
+    """
+    Recent backend log records, oldest first (in-memory ring buffer)
+
+    Poll with ?since=<"last" from the previous response> to only get new
+    records; ?level=WARNING to skip info records.
+
+    Returns:
+        {
+            "records": [
+                {"seq": 41, "ts": 1767225600.123, "level": "INFO", "logger": "amokk",
+                 "msg": "🔊 Volume updated: 65%"},
+                {"seq": 42, "ts": 1767225600.2, "level": "INFO", "logger": "amokk.access",
+                 "msg": "PUT /update_volume 200 0.61 ms", "route": "/update_volume",
+                 "status": 200, "duration_ms": 0.61}
+            ],
+            "last": 42
+        }
+    """
+    levelno = logging.getLevelName(level.upper())
+    if not isinstance(levelno, int):
+        raise HTTPException(status_code=400, detail=f"Unknown log level: {level}")
+    return {
+        "records": log_pipeline.ring.records(since=since, level=levelno, limit=max(1, min(limit, 1000))),
+        "last": log_pipeline.ring.last_seq,
+    }
+
+
+# ============================================================================
+# Liveness / readiness / startup profile
+# ============================================================================
+
+# Set once the startup event ran (state loaded, writer started)
+app_ready = False
+
+HEALTHZ_BODY = b'{"status":"ok"}'
+
+
+@app.get("/healthz", tags=["Health"])
+async def healthz():
+    """Liveness: the process answers HTTP. Constant body, touches no state."""
+    return Response(HEALTHZ_BODY, media_type="application/json")
+
+
+@app.get("/readyz", tags=["Health"])
+async def readyz():
+    """Readiness: 200 once startup completed, 503 before"""
+    if not app_ready:
+        return JSONResponse({"status": "starting"}, status_code=503)
+    return JSONResponse({"status": "ready", "version": app_state.version})
+
+
+@app.get("/startup", tags=["Health"])
+async def startup_profile_endpoint():
+    """
+    Startup phase timings (milliseconds)
+
+    Returns:
+        {
+            "phases_ms": {"import": 412.3, "state_load": 3.1, "app_build": 28.4, "bind": 61.0},
+            "total_ms": 504.8
+        }
+    """
+    return startup_profile.as_dict()
+
+
 # ============================================================================
 # Root Endpoint
 # ============================================================================
 
 @app.get("/", tags=["Health"])
-def root():
+async def root():
     """Health check endpoint"""
+    body = response_cache.get("root", None, root_payload)
+    return Response(body, media_type="application/json")
+
+
+def root_payload() -> dict:
     return {
         "status": "ok",
         "message": "AMOKK Mock Backend is running",
         "version": "1.0.0",
         "endpoints": [
+            "GET  /auth/session",
             "GET  /get_local_data",
+            "GET  /stream",
+            "PATCH /config",
             "PUT  /coach_toggle",
             "PUT  /assistant_toggle",
             "PUT  /amokk_toggle",
             "PUT  /mock_proactive_coach_toggle",
             "PUT  /update_ptt_key",
             "PUT  /update_volume",
+            "GET  /session",
+            "POST /session/start",
+            "POST /session/pause",
+            "POST /session/end",
+            "POST /ingest",
+            "GET  /ingest",
+            "GET  /progress",
             "POST /mock_select_plan",
             "POST /mock_contact_support",
+            "GET  /support/outbox",
             "POST /logout",
             "POST /reset",
+            "GET  /metrics",
+            "GET  /ratelimit",
+            "GET  /logs",
+            "GET  /healthz",
+            "GET  /readyz",
+            "GET  /startup",
         ]
     }
 
@@ -246,7 +952,7 @@ def root():
 # ============================================================================
 
 @app.post("/login", response_model=LoginResponse, tags=["Auth"])
-def login(request: LoginRequest):
+async def login(request: LoginRequest):
     """
     Authenticate user with email and password
 
@@ -262,24 +968,51 @@ def login(request: LoginRequest):
 
     Returns:
         {
-            "token": "mock-jwt-token-...",
+            "token": "Vq3...",   # Bearer token for every other endpoint
             "remaining_games": 42,
             "plan_id": 3,
             "email": "admin@amokk.fr"
         }
+
+    401 for a wrong email or password; after LOGIN_BACKOFF_FREE_ATTEMPTS
+    failures in a row the account is locked for a growing delay (429 with
+    Retry-After); 503 when too many logins are being verified at once;
+    400 for an email longer than the state can hold.
     """
     try:
-        # Check if user exists and password is correct
-        if request.email not in VALID_USERS or VALID_USERS[request.email] != request.password:
-            logger.warning(f"❌ Login failed for {request.email}")
+        errors = STATE_SCHEMA.validate({"email": request.email})
+        if errors:
+            raise HTTPException(status_code=400, detail=errors[0])
+
+        wait = login_backoff.retry_after(request.email)
+        if wait:
+            raise HTTPException(status_code=429, detail="Too many failed attempts",
+                                headers={"Retry-After": str(math.ceil(wait))})
+
+        # Check if user exists and password is correct (hashed on the credential pool)
+        started = time.perf_counter()
+        try:
+            valid = await credential_store.verify(request.email, request.password)
+        except CredentialsBusy:
+            raise HTTPException(status_code=503, detail="Server busy", headers={"Retry-After": "1"})
+        LOGIN_VERIFY_SECONDS.observe(time.perf_counter() - started)
+        if not valid:
+            delay = login_backoff.failure(request.email)
+            logger.warning(f"❌ Login failed for {request.email}" + (f", locked for {delay:g} s" if delay else ""))
             raise HTTPException(status_code=401, detail="Invalid email or password")
+        login_backoff.success(request.email)
 
-        # Generate token
-        token = generate_mock_token(request.email)
+        # Issue a session token (Authorization: Bearer <token>)
+        token = token_store.issue(request.email)
 
-        # Store email in app state
-        app_state.email = request.email
-        app_state.save_state()
+        # Load (or create) this account's profile and make it active; the
+        # previous account's tokens would now reach this one's state
+        previous_email = app_state.email
+        await switch_profile(request.email)
+        if previous_email and previous_email != request.email:
+            revoked = token_store.revoke_all(previous_email)
+            if revoked:
+                logger.info(f"🔒 {revoked} session(s) of {previous_email} revoked")
 
         logger.info(f"✅ Login successful: {request.email}")
 
@@ -296,13 +1029,41 @@ def login(request: LoginRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# ============================================================================
+# GET /auth/session
+# Whether the caller's token is still valid (no token required)
+# ============================================================================
+
+@app.get("/auth/session", tags=["Auth"])
+async def auth_session(request: Request):
+    """
+    Check the caller's token, so a restarted app can skip the login page
+
+    Returns:
+        {
+            "authenticated": true,
+            "email": "admin@amokk.fr",
+            "expires_at": 1767225600.0
+        }
+
+    Without a valid token (or with one of another account than the active
+    one), "authenticated" is false, "expires_at" null and "email" the last
+    account used on this machine (to prefill the login form).
+    """
+    token = request_token(request)
+    entry = token_store.validate(token) if token else None
+    if entry is None or entry.email != app_state.email:
+        return {"authenticated": False, "email": app_state.email, "expires_at": None}
+    return {"authenticated": True, "email": entry.email, "expires_at": entry.expires_at}
+
+
 # ============================================================================
 # GET /get_local_data
 # Retrieve current state for dashboard refresh (called every 5 seconds)
 # ============================================================================
 
-@app.get("/get_local_data", response_model=LocalDataResponse, tags=["Data"])
-def get_local_data():
+@app.get("/get_local_data", response_model=LocalDataResponse, tags=["Data"], dependencies=authenticated)
+async def get_local_data(request: Request, since: Optional[int] = None):
     """
     Retrieve all local data for dashboard refresh
 
@@ -325,28 +1086,269 @@ def get_local_data():
             "coach_toggle": true,
             "assistant_toggle": true,
             "ptt_key": "v",
-            "tts_volume": 80
+            "tts_volume": 80,
+            "session_state": "idle",
+            "version": 7
         }
+
+    Conditional requests:
+    - Every response carries ETag: "<version>" ("<version>.<game_timer>"
+      while a game is running). Sending it back in If-None-Match returns
+      304 with no body while nothing changed.
+    - ?since=<version> returns only the fields changed after that version,
+      plus "version" (full payload if the version is unknown):
+        {"tts_volume": 65, "version": 9}
+      game_timer is always included while a game is running.
     """
-    response = LocalDataResponse(
-        remaining_games=app_state.remaining_games,
-        first_launch=app_state.first_launch,
-        game_timer=app_state.game_timer,
-        email=app_state.email,
-        coach_toggle=app_state.coach_active,
-        assistant_toggle=app_state.assistant_active,
-        amokk_toggle=app_state.amokk_toggle,
-        ptt_key=app_state.ptt_key,
-        tts_volume=app_state.volume,
-    )
+    current = app_state.snapshot()
+    timer = live_game_timer(current.data)
+    etag = read_etag(current, timer)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    fields = app_state.changed_since(since) if since is not None else None
+    delivers_first_launch = current.data['first_launch'] and (fields is None or 'first_launch' in fields)
+    if delivers_first_launch:
+        # Sent once, so the dialog doesn't reopen: cleared before answering,
+        # and the version and ETag sent are the ones after that change
+        # (replaying them gets a 304, not a stale ETag)
+        await consume_first_launch()
+        current = app_state.snapshot()
+        timer = live_game_timer(current.data)
+        etag = read_etag(current, timer)
+        if fields is not None:
+            fields = app_state.changed_since(since)
+
+    if fields is not None:
+        payload = local_data_delta(current.data, fields)
+        if current.data['session_state'] == session.RUNNING:
+            payload["game_timer"] = timer
+        if delivers_first_launch:
+            payload["first_launch"] = True
+        payload["version"] = current.version
+        return JSONResponse(payload, headers={"ETag": etag})
+
+    if delivers_first_launch:
+        # One-off body, kept out of the response cache
+        payload = local_data_payload(current, timer)
+        payload["first_launch"] = True
+        return JSONResponse(payload, headers={"ETag": etag})
+
+    # Served from pre-encoded bytes; rebuilt only when the version (or the
+    # running game's timer second) moved
+    body = response_cache.get(
+        "get_local_data", (current.version, timer), lambda: local_data_payload(current, timer))
+    return Response(body, media_type="application/json", headers={"ETag": etag})
+
+
+def state_etag(version: int) -> str:
+    return f'"{version}"'
+
+
+def read_etag(current: StateSnapshot, timer: int) -> str:
+    """ETag of a state read: the version, plus the timer second while a game is running"""
+    if current.data['session_state'] == session.RUNNING:
+        return f'"{current.version}.{timer}"'
+    return state_etag(current.version)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Evaluate an If-None-Match header against the current ETag"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag or candidate == "*":
+            return True
+    return False
+
+
+def local_data_payload(current: StateSnapshot, timer: Optional[int] = None) -> dict:
+    """
+    Dashboard payload (LocalDataResponse fields) from a state snapshot
 
-    # Disable first_launch for subsequent calls to prevent dialog from reopening
-    if app_state.first_launch:
+    Shaped by the schema in one dict comprehension; values in the state
+    are already validated, so no model is built per read.
+    """
+    payload = STATE_SCHEMA.api_view(current.data)
+    payload['game_timer'] = live_game_timer(current.data) if timer is None else timer
+    payload['version'] = current.version
+    return payload
+
+
+def local_data_delta(values: Mapping, fields) -> dict:
+    """LocalDataResponse fields for the given AppState fields, read from values"""
+    payload = STATE_SCHEMA.api_view(values, fields)
+    if 'game_timer' in payload:
+        payload['game_timer'] = int(payload['game_timer'])
+    return payload
+
+
+async def consume_first_launch():
+    """Clear first_launch once it has been delivered to a client"""
+    if app_state.first_launch and await app_state.update(first_launch=False):
         logger.info("ℹ️  First launch flag sent, disabling for future requests")
-        app_state.first_launch = False
-        app_state.save_state()
 
-    return response
+
+# ============================================================================
+# GET /stream
+# Server-Sent Events: snapshot on connect, then field-level changes
+# ============================================================================
+
+STREAM_HEARTBEAT_SECONDS = float(os.environ.get("STREAM_HEARTBEAT_SECONDS", 15))
+
+event_hub = StateEventHub()
+
+
+def publish_state_change(changed: dict, version: int):
+    """AppState listener: encode the change once and fan it out to all subscribers"""
+    payload = local_data_delta(changed, changed)
+    if payload:
+        payload["version"] = version
+        event_hub.publish(format_sse("change", payload, event_id=version))
+
+
+app_state.add_listener(publish_state_change)
+
+
+@app.get("/stream", tags=["Data"], dependencies=authenticated)
+async def stream(request: Request):
+    """
+    Push dashboard data as Server-Sent Events
+
+    Events:
+        snapshot   full LocalDataResponse, sent once on connect
+        change     only the LocalDataResponse fields that changed, plus the
+                   new state version, e.g. {"tts_volume": 65, "version": 9}
+        heartbeat  empty payload every STREAM_HEARTBEAT_SECONDS for liveness
+
+    Replaces polling GET /get_local_data: clients keep one connection open
+    and only wake up when something actually changed.
+    """
+    subscriber = event_hub.subscribe()
+    data = local_data_payload(app_state.snapshot())
+    snapshot = format_sse("snapshot", data, event_id=data['version'])
+    await consume_first_launch()
+
+    async def event_source():
+        try:
+            yield snapshot
+            while not subscriber.overflowed:
+                try:
+                    frame = await asyncio.wait_for(subscriber.queue.get(), STREAM_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    frame = HEARTBEAT_FRAME
+                yield frame
+        finally:
+            event_hub.unsubscribe(subscriber)
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# ============================================================================
+# PATCH /config
+# Apply any subset of the configuration fields in one atomic update
+# ============================================================================
+
+# PATCH /config field -> AppState attribute (schema fields with config=True)
+CONFIG_FIELDS = {api: field.name for api, field in STATE_SCHEMA.config_fields.items()}
+# AppState attribute -> PATCH /config field
+CONFIG_NAMES = {attribute: api for api, attribute in CONFIG_FIELDS.items()}
+
+
+def parse_if_match(if_match: Optional[str]) -> Optional[int]:
+    """Extract the expected state version from an If-Match header ("<version>")"""
+    if not if_match or if_match.strip() == "*":
+        return None
+    value = if_match.strip()
+    if value.startswith("W/"):
+        value = value[2:]
+    try:
+        # Read ETags of a running game carry a ".<game_timer>" suffix
+        return int(value.strip('"').split(".")[0])
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid If-Match header")
+
+
+async def apply_config(fields: dict, if_match: Optional[str] = None) -> Tuple[dict, int]:
+    """
+    Validate and apply configuration fields as one atomic state update
+
+    Shared by PATCH /config and the single-field endpoints: one validation
+    pass, one version bump, one persistence flush. Raises 400 on invalid
+    values and 412 when If-Match names an outdated version.
+
+    Returns (changed fields by API name, resulting version).
+    """
+    changes = {CONFIG_FIELDS[field]: value for field, value in fields.items()}
+    errors = STATE_SCHEMA.validate(changes)
+    if errors:
+        raise HTTPException(status_code=400, detail=errors[0] if len(errors) == 1 else errors)
+
+    try:
+        changed, version = await app_state.apply(changes, expected_version=parse_if_match(if_match))
+    except VersionConflict as e:
+        raise HTTPException(
+            status_code=412,
+            detail=f"State changed (now at version {e.current_version}), reload and retry",
+            headers={"ETag": state_etag(e.current_version)},
+        )
+
+    changed_names = {CONFIG_NAMES[attribute]: value for attribute, value in changed.items()}
+    record_toggles(changed_names)
+    return changed_names, version
+
+
+@app.patch("/config", tags=["Config"], dependencies=authenticated)
+async def patch_config(
+    request: ConfigPatchRequest,
+    response: Response,
+    if_match: Optional[str] = Header(None),
+):
+    """
+    Update several configuration fields at once
+
+    Only the fields present in the body are applied; they are validated
+    together and committed atomically (all or nothing). Send the ETag from
+    GET /get_local_data as If-Match to reject the update with 412 if
+    another client changed the state in the meantime.
+
+    Request:
+        {
+            "assistant_toggle": false,
+            "ptt_key": "B",
+            "tts_volume": 65
+        }
+
+    Returns:
+        {
+            "success": true,
+            "changed": {"assistant_toggle": false, "tts_volume": 65},
+            "version": 12
+        }
+    """
+    try:
+        fields = request.model_dump(exclude_none=True)
+        if not fields:
+            raise HTTPException(status_code=400, detail="No configuration field provided")
+
+        changed, version = await apply_config(fields, if_match)
+        response.headers["ETag"] = state_etag(version)
+        logger.info(f"⚙️  Config updated: {changed if changed else 'no change'}")
+        return {"success": True, "changed": changed, "version": version}
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"❌ Config update error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
 
 
 # ============================================================================
@@ -354,8 +1356,8 @@ def get_local_data():
 # Toggle the main coach on/off (or proactive coach)
 # ============================================================================
 
-@app.put("/coach_toggle", tags=["Config"])
-def coach_toggle(request: CoachToggleRequest):
+@app.put("/coach_toggle", tags=["Config"], dependencies=authenticated)
+async def coach_toggle(request: CoachToggleRequest, if_match: Optional[str] = Header(None)):
     """
     Toggle the main coach status on/off
     Also used for "Coach Proactif" toggle (same endpoint per GUIDE.md)
@@ -369,10 +1371,11 @@ def coach_toggle(request: CoachToggleRequest):
         "Updated coach toggle to true successfully"
     """
     try:
-        app_state.coach_active = request.active
-        app_state.save_state()
+        await apply_config({"coach_toggle": request.active}, if_match)
         logger.info(f"🎤 Coach toggled: {request.active}")
         return {"success": True, "active": request.active}
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"❌ Coach toggle error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -383,8 +1386,8 @@ def coach_toggle(request: CoachToggleRequest):
 # Toggle the assistant on/off
 # ============================================================================
 
-@app.put("/assistant_toggle", tags=["Config"])
-def assistant_toggle(request: AssistantToggleRequest):
+@app.put("/assistant_toggle", tags=["Config"], dependencies=authenticated)
+async def assistant_toggle(request: AssistantToggleRequest, if_match: Optional[str] = Header(None)):
     """
     Toggle the assistant status on/off
 
@@ -397,10 +1400,11 @@ def assistant_toggle(request: AssistantToggleRequest):
         "Updated assistant toggle to false successfully"
     """
     try:
-        app_state.assistant_active = request.active
-        app_state.save_state()
+        await apply_config({"assistant_toggle": request.active}, if_match)
         logger.info(f"🤖 Assistant toggled: {request.active}")
         return {"success": True, "active": request.active}
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"❌ Assistant toggle error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -411,8 +1415,8 @@ def assistant_toggle(request: AssistantToggleRequest):
 # Toggle the AMOKK assistant coach on/off
 # ============================================================================
 
-@app.put("/amokk_toggle", tags=["Config"])
-def amokk_toggle(request: AmokkToggleRequest):
+@app.put("/amokk_toggle", tags=["Config"], dependencies=authenticated)
+async def amokk_toggle(request: AmokkToggleRequest, if_match: Optional[str] = Header(None)):
     """
     Toggle the AMOKK assistant coach status on/off
 
@@ -428,10 +1432,11 @@ def amokk_toggle(request: AmokkToggleRequest):
         }
     """
     try:
-        app_state.amokk_toggle = request.active
-        app_state.save_state()
+        await apply_config({"amokk_toggle": request.active}, if_match)
         logger.info(f"🤖 AMOKK toggle: {request.active}")
         return {"success": True, "active": request.active}
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"❌ AMOKK toggle error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -442,8 +1447,8 @@ def amokk_toggle(request: AmokkToggleRequest):
 # Toggle the proactive coach mode
 # ============================================================================
 
-@app.put("/mock_proactive_coach_toggle", tags=["Config"])
-def mock_proactive_coach_toggle(request: CoachToggleRequest):
+@app.put("/mock_proactive_coach_toggle", tags=["Config"], dependencies=authenticated)
+async def mock_proactive_coach_toggle(request: CoachToggleRequest):
     """
     Toggle the proactive coach mode on/off
 
@@ -459,11 +1464,14 @@ def mock_proactive_coach_toggle(request: CoachToggleRequest):
         }
     """
     try:
-        # Actually toggle the state instead of just setting it
-        app_state.proactive_coach_active = not app_state.proactive_coach_active
-        app_state.save_state()
-        logger.info(f"🎯 Proactive coach toggled to: {app_state.proactive_coach_active}")
-        return {"success": True, "active": app_state.proactive_coach_active}
+        # Actually toggle the state instead of just setting it (atomic read-modify-write)
+        changed, _ = await app_state.mutate(
+            lambda data: {'proactive_coach_active': not data['proactive_coach_active']}
+        )
+        active = changed['proactive_coach_active']
+        record_toggles({'proactive_coach_toggle': active})
+        logger.info(f"🎯 Proactive coach toggled to: {active}")
+        return {"success": True, "active": active}
     except Exception as e:
         logger.error(f"❌ Proactive coach toggle error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -474,8 +1482,8 @@ def mock_proactive_coach_toggle(request: CoachToggleRequest):
 # Update Push-to-Talk key binding
 # ============================================================================
 
-@app.put("/update_ptt_key", tags=["Config"])
-def update_ptt_key(request: PTTKeyRequest):
+@app.put("/update_ptt_key", tags=["Config"], dependencies=authenticated)
+async def update_ptt_key(request: PTTKeyRequest, if_match: Optional[str] = Header(None)):
     """
     Update the Push-to-Talk key binding
 
@@ -488,11 +1496,7 @@ def update_ptt_key(request: PTTKeyRequest):
         "Updated push-to-talk key (v) successfully"
     """
     try:
-        if not request.ptt_key or len(request.ptt_key) == 0:
-            raise HTTPException(status_code=400, detail="PTT key cannot be empty")
-
-        app_state.ptt_key = request.ptt_key
-        app_state.save_state()
+        await apply_config({"ptt_key": request.ptt_key}, if_match)
         logger.info(f"🎙️  PTT key updated: {request.ptt_key}")
         return {"success": True, "ptt_key": request.ptt_key}
     except HTTPException:
@@ -507,8 +1511,8 @@ def update_ptt_key(request: PTTKeyRequest):
 # Update volume level
 # ============================================================================
 
-@app.put("/update_volume", tags=["Config"])
-def update_volume(request: VolumeRequest):
+@app.put("/update_volume", tags=["Config"], dependencies=authenticated)
+async def update_volume(request: VolumeRequest, if_match: Optional[str] = Header(None)):
     """
     Update the volume level
 
@@ -521,14 +1525,7 @@ def update_volume(request: VolumeRequest):
         "Updated volume level to 100 successfully"
     """
     try:
-        if not (0 <= request.volume <= 100):
-            raise HTTPException(
-                status_code=400,
-                detail="Volume must be between 0 and 100"
-            )
-
-        app_state.volume = request.volume
-        app_state.save_state()
+        await apply_config({"tts_volume": request.volume}, if_match)
         logger.info(f"🔊 Volume updated: {request.volume}%")
         return {"success": True, "volume": request.volume}
     except HTTPException:
@@ -538,13 +1535,293 @@ def update_volume(request: VolumeRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# ============================================================================
+# Game session - start / pause / end a coached game
+# ============================================================================
+
+# Plans whose games are never consumed (Rush)
+UNLIMITED_PLANS = {3}
+
+session_clock = session.SessionClock()
+
+
+def live_game_timer(data: Mapping) -> int:
+    """Current game timer in whole seconds, computed from the clock (never ticked)"""
+    return int(session.game_timer(data, session_clock))
+
+
+def session_payload(current: StateSnapshot, timer: int) -> dict:
+    data = current.data
+    return {
+        "session_state": data['session_state'],
+        "game_timer": timer,
+        "remaining_games": data['remaining_games'],
+        "unlimited": data['plan_id'] in UNLIMITED_PLANS,
+        "version": current.version,
+    }
+
+
+async def apply_session(transition) -> dict:
+    """
+    Run a session transition as one state mutation
+
+    transition(data) returns the changes (see session.py); the check and the
+    change happen under the state write lock, so two concurrent "end" calls
+    consume a single game. Raises 409 when the transition isn't allowed in
+    the current session state, 403 when no game is left.
+    """
+    try:
+        await app_state.mutate(transition)
+    except session.NoRemainingGames as e:
+        raise HTTPException(status_code=403, detail=str(e))
+    except session.SessionError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    current = app_state.snapshot()
+    return session_payload(current, live_game_timer(current.data))
+
+
+@app.get("/session", tags=["Session"], dependencies=authenticated)
+async def get_session(request: Request):
+    """
+    Current game session, cheap enough for an overlay to poll
+
+    Returns:
+        {
+            "session_state": "running",    # idle | running | paused
+            "game_timer": 754,             # seconds
+            "remaining_games": 41,
+            "unlimited": false,
+            "version": 12
+        }
+
+    Same conditional requests as /get_local_data: the ETag changes with the
+    state version and, while running, once per timer second.
+    """
+    current = app_state.snapshot()
+    timer = live_game_timer(current.data)
+    etag = read_etag(current, timer)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    body = response_cache.get("session", (current.version, timer), lambda: session_payload(current, timer))
+    return Response(body, media_type="application/json", headers={"ETag": etag})
+
+
+@app.post("/session/start", tags=["Session"], dependencies=authenticated)
+async def start_session():
+    """
+    Start a new game (timer from 0) or resume a paused one
+
+    Errors: 409 if a game is already running, 403 if no game is left.
+    """
+    new_game = app_state.session_state == session.IDLE
+    payload = await apply_session(
+        lambda data: session.start(data, session_clock, data['plan_id'] in UNLIMITED_PLANS))
+    if new_game:
+        live_game.reset()
+    logger.info(f"🎮 Game session running ({payload['game_timer']}s)")
+    return payload
+
+
+@app.post("/session/pause", tags=["Session"], dependencies=authenticated)
+async def pause_session():
+    """
+    Pause the running game; the timer stops until /session/start
+
+    Errors: 409 if no game is running.
+    """
+    payload = await apply_session(lambda data: session.pause(data, session_clock))
+    logger.info(f"⏸️  Game session paused at {payload['game_timer']}s")
+    return payload
+
+
+@app.post("/session/end", tags=["Session"], dependencies=authenticated)
+async def end_session():
+    """
+    End the running or paused game and consume one remaining game
+    (unless the plan is unlimited); game_timer keeps the final duration
+
+    Errors: 409 if no game is in progress.
+    """
+    payload = await apply_session(
+        lambda data: session.end(data, session_clock, data['plan_id'] in UNLIMITED_PLANS))
+    # Coached: the coach was on (and AMOKK enabled) when the game ended
+    data = app_state.snapshot().data
+    history_store.record_game(data['email'], data['game_timer'], data['coach_active'] and data['amokk_toggle'])
+    logger.info(f"🏁 Game session ended after {payload['game_timer']}s "
+                f"({payload['remaining_games']} games remaining)")
+    return payload
+
+
+# ============================================================================
+# POST /ingest
+# Live game events from the local game client, for the coach features
+# ============================================================================
+
+# Bounded ring between the endpoint and the consumer: drop_oldest keeps the
+# freshest data when the consumer lags, reject answers 429 instead
+event_ring = EventRing(
+    capacity=int(os.environ.get("INGEST_RING_SIZE", 8192)),
+    overflow=os.environ.get("INGEST_OVERFLOW", "drop_oldest"),
+)
+live_game = LiveGame()
+ingest_consumer = IngestConsumer(
+    event_ring, live_game,
+    interval=int(os.environ.get("INGEST_CONSUME_MS", 50)) / 1000,
+    batch=int(os.environ.get("INGEST_CONSUME_BATCH", 4096)),
+)
+INGEST_MAX_BATCH = int(os.environ.get("INGEST_MAX_BATCH", 1024))
+
+INGEST_CONTENT_TYPE = "application/octet-stream"
+# Upper bound of one JSON event ([ts, kind, entity, a, b] with full-precision
+# numbers and some whitespace): caps JSON bodies before they are parsed
+INGEST_JSON_EVENT_BYTES = 256
+
+
+async def read_body(request: Request, limit: int, detail: str) -> bytes:
+    """
+    The request body, 413 as soon as it is known to exceed limit bytes:
+    from Content-Length before reading anything, else while streaming it in
+    """
+    try:
+        declared = int(request.headers.get("content-length", 0))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid Content-Length")
+    if declared > limit:
+        raise HTTPException(status_code=413, detail=detail)
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > limit:
+            raise HTTPException(status_code=413, detail=detail)
+    return bytes(body)
+
+
+def ingest_stats() -> dict:
+    return {
+        "rate": event_ring.meter.rate(),
+        "received": event_ring.received,
+        "dropped": event_ring.dropped,
+        "rejected": event_ring.rejected,
+        "batches": event_ring.batches,
+        "depth": event_ring.depth,
+        "capacity": event_ring.capacity,
+        "overflow": event_ring.overflow,
+        "consumed": ingest_consumer.consumed,
+    }
+
+
+@app.post("/ingest", tags=["Data"], dependencies=authenticated)
+async def ingest(request: Request):
+    """
+    A batch of live game events (positions, gold, timers), sent 10-30
+    times a second by the local game client
+
+    Body, either:
+    - application/octet-stream: packed 20-byte records, little-endian
+      (f64 ts, u16 kind, u16 entity, f32 a, f32 b; see ingest.RECORD),
+      copied into the ring without decoding;
+    - application/json: {"events": [[ts, kind, entity, a, b], ...]}.
+
+    Kinds: 1 position (a=x, b=y), 2 gold (a), 3 timer (a=game seconds).
+
+    Returns:
+        {
+            "accepted": 40,
+            "dropped": 0,      # older unread events overwritten to fit this batch
+            "free": 8152       # ring slots left: a client can slow down as it shrinks
+        }
+
+    Errors: 400 for a malformed batch, 413 above INGEST_MAX_BATCH events,
+    429 with Retry-After when the ring is full and INGEST_OVERFLOW=reject.
+    """
+    too_large = f"More than {INGEST_MAX_BATCH} events"
+    binary = request.headers.get("content-type", "").startswith(INGEST_CONTENT_TYPE)
+    if binary:
+        limit = INGEST_MAX_BATCH * RECORD.size
+    else:
+        limit = INGEST_MAX_BATCH * INGEST_JSON_EVENT_BYTES + 64  # + {"events": }
+    body = await read_body(request, limit, too_large)
+    dropped, rejected = event_ring.dropped, event_ring.rejected
+    try:
+        if binary:
+            accepted = event_ring.put(body)
+        else:
+            try:
+                events = json.loads(body)["events"]
+            except (ValueError, KeyError, TypeError):
+                raise HTTPException(status_code=400, detail='Expected {"events": [[ts, kind, entity, a, b], ...]}')
+            if not isinstance(events, list):
+                raise HTTPException(status_code=400, detail='"events" must be a list')
+            if len(events) > INGEST_MAX_BATCH:
+                raise HTTPException(status_code=413, detail=too_large)
+            accepted = event_ring.put_events(events)
+    except IngestError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if event_ring.rejected != rejected:
+        retry_after = str(max(1, math.ceil(ingest_consumer.interval)))
+        raise HTTPException(status_code=429, detail="Event buffer full", headers={"Retry-After": retry_after})
+    return {"accepted": accepted, "dropped": event_ring.dropped - dropped, "free": event_ring.free}
+
+
+@app.get("/ingest", tags=["Data"], dependencies=authenticated)
+async def ingest_status():
+    """
+    Ingestion counters (events/s over the last 5 s, drops, backlog) and the
+    live game summary built from the events
+    """
+    return {**ingest_stats(), "game": live_game.view()}
+
+
+# ============================================================================
+# GET /progress
+# Games, coached time and toggles per day or week, from the history rollups
+# ============================================================================
+
+@app.get("/progress", tags=["Data"], dependencies=authenticated)
+async def progress(period: str = "day", buckets: int = 14):
+    """
+    History of the logged-in account, for the progress view
+
+    ?period=day|week, ?buckets=<number of days/weeks, ending today>
+
+    Returns:
+        {
+            "period": "day",
+            "buckets": [
+                {"start": "2026-10-03", "games": 2, "played_minutes": 61.5,
+                 "coached_minutes": 40.0, "toggles": 3},
+                ...
+            ],
+            "totals": {"games": 120, "played_minutes": ..., "coached_minutes": ..., "toggles": ...}
+        }
+
+    Served from precomputed rollups: the cost depends on the number of
+    buckets asked for, not on the length of the history.
+    """
+    if period not in history.PERIODS:
+        raise HTTPException(status_code=400, detail=f"period must be one of {', '.join(history.PERIODS)}")
+    if not 1 <= buckets <= 366:
+        raise HTTPException(status_code=400, detail="buckets must be between 1 and 366")
+
+    email = app_state.email
+
+    def query():
+        return history_store.rollups(email, period, buckets), history_store.totals(email)
+
+    # Off the event loop: queued events are written first
+    rollups, totals = await asyncio.to_thread(query)
+    return {"period": period, "buckets": rollups, "totals": totals}
+
+
 # ============================================================================
 # POST /mock_select_plan
 # Mock endpoint: Select a pricing plan (Starter, Try-Hard, or Rush)
 # ============================================================================
 
-@app.post("/mock_select_plan", tags=["Config"])
-def mock_select_plan(request: PlanSelectionRequest):
+@app.post("/mock_select_plan", tags=["Config"], dependencies=authenticated)
+async def mock_select_plan(request: PlanSelectionRequest):
     """
     Select a pricing plan for the user
 
@@ -584,9 +1861,7 @@ def mock_select_plan(request: PlanSelectionRequest):
         plan_name = plan_names[request.plan_id]
         games_count = plan_games[request.plan_id]
 
-        app_state.plan_id = request.plan_id
-        app_state.remaining_games = games_count
-        app_state.save_state()
+        await app_state.update(plan_id=request.plan_id, remaining_games=games_count)
 
         logger.info(f"📦 Plan selected: {plan_name} (ID: {request.plan_id})")
         return {
@@ -604,13 +1879,18 @@ def mock_select_plan(request: PlanSelectionRequest):
 
 # ============================================================================
 # POST /mock_contact_support
-# Mock endpoint: Submit a support request
+# Queue a support request in the outbox; delivered in the background
 # ============================================================================
 
-@app.post("/mock_contact_support", tags=["Config"])
-def mock_contact_support(request: ContactSupportRequest):
+@app.post("/mock_contact_support", tags=["Config"], dependencies=authenticated)
+async def mock_contact_support(request: ContactSupportRequest):
     """
-    Submit a support request (mock endpoint)
+    Submit a support request
+
+    The ticket is committed to the local outbox and delivered to the
+    support sink (SUPPORT_SINK) by a background worker, so the response
+    never waits for the sink. Sending the same subject and message again
+    returns the same ticket (duplicate: true).
 
     Request:
         {
@@ -622,17 +1902,23 @@ def mock_contact_support(request: ContactSupportRequest):
         {
             "success": true,
             "ticket_id": "AMOKK-12345",
+            "duplicate": false,
             "message": "Your support request has been received"
         }
     """
     try:
-        import secrets
-        ticket_id = f"AMOKK-{secrets.token_hex(3).upper()}"
+        # Off the event loop: the commit waits for the disk
+        ticket_id, duplicate = await asyncio.to_thread(
+            support_outbox.submit, app_state.email, request.subject, request.message)
 
-        logger.info(f"📧 Support request submitted - Ticket: {ticket_id}")
+        if duplicate:
+            logger.info(f"📧 Support request resubmitted - Ticket: {ticket_id}")
+        else:
+            logger.info(f"📧 Support request queued - Ticket: {ticket_id}")
         return {
             "success": True,
             "ticket_id": ticket_id,
+            "duplicate": duplicate,
             "message": "Votre demande de support a été reçue. Nous vous répondrons dans les 24 heures.",
         }
     except Exception as e:
@@ -640,28 +1926,47 @@ def mock_contact_support(request: ContactSupportRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# ============================================================================
+# GET /support/outbox
+# ============================================================================
+
+@app.get("/support/outbox", tags=["Health"])
+async def support_outbox_status():
+    """
+    Support outbox: queue depth, age of the oldest queued ticket and
+    delivery counters (latency histogram in GET /metrics)
+    """
+    return await asyncio.to_thread(support_outbox.stats)
+
+
 # ============================================================================
 # POST /logout
 # Logout user and clear session
 # ============================================================================
 
 @app.post("/logout", tags=["Auth"])
-def logout():
+async def logout(request: Request):
     """
     Logout user and clear session
 
-    Called when user closes the application window
+    Revokes the token sent with the request (header or ?access_token=);
+    later requests with it get 401. Without a token nothing is revoked.
 
     Returns:
         {
             "success": true,
+            "revoked": true,
             "message": "Logged out successfully"
         }
     """
     try:
-        logger.info(f"👋 User logged out: {app_state.email if app_state.email else 'unknown'}")
+        token = request_token(request)
+        revoked = token_store.revoke(token) if token else False
+        logger.info(f"👋 User logged out: {app_state.email if app_state.email else 'unknown'}"
+                    f"{' (token revoked)' if revoked else ''}")
         return {
             "success": True,
+            "revoked": revoked,
             "message": "Logged out successfully"
         }
     except Exception as e:
@@ -674,28 +1979,25 @@ def logout():
 # Reset all state to defaults
 # ============================================================================
 
-@app.post("/reset", tags=["Utility"])
-def reset_state():
+@app.post("/reset", tags=["Utility"], dependencies=authenticated)
+async def reset_state():
     """
     Reset application state to defaults (useful for testing)
 
+    The logged-in account stays logged in (email and session tokens are
+    kept); its stored profile is reset too, so the next login doesn't
+    bring the old settings back.
+
     Returns current state after reset
     """
     try:
-        app_state._set_defaults()
-        app_state.save_state()
+        await app_state.reset(keep=("email",))
+        if app_state.email:
+            profile_store.put(app_state.email, profile_of(app_state.as_dict()))
         logger.info("🔄 State reset to defaults")
         return {
             "message": "State reset to defaults",
-            "state": {
-                "remaining_games": app_state.remaining_games,
-                "first_launch": app_state.first_launch,
-                "game_timer": app_state.game_timer,
-                "coach_active": app_state.coach_active,
-                "assistant_active": app_state.assistant_active,
-                "ptt_key": app_state.ptt_key,
-                "volume": app_state.volume,
-            }
+            "state": state_summary(app_state.snapshot()),
         }
     except Exception as e:
         logger.error(f"❌ Reset error: {e}")
@@ -707,19 +2009,29 @@ def reset_state():
 # ============================================================================
 
 @app.get("/status", tags=["Health"])
-def status():
+async def status():
     """Get full application status"""
+    writer = app_state.writer
+    key = (app_state.version, writer.flushes, writer.errors, live_game_timer(app_state.snapshot().data))
+    body = response_cache.get("status", key, status_payload)
+    return Response(body, media_type="application/json")
+
+
+def state_summary(current: StateSnapshot) -> dict:
+    """The "state" object of /status and /reset (schema fields with status=True)"""
+    summary = STATE_SCHEMA.status_view(current.data)
+    summary["game_timer"] = live_game_timer(current.data)
+    return summary
+
+
+def status_payload() -> dict:
+    current = app_state.snapshot()
     return {
         "status": "running",
-        "state": {
-            "remaining_games": app_state.remaining_games,
-            "first_launch": app_state.first_launch,
-            "game_timer": app_state.game_timer,
-            "coach_active": app_state.coach_active,
-            "assistant_active": app_state.assistant_active,
-            "ptt_key": app_state.ptt_key,
-            "volume": app_state.volume,
-        }
+        "pid": os.getpid(),
+        "state": state_summary(current),
+        "version": current.version,
+        "persistence": app_state.persistence_stats(),
     }
 
 
@@ -727,14 +2039,53 @@ def status():
 # Startup/Shutdown Events
 # ============================================================================
 
+async def watch_shared_state(interval: float):
+    """
+    Multi-worker mode: pick up other workers' writes for /stream clients
+    (requests already see them, snapshot() checks the segment), and exit
+    if the parent process is gone
+    """
+    import multiprocessing
+    parent = multiprocessing.parent_process()
+    while True:
+        await asyncio.sleep(interval)
+        app_state.snapshot()
+        if parent is not None and not parent.is_alive():
+            logger.warning("⚠️  Parent process gone, shutting down")
+            signal.raise_signal(signal.SIGINT)
+            return
+
+
 @app.on_event("startup")
 async def startup_event():
+    global app_ready
+    app_state.writer.start()
+    if app_state.shared is None or support_delivery_lock.acquire(blocking=False):
+        support_outbox.start()
+    history_store.start()
+    ingest_consumer.start()
+    event_hub.bind(asyncio.get_running_loop())
+    if app_state.shared is not None:
+        asyncio.create_task(watch_shared_state(int(os.environ.get("SHARED_STATE_POLL_MS", 50)) / 1000))
+    app_ready = True
     logger.info("\n" + "="*60)
     logger.info("🚀 AMOKK Mock Backend Starting")
     logger.info("="*60)
-    logger.info(f"✅ Server running on http://127.0.0.1:8000")
-    logger.info(f"📚 Docs: http://127.0.0.1:8000/docs")
+
+
+def announce_ready(endpoint: Endpoint):
+    """Called once the listening sockets exist (see startup.serve)"""
+    startup_profile.mark("bind")
+    logger.info(f"✅ Server running on http://{endpoint.host}:{endpoint.port}")
+    if endpoint.socket_path:
+        logger.info(f"🔌 Unix socket: {endpoint.socket_path}")
+    if API_DOCS:
+        logger.info(f"📚 Docs: http://{endpoint.host}:{endpoint.port}/docs")
     logger.info("="*60)
+    # Written directly (not logged) and in one write() call, so the listener
+    # thread's output can't split the line Electron waits for
+    sys.stdout.write(ready_message(endpoint, startup_profile) + "\n")
+    sys.stdout.flush()
 
 
 @app.on_event("shutdown")
@@ -742,19 +2093,110 @@ async def shutdown_event():
     logger.info("="*60)
     logger.info("🛑 AMOKK Mock Backend Shutting Down")
     logger.info("="*60)
+    # Force a final flush of any pending write-behind changes
+    app_state.close()
+    if app_state.email:
+        profile_store.put(app_state.email, profile_of(app_state.as_dict()))
+    profile_store.close()
+    history_store.close()
+    credential_store.close()
+    await ingest_consumer.stop()
+    # Undelivered tickets stay in the outbox for the next start
+    support_outbox.stop()
+    log_pipeline.stop()
+
+
+startup_profile.mark("app_build")
+
+
+def serve_workers(workers: int, **options):
+    """
+    Serve with `workers` worker processes sharing the state
+
+    This (parent) process folds state.json and its journal into the
+    shared segment (state.shm next to state.json), hands its path to the
+    workers through AMOKK_SHARED_STATE, and saves the segment back to
+    state.json whenever workers change it, at most every
+    STATE_FLUSH_DEBOUNCE_MS, and once more after they exit.
+    """
+    app_state.compact()
+    segment = SharedStateSegment(app_state.state_file.with_suffix(".shm"), STATE_SCHEMA)
+    segment.create(app_state.as_dict(), app_state.version)
+    os.environ[SHARED_STATE_ENV] = str(segment.path)
+
+    def save(data, version):
+        atomic_write_bytes(app_state.state_file, STATE_SCHEMA.encode(data, version))
+
+    persister = SegmentPersister(segment, save, interval=int(os.environ.get("STATE_FLUSH_DEBOUNCE_MS", 250)) / 1000)
+    persister.start()
+    logger.info(f"👥 {workers} workers, shared state in {segment.path.name}")
+    try:
+        serve("main:app", workers=workers, **options)
+    finally:
+        persister.stop()
+        segment.close()
+
+
+def watch_supervisor():
+    """
+    Supervised by the launcher (AMOKK_SUPERVISED=1): stdin is a pipe from
+    it that is never written to, so EOF means the launcher is gone; shut
+    down then rather than keep serving with no one to restart or stop us
+    """
+    import threading
+
+    # Raw fd reads: a thread blocked in the buffered sys.stdin would hold
+    # its lock and abort interpreter shutdown
+    fd = sys.stdin.fileno()
+
+    def wait_for_eof():
+        try:
+            while os.read(fd, 4096):
+                pass
+        except (OSError, ValueError):
+            pass
+        logger.warning("⚠️  Supervisor gone, shutting down")
+        signal.raise_signal(signal.SIGINT)
+
+    threading.Thread(target=wait_for_eof, name="amokk-supervisor-watch", daemon=True).start()
 
 
 if __name__ == "__main__":
-    import uvicorn
-    import os
+    import argparse
+    import multiprocessing
+
+    multiprocessing.freeze_support()
+
+    parser = argparse.ArgumentParser(description="AMOKK local backend")
+    parser.add_argument("--startup-profile", action="store_true",
+                        help="print the startup phase timings once ready, then exit")
+    parser.add_argument("--workers", type=int, default=int(os.environ.get("BACKEND_WORKERS", 1)),
+                        help="worker processes (default: BACKEND_WORKERS, or 1)")
+    args = parser.parse_args()
 
     # Read port from environment variable set by Electron, with a fallback
+    # (0, or a port already in use, picks a free port, reported in the ready line)
     port = int(os.environ.get("BACKEND_PORT", 8000))
 
-    uvicorn.run(
-        app,
+    options = dict(
         host="127.0.0.1",
         port=port,
-        reload=False,
-        log_level="warning"
+        on_ready=announce_ready,
+        socket_path=os.environ.get("BACKEND_SOCKET") or None,
+        port_fallback=os.environ.get("BACKEND_PORT_FALLBACK", "1") != "0",
+        log_level="warning",
+        # No websocket routes: skip loading a websocket implementation
+        ws="none",
+        # Open /stream connections never end on their own; don't let them
+        # hold up shutdown (and the final state flush)
+        timeout_graceful_shutdown=3,
     )
+    if os.environ.get("AMOKK_SUPERVISED") == "1" and sys.stdin is not None:
+        watch_supervisor()
+    if args.workers > 1 and not args.startup_profile:
+        serve_workers(args.workers, **options)
+    else:
+        serve(app, exit_after_ready=args.startup_profile, **options)
+
+    if args.startup_profile:
+        print(json.dumps(startup_profile.as_dict(), indent=2))
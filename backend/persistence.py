@@ -0,0 +1,273 @@
+"""
+AMOKK Backend - State persistence helpers
+Write-behind flushing, mutation journal and crash-safe file writes for AppState
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Callable, List, Optional, Tuple
+
+logger = logging.getLogger("amokk")
+
+
+def atomic_write_json(path: Path, data: dict):
+    """Write data as compact JSON to path atomically (see atomic_write_bytes)"""
+    atomic_write_bytes(path, json.dumps(data, separators=(',', ':')).encode("utf-8"))
+
+
+def atomic_write_bytes(path: Path, payload: bytes):
+    """
+    Write payload to path atomically (temp file in the same directory + rename)
+
+    A crash mid-write leaves either the previous file or the new one on disk,
+    never a truncated mix of both.
+    """
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=str(path.parent))
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class StateJournal:
+    """
+    Append-only log of state mutations
+
+    One record per mutation, one line per record:
+        <crc32 hex> {"v": <version>, "c": {<field>: <value>, ...}}
+    The checksum lets replay detect a record torn by a crash mid-append;
+    replay stops at the first bad record and the tail is cut off.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._file = None
+        self.records = 0
+        self.bytes = 0
+        self.fsyncs = 0
+
+    @staticmethod
+    def encode(version: int, changes: dict) -> bytes:
+        payload = json.dumps({"v": version, "c": changes}, separators=(',', ':')).encode("utf-8")
+        return b"%08x %s\n" % (zlib.crc32(payload), payload)
+
+    def replay(self, after_version: int) -> List[Tuple[int, dict]]:
+        """Return (version, changes) records newer than after_version, in order"""
+        self.records = 0
+        self.bytes = 0
+        if not self.path.exists():
+            return []
+
+        records = []
+        valid_bytes = 0
+        with open(self.path, 'rb') as f:
+            for line in f:
+                try:
+                    crc, payload = line.rstrip(b"\n").split(b" ", 1)
+                    if not line.endswith(b"\n") or int(crc, 16) != zlib.crc32(payload):
+                        raise ValueError("checksum mismatch")
+                    record = json.loads(payload)
+                except ValueError as e:
+                    logger.warning(f"⚠️  Journal truncated at byte {valid_bytes}: {e}")
+                    break
+                valid_bytes += len(line)
+                self.records += 1
+                if record["v"] > after_version:
+                    records.append((record["v"], record["c"]))
+
+        if valid_bytes != self.path.stat().st_size:
+            with open(self.path, 'r+b') as f:
+                f.truncate(valid_bytes)
+        self.bytes = valid_bytes
+        return records
+
+    def append(self, records: List[Tuple[int, dict]]):
+        """Append a batch of records with a single write + fsync"""
+        if not records:
+            return
+        data = b"".join(self.encode(version, changes) for version, changes in records)
+        if self._file is None:
+            self._file = open(self.path, 'ab')
+        self._file.write(data)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.fsyncs += 1
+        self.records += len(records)
+        self.bytes += len(data)
+
+    def truncate(self):
+        """Empty the journal (after its records were folded into a snapshot)"""
+        self.close()
+        with open(self.path, 'wb') as f:
+            os.fsync(f.fileno())
+        self.records = 0
+        self.bytes = 0
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class StateWriter:
+    """
+    Write-behind persistence for AppState
+
+    Mutations call mark_dirty(record) and return immediately. A background
+    thread hands the pending records to flush_fn in one batch once no
+    mutation arrived for `debounce` seconds, or at the latest `max_latency`
+    seconds after the first unflushed mutation, so a burst of toggles /
+    slider moves ends up as a single write.
+    """
+
+    def __init__(self, flush_fn: Callable[[List[Any]], None], debounce: float = 0.25, max_latency: float = 2.0):
+        self._flush_fn = flush_fn
+        self.debounce = debounce
+        self.max_latency = max_latency
+
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+
+        # Pending (unflushed) mutations
+        self._pending: List[Any] = []
+        self._first_dirty_at: Optional[float] = None
+        self._last_dirty_at: Optional[float] = None
+
+        # Counters
+        self.mutations = 0
+        self.flushes = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self.total_flush_ms = 0.0
+
+        # Optional hook called with (seconds, batch size) after each successful flush
+        self.on_flush: Optional[Callable[[float, int], None]] = None
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def start(self):
+        """Start the background flusher thread"""
+        if self._thread is not None:
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="amokk-state-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the flusher thread and force a final flush"""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        self.flush()
+
+    def mark_dirty(self, record: Any = None):
+        """Record a mutation; the actual write happens later on the flusher thread"""
+        now = time.monotonic()
+        with self._cond:
+            self.mutations += 1
+            self._pending.append(record)
+            if self._first_dirty_at is None:
+                self._first_dirty_at = now
+            self._last_dirty_at = now
+            self._cond.notify_all()
+
+    def flush(self) -> bool:
+        """Synchronously write pending changes, if any. Returns True if a write happened."""
+        with self._flush_lock:
+            with self._cond:
+                batch = self._pending
+                if not batch:
+                    return False
+                self._pending = []
+                self._first_dirty_at = None
+                self._last_dirty_at = None
+
+            started = time.perf_counter()
+            try:
+                self._flush_fn(batch)
+            except Exception as e:
+                logger.error(f"❌ Error saving state: {e}")
+                with self._cond:
+                    self.errors += 1
+                    # Keep the changes pending so the next flush retries them
+                    self._pending = batch + self._pending
+                    if self._first_dirty_at is None:
+                        self._first_dirty_at = time.monotonic()
+                        self._last_dirty_at = self._first_dirty_at
+                return False
+
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            with self._cond:
+                self.flushes += 1
+                self.coalesced += len(batch) - 1
+                self.last_flush_ms = elapsed_ms
+                self.total_flush_ms += elapsed_ms
+                self.max_flush_ms = max(self.max_flush_ms, elapsed_ms)
+            if self.on_flush is not None:
+                self.on_flush(elapsed_ms / 1000, len(batch))
+            return True
+
+    def stats(self) -> dict:
+        """Flush counters and latency (milliseconds)"""
+        with self._cond:
+            return {
+                "mutations": self.mutations,
+                "flushes": self.flushes,
+                "coalesced": self.coalesced,
+                "pending": len(self._pending),
+                "errors": self.errors,
+                "last_flush_ms": round(self.last_flush_ms, 3),
+                "avg_flush_ms": round(self.total_flush_ms / self.flushes, 3) if self.flushes else 0.0,
+                "max_flush_ms": round(self.max_flush_ms, 3),
+                "debounce_ms": int(self.debounce * 1000),
+                "max_latency_ms": int(self.max_latency * 1000),
+            }
+
+    # ------------------------------------------------------------------
+    # Background loop
+    # ------------------------------------------------------------------
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._stopping:
+                    self._cond.wait()
+                if self._stopping:
+                    return
+
+                # Wait for the burst to settle, bounded by max_latency
+                while not self._stopping and self._pending:
+                    now = time.monotonic()
+                    quiet_deadline = self._last_dirty_at + self.debounce
+                    hard_deadline = self._first_dirty_at + self.max_latency
+                    deadline = min(quiet_deadline, hard_deadline)
+                    if now >= deadline:
+                        break
+                    self._cond.wait(deadline - now)
+                if self._stopping:
+                    return
+
+            self.flush()
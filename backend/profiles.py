@@ -0,0 +1,105 @@
+"""
+AMOKK Backend - Per-account profile store
+SQLite (WAL) storage of each account's settings with an in-memory LRU
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger("amokk")
+
+
+class ProfileStore:
+    """
+    Settings of every account that has logged in on this machine
+
+    The active profile lives in AppState (memory + state.json/journal);
+    this store keeps the others, keyed by email. Recently used profiles
+    stay in a bounded LRU so switching back and forth never touches disk.
+    Writes go through to SQLite immediately.
+
+    The database is opened on first use (first login), not at startup.
+    """
+
+    def __init__(self, path: Path, cache_size: int = 8):
+        self.path = path
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+
+    @property
+    def _db(self):
+        if self._conn is None:
+            import sqlite3  # Deferred with the connection
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS profiles ("
+                " email TEXT PRIMARY KEY,"
+                " data TEXT NOT NULL,"
+                " updated_at REAL NOT NULL)"
+            )
+        return self._conn
+
+    def get(self, email: str) -> Optional[dict]:
+        """Profile fields for email, or None if this account was never seen"""
+        with self._lock:
+            profile = self._cache.get(email)
+            if profile is not None:
+                self._cache.move_to_end(email)
+                self.hits += 1
+                return dict(profile)
+
+            self.misses += 1
+            row = self._db.execute("SELECT data FROM profiles WHERE email = ?", (email,)).fetchone()
+            if row is None:
+                return None
+            profile = json.loads(row[0])
+            self._remember(email, profile)
+            return dict(profile)
+
+    def put(self, email: str, profile: dict):
+        """Store (insert or replace) the profile of email"""
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO profiles (email, data, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(email) DO UPDATE SET data = excluded.data, updated_at = excluded.updated_at",
+                (email, json.dumps(profile, separators=(',', ':')), time.time()),
+            )
+            self.writes += 1
+            self._remember(email, dict(profile))
+
+    def count(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM profiles").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def stats(self) -> dict:
+        return {
+            "cached": len(self._cache),
+            "cache_size": self.cache_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+        }
+
+    def _remember(self, email: str, profile: dict):
+        self._cache[email] = profile
+        self._cache.move_to_end(email)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
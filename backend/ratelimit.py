@@ -0,0 +1,218 @@
+"""
+AMOKK Backend - Rate limiting and load shedding
+Per-client, per-route token buckets and a cap on requests in flight,
+applied before the request reaches FastAPI
+"""
+
+import hashlib
+import logging
+import math
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger("amokk")
+
+# Header a renderer window sends to identify itself (one id per page load)
+CLIENT_ID_HEADER = b"x-client-id"
+
+
+class Limit(NamedTuple):
+    rate: float   # Tokens refilled per second
+    burst: float  # Bucket capacity
+
+
+def parse_limit(value: str, default: Limit) -> Limit:
+    """Limit from "<rate>/<burst>" (e.g. "20/40"); default when empty or invalid"""
+    try:
+        rate, _, burst = value.partition("/")
+        return Limit(float(rate), float(burst or rate))
+    except ValueError:
+        if value:
+            logger.warning(f"⚠️  Invalid rate limit {value!r}, using {default.rate:g}/{default.burst:g}")
+        return default
+
+
+def client_key(scope) -> str:
+    """
+    Who is calling: the X-Client-Id of the window, else the session token
+    (by digest prefix), else the peer address. Renderer windows all come
+    from 127.0.0.1, so the address alone can't tell them apart.
+    """
+    authorization = None
+    for name, value in scope["headers"]:
+        if name == CLIENT_ID_HEADER and value:
+            return "id:" + value.decode("latin-1")[:64]
+        if name == b"authorization":
+            authorization = value
+    if authorization:
+        return "token:" + hashlib.sha256(authorization.partition(b" ")[2]).hexdigest()[:12]
+    client = scope.get("client")
+    return "addr:" + (client[0] if client else "unknown")
+
+
+class TokenBuckets:
+    """
+    One token bucket per (client, route), refilled lazily on access
+
+    take() is O(1): one dict lookup, a little arithmetic, and a
+    move_to_end to keep the dict in least-recently-used order. Past
+    `capacity` buckets the least recently used one is dropped; it would
+    have refilled to full anyway unless the client is still hammering.
+    """
+
+    def __init__(self, capacity: int = 4096):
+        self.capacity = capacity
+        self._buckets: "OrderedDict[Tuple[str, str], list]" = OrderedDict()
+
+    def take(self, key: Tuple[str, str], limit: Limit, now: float) -> float:
+        """Consume one token; returns 0 if allowed, else the seconds until a token is available"""
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = [limit.burst, now]
+            if len(self._buckets) > self.capacity:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+            tokens, last = bucket
+            bucket[0] = min(limit.burst, tokens + (now - last) * limit.rate)
+            bucket[1] = now
+
+        if bucket[0] >= 1:
+            bucket[0] -= 1
+            return 0.0
+        return (1 - bucket[0]) / limit.rate if limit.rate > 0 else 60.0
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class RateLimiter:
+    """
+    Per-client token buckets and load shedding (see RateLimitMiddleware)
+
+    - Priority routes (health, readiness, metrics) are never limited nor
+      shed, so probes keep answering while a client floods the backend.
+    - Each (client, route) pair has a token bucket: `limits[path]` when
+      listed, else `read` for GET/HEAD and `write` for other methods. An
+      empty bucket gets 429 with Retry-After.
+    - At most `max_in_flight` requests run at once (long-lived routes such
+      as /stream don't count); beyond that, requests get 503 with
+      Retry-After instead of queueing behind the others.
+
+    Rejections are counted per (client, route) in `rejected` (bounded)
+    and reported through on_reject(client, route, status).
+    """
+
+    def __init__(self, read: Limit, write: Limit, limits: Optional[Dict[str, Limit]] = None,
+                 priority: Iterable[str] = (), long_lived: Iterable[str] = (), max_in_flight: int = 64,
+                 enabled: bool = True):
+        self.read = read
+        self.write = write
+        self.limits = limits or {}
+        self.priority = frozenset(priority)
+        self.long_lived = frozenset(long_lived)
+        self.max_in_flight = max_in_flight
+        self.enabled = enabled
+
+        self.buckets = TokenBuckets()
+        self.in_flight = 0
+        self.limited = 0
+        self.shed = 0
+        self.rejected: "OrderedDict[Tuple[str, str], int]" = OrderedDict()
+        self._last_warning: Dict[Tuple[str, str], float] = {}
+
+        # Optional hook called with (client, route, status) for each rejected request
+        self.on_reject: Optional[Callable[[str, str, int], None]] = None
+
+    def limit_for(self, method: str, path: str) -> Limit:
+        limit = self.limits.get(path)
+        if limit is None:
+            limit = self.read if method in ("GET", "HEAD") else self.write
+        return limit
+
+    def reject(self, client: str, method: str, path: str, status: int):
+        """Count a rejection (and warn, at most once a minute per client and route)"""
+        key = (client, path)
+        self.rejected[key] = self.rejected.pop(key, 0) + 1
+        if len(self.rejected) > 256:
+            self.rejected.popitem(last=False)
+        if self.on_reject is not None:
+            self.on_reject(client, path, status)
+        now = time.monotonic()
+        if now - self._last_warning.get(key, -60.0) >= 60.0:
+            if len(self._last_warning) > 256:
+                self._last_warning.clear()
+            self._last_warning[key] = now
+            logger.warning(f"⚠️  {status} for {client} on {method} {path} ({self.rejected[key]} so far)")
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "in_flight": self.in_flight,
+            "limited": self.limited,
+            "shed": self.shed,
+            "buckets": len(self.buckets),
+            "top_clients": [
+                {"client": client, "route": route, "rejected": count}
+                for (client, route), count in sorted(self.rejected.items(), key=lambda item: -item[1])[:10]
+            ],
+        }
+
+
+class RateLimitMiddleware:
+    """
+    Pure ASGI middleware applying a RateLimiter
+
+    Rejected requests are answered here, with a small JSON body and
+    Retry-After, without reaching routing or the endpoint.
+    """
+
+    def __init__(self, app, limiter: RateLimiter):
+        self.app = app
+        self.limiter = limiter
+
+    async def __call__(self, scope, receive, send):
+        limiter = self.limiter
+        if scope["type"] != "http" or not limiter.enabled or scope["path"] in limiter.priority:
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        method = scope["method"]
+        client = client_key(scope)
+        wait = limiter.buckets.take((client, path), limiter.limit_for(method, path), time.monotonic())
+        if wait:
+            limiter.limited += 1
+            limiter.reject(client, method, path, 429)
+            await respond(send, 429, "Too many requests", wait)
+            return
+
+        if path in limiter.long_lived:
+            await self.app(scope, receive, send)
+            return
+        if limiter.in_flight >= limiter.max_in_flight:
+            limiter.shed += 1
+            limiter.reject(client, method, path, 503)
+            await respond(send, 503, "Server busy", 1.0)
+            return
+
+        limiter.in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.in_flight -= 1
+
+
+async def respond(send, status: int, detail: str, retry_after: float):
+    body = b'{"detail":"' + detail.encode() + b'"}'
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
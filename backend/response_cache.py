@@ -0,0 +1,70 @@
+"""
+AMOKK Backend - Pre-serialized response cache
+Keeps the encoded JSON bytes of hot read endpoints until the state changes
+"""
+
+import json
+import threading
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+from fastapi.encoders import jsonable_encoder
+
+try:
+    import orjson  # Optional, faster encoder
+except ImportError:
+    orjson = None
+
+
+def dumps(obj: Any) -> bytes:
+    """Encode obj as compact JSON bytes (orjson when available)"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode("utf-8")
+
+
+class ResponseCache:
+    """
+    Per-endpoint cache of encoded response bodies
+
+    Each entry is stored with the key it was built for (typically the state
+    version); a lookup with a different key rebuilds and replaces the entry,
+    so a stale body can never be served after a mutation.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._entries: Dict[str, Tuple[Hashable, bytes]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, name: str, key: Hashable, build: Callable[[], Any]) -> bytes:
+        """Return the cached body for (name, key), building and encoding it on a miss"""
+        if not self.enabled:
+            # Uncached reference path: generic encoder, every call
+            return json.dumps(jsonable_encoder(build())).encode("utf-8")
+
+        entry = self._entries.get(name)
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry[1]
+
+        body = dumps(build())
+        with self._lock:
+            self.misses += 1
+            self._entries[name] = (key, body)
+        return body
+
+    def invalidate(self, *_):
+        """Drop every entry (usable directly as an AppState listener)"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "encoder": "orjson" if orjson is not None else "json",
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
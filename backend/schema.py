@@ -0,0 +1,232 @@
+"""
+AMOKK Backend - State schema
+One declarative table of the AppState fields, driving defaults, the
+stored file format (with schema version and migrations), validation,
+per-account profiles and the dashboard payload
+"""
+
+import json
+import logging
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+import session
+
+try:
+    import orjson  # Optional, faster encoder/decoder
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger("amokk")
+
+
+class StateField:
+    """
+    One AppState field
+
+    api:     name in the HTTP API (None: internal only)
+    read:    part of LocalDataResponse / GET /stream (fields with an api name)
+    config:  settable through PATCH /config (under its api name)
+    profile: per-account (parked in the profile store on account switch)
+    status:  listed in the "state" object of /status and /reset
+    check:   validation of a new value; returns an error message or None
+    api_type: type in the HTTP API, when it differs from the stored type
+    max_bytes: longest value of a str field (UTF-8), checked by validate();
+             also its fixed slot in the multi-worker shared segment
+    """
+
+    __slots__ = ("name", "type", "default", "api", "read", "config", "profile", "status", "check", "nullable",
+                 "api_type", "max_bytes")
+
+    def __init__(self, name: str, type: type, default: Any, api: Optional[str] = None,
+                 read: bool = True, config: bool = False, profile: bool = True, status: bool = False,
+                 check: Optional[Callable[[Any], Optional[str]]] = None, api_type: Optional[type] = None,
+                 max_bytes: Optional[int] = None):
+        self.name = name
+        self.type = type
+        self.default = default
+        self.api = api
+        self.read = read and api is not None
+        self.config = config
+        self.profile = profile
+        self.status = status
+        self.check = check
+        self.nullable = default is None
+        self.api_type = api_type or type
+        self.max_bytes = max_bytes
+
+    def coerce(self, value: Any) -> Any:
+        """value as this field's type (files written by older builds may differ)"""
+        if value is None and self.nullable:
+            return None
+        if self.type is bool:
+            # Not truthiness: the strings "false" and "0" are truthy
+            if isinstance(value, bool):
+                return value
+            if isinstance(value, int) and value in (0, 1):
+                return bool(value)
+            raise ValueError(f"{value!r} is not a boolean")
+        if self.type is int and not isinstance(value, bool):
+            return int(value)
+        if self.type is float:
+            return float(value)
+        return self.type(value)
+
+    def __repr__(self):
+        return f"StateField({self.name!r})"
+
+
+class SchemaError(ValueError):
+    """Stored state can't be read by this schema (e.g. written by a newer build)"""
+
+
+class StateSchema:
+    """
+    The fields of the state, and how stored files are read and written
+
+    Stored file: {"schema": <version>, "version": <state version>, <field>: <value>, ...},
+    compact JSON (orjson when available). Files from an older schema are
+    brought up to date by the registered migrations, one version at a time,
+    before unknown fields are dropped and missing ones defaulted; files
+    without a "schema" key are version 1.
+    """
+
+    __slots__ = ("version", "fields", "by_name", "api_names", "config_fields",
+                 "profile_fields", "status_fields", "_defaults", "_migrations")
+
+    def __init__(self, version: int, fields: Iterable[StateField]):
+        self.version = version
+        self.fields: Tuple[StateField, ...] = tuple(fields)
+        self.by_name: Dict[str, StateField] = {field.name: field for field in self.fields}
+        # Precomputed views, so per-request code only iterates short tuples
+        self.api_names: Dict[str, str] = {f.name: f.api for f in self.fields if f.read}
+        self.config_fields: Dict[str, StateField] = {f.api: f for f in self.fields if f.config}
+        self.profile_fields: Tuple[str, ...] = tuple(f.name for f in self.fields if f.profile)
+        self.status_fields: Tuple[str, ...] = tuple(f.name for f in self.fields if f.status)
+        self._defaults = {field.name: field.default for field in self.fields}
+        self._migrations: Dict[int, Callable[[dict], dict]] = {}
+
+    def defaults(self) -> dict:
+        return dict(self._defaults)
+
+    def migration(self, from_version: int):
+        """Decorator registering the migration of stored data from from_version to from_version + 1"""
+        def register(fn: Callable[[dict], dict]):
+            self._migrations[from_version] = fn
+            return fn
+        return register
+
+    # ------------------------------------------------------------------
+    # Stored file
+    # ------------------------------------------------------------------
+
+    def encode(self, data: Mapping, version: int) -> bytes:
+        """Stored representation of data at state version `version`"""
+        document = {"schema": self.version, "version": version}
+        for field in self.fields:
+            document[field.name] = data[field.name]
+        if orjson is not None:
+            return orjson.dumps(document)
+        return json.dumps(document, separators=(',', ':'), ensure_ascii=False).encode("utf-8")
+
+    def decode(self, raw: bytes) -> Tuple[dict, int]:
+        """(field values, state version) from a stored file, migrated to this schema"""
+        stored = orjson.loads(raw) if orjson is not None else json.loads(raw)
+        if not isinstance(stored, dict):
+            raise SchemaError("State file is not a JSON object")
+        return self.upgrade(stored)
+
+    def upgrade(self, stored: dict) -> Tuple[dict, int]:
+        """Migrate a stored document to this schema; returns (field values, state version)"""
+        schema_version = stored.get("schema", 1)
+        if schema_version > self.version:
+            raise SchemaError(f"State written by a newer build (schema {schema_version} > {self.version})")
+        while schema_version < self.version:
+            migrate = self._migrations.get(schema_version)
+            if migrate is not None:
+                stored = migrate(dict(stored))
+            schema_version += 1
+            logger.info(f"🔄 State migrated to schema {schema_version}")
+
+        data = self.defaults()
+        for field in self.fields:
+            if field.name in stored:
+                try:
+                    data[field.name] = field.coerce(stored[field.name])
+                except (TypeError, ValueError):
+                    logger.warning(f"⚠️  Invalid stored {field.name}: {stored[field.name]!r}, using default")
+        return data, stored.get("version", 0)
+
+    # ------------------------------------------------------------------
+    # Validation and views
+    # ------------------------------------------------------------------
+
+    def validate(self, changes: Mapping) -> List[str]:
+        """Error messages for field changes (by field name); empty when valid"""
+        errors = []
+        for name, value in changes.items():
+            field = self.by_name[name]
+            if field.type is bool and not isinstance(value, bool):
+                errors.append(f"{field.api or name} must be true or false")
+                continue
+            if field.max_bytes is not None and isinstance(value, str) and len(value.encode("utf-8")) > field.max_bytes:
+                errors.append(f"{field.api or name} longer than {field.max_bytes} bytes")
+                continue
+            check = field.check
+            if check is not None:
+                error = check(value)
+                if error:
+                    errors.append(error)
+        return errors
+
+    def api_view(self, values: Mapping, names: Optional[Iterable[str]] = None) -> dict:
+        """API names and values for the exposed fields among names (default: all)"""
+        api_names = self.api_names
+        if names is None:
+            return {api: values[name] for name, api in api_names.items()}
+        return {api_names[name]: values[name] for name in names if name in api_names}
+
+    def profile_of(self, values: Mapping) -> dict:
+        return {name: values[name] for name in self.profile_fields}
+
+    def status_view(self, values: Mapping) -> dict:
+        return {name: values[name] for name in self.status_fields}
+
+
+def _ptt_key_error(value: str) -> Optional[str]:
+    return None if value else "PTT key cannot be empty"
+
+
+def _volume_error(value: int) -> Optional[str]:
+    return None if 0 <= value <= 100 else "Volume must be between 0 and 100"
+
+
+# Schema history:
+#   1  files written before the schema existed (no "schema" key)
+#   2  "schema" key; every field stored with its declared type
+STATE_SCHEMA = StateSchema(version=2, fields=(
+    StateField('remaining_games', int, 42, api='remaining_games', status=True),
+    # Per machine: the welcome dialog is shown once, whoever logs in
+    StateField('first_launch', bool, True, api='first_launch', profile=False, status=True),
+    # Seconds accumulated before the running segment (ms precision), whole seconds in the API
+    StateField('game_timer', float, 0, api='game_timer', status=True, api_type=int),
+    # Per machine too: the account is the key of the profile store
+    StateField('email', str, '', api='email', profile=False, max_bytes=254),  # RFC 5321 maximum
+    StateField('coach_active', bool, True, api='coach_toggle', config=True, status=True),
+    StateField('assistant_active', bool, True, api='assistant_toggle', config=True, status=True),
+    StateField('amokk_toggle', bool, True, api='amokk_toggle', config=True),
+    StateField('proactive_coach_active', bool, False,  # Disabled by default
+               api='proactive_coach_toggle', read=False, config=True),
+    StateField('ptt_key', str, 'v', api='ptt_key', config=True, status=True, check=_ptt_key_error,
+               max_bytes=32),
+    StateField('volume', int, 80, api='tts_volume', config=True, status=True, check=_volume_error),
+    StateField('plan_id', int, 1),  # Default: Starter plan
+    StateField('session_state', str, session.SESSION_DEFAULTS['session_state'], api='session_state', status=True,
+               max_bytes=16),
+    StateField('session_started_at', float, session.SESSION_DEFAULTS['session_started_at']),
+))
+
+
+@STATE_SCHEMA.migration(1)
+def _types_from_v1(stored: dict) -> dict:
+    """v1 -> v2: same fields, no renames; values are type-checked by the load itself"""
+    return stored
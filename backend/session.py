@@ -0,0 +1,107 @@
+"""
+AMOKK Backend - Game session engine
+Start / pause / end of a coached game, with a timer computed on read
+"""
+
+import time
+from typing import Mapping, Optional
+
+IDLE = "idle"
+RUNNING = "running"
+PAUSED = "paused"
+
+# AppState fields owned by the session engine, with their defaults
+# (game_timer, already part of the state, holds the seconds accumulated
+# before the running segment, or the final duration once the game ended)
+SESSION_DEFAULTS = {
+    'session_state': IDLE,
+    'session_started_at': None,  # Wall-clock start of the running segment
+}
+
+
+class SessionError(Exception):
+    """Transition not allowed in the current session state"""
+
+
+class NoRemainingGames(SessionError):
+    """A new game can't start: the plan has no games left"""
+
+
+class SessionClock:
+    """
+    Measures the running segment of a session on the monotonic clock
+
+    The state records when the running segment started as wall-clock time
+    (session_started_at), which survives a restart; the elapsed time itself
+    is read from time.monotonic(), so wall-clock adjustments during a game
+    don't move the timer. A segment started by this process uses the
+    monotonic reading taken at start; one recovered from disk is anchored
+    once from its wall-clock age (the game went on while the backend was down).
+
+    Nothing ticks: the timer costs one monotonic() call per read.
+    """
+
+    def __init__(self):
+        self._started_at: Optional[float] = None
+        self._anchor = 0.0
+
+    def start(self) -> float:
+        """Start a new running segment; returns the wall-clock time to persist"""
+        self._anchor = time.monotonic()
+        self._started_at = time.time()
+        return self._started_at
+
+    def elapsed(self, started_at: float) -> float:
+        """Seconds since the running segment that started at started_at"""
+        if started_at != self._started_at:
+            self._anchor = time.monotonic() - max(0.0, time.time() - started_at)
+            self._started_at = started_at
+        return time.monotonic() - self._anchor
+
+
+def game_timer(data: Mapping, clock: SessionClock) -> float:
+    """Current session time in seconds"""
+    if data['session_state'] == RUNNING:
+        return data['game_timer'] + clock.elapsed(data['session_started_at'])
+    return data['game_timer']
+
+
+# ----------------------------------------------------------------------
+# Transitions: each returns the state changes to apply (for AppState.mutate)
+# ----------------------------------------------------------------------
+
+def start(data: Mapping, clock: SessionClock, unlimited: bool) -> dict:
+    """Start a new game (idle) or resume a paused one"""
+    state = data['session_state']
+    if state == RUNNING:
+        raise SessionError("Session already running")
+    if state == PAUSED:
+        return {'session_state': RUNNING, 'session_started_at': clock.start()}
+    if not unlimited and data['remaining_games'] <= 0:
+        raise NoRemainingGames("No remaining games")
+    return {'session_state': RUNNING, 'session_started_at': clock.start(), 'game_timer': 0}
+
+
+def pause(data: Mapping, clock: SessionClock) -> dict:
+    """Freeze the timer of the running game"""
+    if data['session_state'] != RUNNING:
+        raise SessionError("No running session")
+    return {
+        'session_state': PAUSED,
+        'session_started_at': None,
+        'game_timer': round(game_timer(data, clock), 3),
+    }
+
+
+def end(data: Mapping, clock: SessionClock, unlimited: bool) -> dict:
+    """End the running or paused game and consume one remaining game"""
+    if data['session_state'] == IDLE:
+        raise SessionError("No active session")
+    changes = {
+        'session_state': IDLE,
+        'session_started_at': None,
+        'game_timer': round(game_timer(data, clock), 3),
+    }
+    if not unlimited:
+        changes['remaining_games'] = max(0, data['remaining_games'] - 1)
+    return changes
@@ -0,0 +1,300 @@
+"""
+AMOKK Backend - Shared-memory state segment (multi-worker mode)
+The AppState fields in a memory-mapped file with a fixed layout, read by
+every worker under a seqlock and written under an inter-process lock
+"""
+
+import hashlib
+import logging
+import math
+import mmap
+import os
+import struct
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Mapping, Optional, Tuple
+
+logger = logging.getLogger("amokk")
+
+MAGIC = b"AMOKKSHM"
+
+# Header: magic, layout digest, sequence, state version. seq and version
+# are 8-byte aligned, so each is stored and loaded in one access.
+HEADER = struct.Struct("<8s8sQQ")
+SEQ = struct.Struct("<Q")
+SEQ_OFFSET = 16
+VERSION_OFFSET = 24
+
+
+class SegmentError(RuntimeError):
+    """The segment can't be used (missing, or written with another layout)"""
+
+
+# ============================================================================
+# Inter-process lock
+# ============================================================================
+
+class FileLock:
+    """
+    Exclusive lock on a file, across processes (flock, or msvcrt on Windows)
+
+    Released by the OS if the holder dies, so a crashed worker can't leave
+    the state locked.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._fd: Optional[int] = None
+        self._thread_lock = threading.Lock()
+
+    def _open(self) -> int:
+        if self._fd is None:
+            self._fd = os.open(str(self.path), os.O_RDWR | os.O_CREAT, 0o600)
+        return self._fd
+
+    def acquire(self, blocking: bool = True) -> bool:
+        if not self._thread_lock.acquire(blocking):
+            return False
+        fd = self._open()
+        try:
+            if os.name == "nt":
+                import msvcrt
+                mode = msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK
+                while True:
+                    try:
+                        os.lseek(fd, 0, os.SEEK_SET)
+                        msvcrt.locking(fd, mode, 1)
+                        break
+                    except OSError:
+                        # LK_LOCK gives up after ~10 s; keep waiting when blocking
+                        if not blocking:
+                            raise
+            else:
+                import fcntl
+                fcntl.flock(fd, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            self._thread_lock.release()
+            return False
+        return True
+
+    def release(self):
+        fd = self._fd
+        if os.name == "nt":
+            import msvcrt
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        self._thread_lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *_):
+        self.release()
+
+
+# ============================================================================
+# Segment
+# ============================================================================
+
+class SharedStateSegment:
+    """
+    The state fields at fixed offsets in a memory-mapped file
+
+    Layout (derived from the schema, checked by digest on attach):
+        header  magic | layout digest | seq (u64) | version (u64)
+        fields  bool: 1 byte, int: i64, float: f64 (NaN for None),
+                str: u16 length + the field's max_bytes (enforced by
+                     STATE_SCHEMA.validate before any write)
+
+    Seqlock: a writer makes seq odd, writes the fields and the version,
+    then makes seq even again. A reader loads seq, copies the fields,
+    loads seq again, and retries if it changed or was odd. Reads are
+    plain memory accesses on the mapping, no system call and no lock, so
+    any number of workers read concurrently; writers are serialized
+    across processes by lock (a FileLock next to the segment).
+
+    snapshot() also keeps the last decoded state with its seq: while the
+    segment doesn't change, a read costs one 8-byte load.
+    """
+
+    def __init__(self, path: Path, schema):
+        self.path = path
+        self.schema = schema
+        self.lock = FileLock(path.with_name(path.name + ".lock"))
+        codes = []
+        for field in schema.fields:
+            if field.type is bool:
+                codes.append("?")
+            elif field.type is int:
+                codes.append("q")
+            elif field.type is float:
+                codes.append("d")
+            elif field.type is str and field.max_bytes is not None:
+                codes.append(f"H{field.max_bytes}s")
+            else:
+                raise SegmentError(f"No shared layout for {field.name} ({field.type.__name__})")
+        self.payload = struct.Struct("<" + "".join(codes))
+        self.size = HEADER.size + self.payload.size
+        self.digest = hashlib.sha256(self.payload.format.encode() + repr(
+            [field.name for field in schema.fields]).encode()).digest()[:8]
+        self._map: Optional[mmap.mmap] = None
+        self._cached: Tuple[int, Optional[dict], int] = (-1, None, 0)
+        self.retries = 0
+        self.writes = 0
+
+    # ------------------------------------------------------------------
+    # Setup
+    # ------------------------------------------------------------------
+
+    def create(self, data: Mapping, version: int):
+        """Create (or overwrite) the segment file with data at version (parent process)"""
+        with open(self.path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, self.digest, 0, version))
+            f.write(bytes(self.payload.size))
+        self._open()
+        with self.lock:
+            self.write(data, version)
+
+    def attach(self):
+        """Map an existing segment (worker process)"""
+        if not self.path.exists():
+            raise SegmentError(f"No shared state segment at {self.path}")
+        self._open()
+        magic, digest, _, _ = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or digest != self.digest:
+            raise SegmentError("Shared state segment written with another layout")
+
+    def _open(self):
+        with open(self.path, "r+b") as f:
+            self._map = mmap.mmap(f.fileno(), self.size)
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    # ------------------------------------------------------------------
+    # Reads (lock-free)
+    # ------------------------------------------------------------------
+
+    @property
+    def seq(self) -> int:
+        return SEQ.unpack_from(self._map, SEQ_OFFSET)[0]
+
+    def read(self) -> Tuple[dict, int, int]:
+        """(fields, state version, seq) as of one consistent write"""
+        buffer = self._map
+        while True:
+            before = SEQ.unpack_from(buffer, SEQ_OFFSET)[0]
+            if before & 1:
+                self.retries += 1
+                continue  # Write in progress (a few microseconds)
+            raw = buffer[VERSION_OFFSET:self.size]  # One copy of version + fields
+            if SEQ.unpack_from(buffer, SEQ_OFFSET)[0] == before:
+                break
+            self.retries += 1
+        version = SEQ.unpack_from(raw, 0)[0]
+        return self._decode(self.payload.unpack_from(raw, 8)), version, before
+
+    def snapshot(self) -> Tuple[dict, int, int]:
+        """Like read(), from the last decoded state when seq didn't move"""
+        seq, data, version = self._cached
+        if data is not None and SEQ.unpack_from(self._map, SEQ_OFFSET)[0] == seq:
+            return data, version, seq
+        data, version, seq = self.read()
+        self._cached = (seq, data, version)
+        return data, version, seq
+
+    def _decode(self, values: tuple) -> dict:
+        data = {}
+        values = iter(values)
+        for field in self.schema.fields:
+            value = next(values)
+            if field.type is str:
+                value = next(values)[:value].decode("utf-8")
+            elif field.type is float and field.nullable and math.isnan(value):
+                value = None
+            data[field.name] = value
+        return data
+
+    # ------------------------------------------------------------------
+    # Writes (under self.lock)
+    # ------------------------------------------------------------------
+
+    def write(self, data: Mapping, version: int) -> int:
+        """Publish data at version and return the new seq; the caller holds self.lock"""
+        values = []
+        for field in self.schema.fields:
+            value = data[field.name]
+            if field.type is str:
+                encoded = value.encode("utf-8")
+                if len(encoded) > field.max_bytes:
+                    # Validated upstream (StateField.max_bytes): a bug if reached
+                    raise ValueError(f"{field.name} longer than {field.max_bytes} bytes")
+                values += (len(encoded), encoded)
+            elif value is None:
+                values.append(math.nan)
+            else:
+                values.append(value)
+        payload = self.payload.pack(*values)
+
+        buffer = self._map
+        seq = SEQ.unpack_from(buffer, SEQ_OFFSET)[0]
+        SEQ.pack_into(buffer, SEQ_OFFSET, seq + 1)
+        buffer[VERSION_OFFSET + 8:self.size] = payload
+        SEQ.pack_into(buffer, VERSION_OFFSET, version)
+        SEQ.pack_into(buffer, SEQ_OFFSET, seq + 2)
+        self.writes += 1
+        return seq + 2
+
+
+class SegmentPersister:
+    """
+    Writes the segment to state.json from the parent process
+
+    Workers only write to the segment; this thread checks its seq every
+    `interval` seconds and, when it moved, hands the state to
+    save(data, version). stop() does a last check.
+    """
+
+    def __init__(self, segment: SharedStateSegment, save: Callable[[Dict, int], None], interval: float = 0.25):
+        self.segment = segment
+        self.save = save
+        self.interval = interval
+        self.saves = 0
+        self._saved_seq = segment.seq
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="amokk-segment-persister", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        self.persist()
+
+    def persist(self) -> bool:
+        if self.segment.seq == self._saved_seq:
+            return False
+        data, version, seq = self.segment.read()
+        try:
+            self.save(data, version)
+        except Exception as e:
+            logger.error(f"❌ Error saving state: {e}")
+            return False
+        self._saved_seq = seq
+        self.saves += 1
+        return True
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.persist()
+
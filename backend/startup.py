@@ -0,0 +1,168 @@
+"""
+AMOKK Backend - Startup profiling and readiness handshake
+Phase timings from main.py import to listening socket, listening sockets
+(TCP + optional Unix domain socket) and the ready line printed for the
+Electron main process
+"""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import time
+from typing import Callable, Dict, NamedTuple, Optional
+
+logger = logging.getLogger("amokk")
+
+# Prefix of the single stdout line announcing that the server accepts connections
+READY_PREFIX = "AMOKK_READY "
+
+
+class StartupProfile:
+    """
+    Consecutive startup phases and their durations
+
+    mark(name) closes the phase that started at the previous mark (or at
+    construction), so phases add up to the total time since the profile
+    was created.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self._last = self.started
+        self.phases: Dict[str, float] = {}
+
+    def mark(self, name: str):
+        now = time.perf_counter()
+        self.phases[name] = now - self._last
+        self._last = now
+
+    def as_dict(self) -> dict:
+        return {
+            "phases_ms": {name: round(seconds * 1000, 2) for name, seconds in self.phases.items()},
+            "total_ms": round((self._last - self.started) * 1000, 2),
+        }
+
+
+class Endpoint(NamedTuple):
+    """Where the server listens: TCP always, plus a Unix socket when available"""
+    host: str
+    port: int
+    socket_path: Optional[str] = None
+
+
+def bind_tcp(host: str, port: int, fallback: bool = True) -> socket.socket:
+    """
+    Bind a TCP socket on host:port
+
+    If the port is taken and fallback is set, binds an OS-assigned
+    ephemeral port instead (reported in the ready line) rather than failing.
+    """
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    if os.name == "nt":
+        # SO_REUSEADDR on Windows lets bind() take a port another process is
+        # listening on; exclusive use makes a taken port fail (and fall back)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_EXCLUSIVEADDRUSE, 1)
+    else:
+        # Rebind right after a restart despite connections left in TIME_WAIT
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    try:
+        sock.bind((host, port))
+    except OSError as e:
+        if not fallback or port == 0:
+            sock.close()
+            raise
+        logger.warning(f"⚠️  Port {port} unavailable ({e}), using an ephemeral port")
+        sock.bind((host, 0))
+    sock.set_inheritable(True)
+    return sock
+
+
+def bind_unix(path: str) -> Optional[socket.socket]:
+    """Bind a Unix domain socket at path (owner-only), or None where unsupported"""
+    if not hasattr(socket, "AF_UNIX"):
+        logger.warning("⚠️  Unix domain sockets not supported on this platform, TCP only")
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        if os.path.exists(path):
+            os.unlink(path)  # Stale socket from a previous run
+        sock.bind(path)
+        os.chmod(path, 0o600)
+    except OSError as e:
+        sock.close()
+        logger.warning(f"⚠️  Could not bind Unix socket {path} ({e}), TCP only")
+        return None
+    sock.set_inheritable(True)
+    return sock
+
+
+def ready_message(endpoint: Endpoint, profile: StartupProfile) -> str:
+    """Machine-readable ready line: prefix + one JSON object"""
+    return READY_PREFIX + json.dumps({
+        "event": "ready",
+        "pid": os.getpid(),
+        "host": endpoint.host,
+        "port": endpoint.port,
+        "url": f"http://{endpoint.host}:{endpoint.port}",
+        "socket": endpoint.socket_path,
+        "transport": "uds" if endpoint.socket_path else "tcp",
+        "startup": profile.as_dict(),
+    }, separators=(',', ':'))
+
+
+def serve(app, host: str, port: int, on_ready: Callable[[Endpoint], None],
+          socket_path: Optional[str] = None, port_fallback: bool = True,
+          exit_after_ready: bool = False, workers: int = 1, **options):
+    """
+    Run app with uvicorn and call on_ready(endpoint) as soon as the
+    listening sockets exist
+
+    Listens on TCP host:port (0, or a taken port with port_fallback, gives
+    an ephemeral port) and, with socket_path, also on a Unix domain socket
+    for local clients that can use it (the Electron main process); the
+    renderer keeps using TCP. With exit_after_ready, the server shuts down
+    right after on_ready (startup profiling).
+
+    With workers > 1, app must be an import string ("main:app"): the
+    sockets are bound here, then uvicorn's supervisor spawns that many
+    worker processes accepting on them, and on_ready is called once the
+    sockets listen (connections queue until a worker accepts them).
+    """
+    import uvicorn
+
+    sockets = [bind_tcp(host, port, port_fallback)]
+    unix_sock = bind_unix(socket_path) if socket_path else None
+    if unix_sock is not None:
+        sockets.append(unix_sock)
+    endpoint = Endpoint(host, sockets[0].getsockname()[1], socket_path if unix_sock is not None else None)
+
+    class ReadyServer(uvicorn.Server):
+        async def startup(self, sockets: Optional[list] = None):
+            await super().startup(sockets=sockets)
+            if self.should_exit or not self.servers:
+                return
+            on_ready(endpoint)
+            if exit_after_ready:
+                # Once the main loop runs, so the regular shutdown path (lifespan, state flush) still runs
+                asyncio.get_running_loop().call_soon(setattr, self, "should_exit", True)
+
+    try:
+        if workers > 1:
+            from uvicorn.supervisors import Multiprocess
+
+            for sock in sockets:
+                sock.listen(2048)
+            config = uvicorn.Config(app, host=host, port=port, workers=workers, **options)
+            on_ready(endpoint)
+            Multiprocess(config, target=uvicorn.Server(config).run, sockets=sockets).run()
+        else:
+            config = uvicorn.Config(app, host=host, port=port, **options)
+            ReadyServer(config).run(sockets=sockets)
+    finally:
+        if unix_sock is not None:
+            try:
+                os.unlink(socket_path)
+            except OSError:
+                pass
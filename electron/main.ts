@@ -10,6 +10,7 @@
 
 import { app, BrowserWindow, ipcMain, dialog } from 'electron';
 import { spawn } from 'child_process';
+import http from 'http';
 import path from 'path';
 import os from 'os';
 import fs from 'fs';
@@ -59,6 +60,13 @@ const __dirname = path.dirname(__filename);
 const isDev = !app.isPackaged;
 const BACKEND_PORT = 8000;
 const BACKEND_HOST = '127.0.0.1';
+// Single stdout line printed by the backend once its socket is listening:
+// AMOKK_READY {"event":"ready","port":8000,"startup":{...},...}
+const BACKEND_READY_PREFIX = 'AMOKK_READY ';
+// launcher.py supervising the backend (LAUNCHER_SUPERVISE=1) reports restarts as
+// AMOKK_SUPERVISOR {"event":"restarting","reason":"crash","backoff":0.5,"stats":{...},...}
+// and relays a new AMOKK_READY line once the restarted backend listens
+const BACKEND_SUPERVISOR_PREFIX = 'AMOKK_SUPERVISOR ';
 
 // Detect frontend-only mode (no embedded backend)
 // Check if backend directory exists in resources
@@ -138,16 +146,23 @@ function getBackendPath(): string {
   const backendDir = path.join(baseDir, 'backend');
   logger.debug('PATH_RESOLVE', 'Backend directory resolved', { backendDir });
 
-  // Build list of possible backend executable names
+  // Build list of possible backend executable names: onedir build first
+  // (dist/AMOKK-Backend/, the default), then onefile (dist/AMOKK-Backend.exe)
   // (compiled on Linux might not have .exe extension even for Windows)
+  const onedirDir = path.join(backendDir, 'dist', 'AMOKK-Backend');
   const backendExePaths: string[] = [];
   if (process.platform === 'win32') {
     backendExePaths.push(
+      path.join(onedirDir, 'AMOKK-Backend.exe'),
       path.join(backendDir, 'dist', 'AMOKK-Backend.exe'),
       path.join(backendDir, 'dist', 'AMOKK-Backend')  // Fallback: compiled on Linux
     );
   } else {
-    backendExePaths.push(path.join(backendDir, 'dist', 'AMOKK-Backend'));
+    backendExePaths.push(
+      path.join(onedirDir, 'AMOKK-Backend'),
+      path.join(backendDir, 'dist', 'AMOKK-Backend.exe'),  // onefile, renamed by build-exe.py
+      path.join(backendDir, 'dist', 'AMOKK-Backend')
+    );
   }
 
   backendPy = path.join(backendDir, 'main.py');
@@ -166,7 +181,7 @@ function getBackendPath(): string {
   for (const exePath of backendExePaths) {
     const exists = fs.existsSync(exePath);
     console.error(`Checking: ${exePath} - exists: ${exists}`);
-    if (exists) {
+    if (exists && fs.statSync(exePath).isFile()) {
       console.error('✓ Using PyInstaller executable:', exePath);
       logger.info('PATH_RESOLVE', 'Using PyInstaller executable', { exePath });
       return exePath;
@@ -181,6 +196,16 @@ function getBackendPath(): string {
   return backendPy;
 }
 
+// launcher.py sits next to dist/, whether backendPath is a onedir build
+// (dist/AMOKK-Backend/AMOKK-Backend), a onefile build (dist/AMOKK-Backend.exe)
+// or main.py itself
+function launcherPathFor(backendPath: string): string {
+  let dir = path.dirname(backendPath);
+  if (path.basename(dir) === 'AMOKK-Backend') dir = path.dirname(dir);
+  if (path.basename(dir) === 'dist') dir = path.dirname(dir);
+  return path.join(dir, 'launcher.py');
+}
+
 // ============================================================================
 // Type Definitions
 // ============================================================================
@@ -188,6 +213,7 @@ function getBackendPath(): string {
 interface BackendStatus {
   running: boolean;
   port: number;
+  socket?: string | null;
   pid?: number;
   error?: string;
 }
@@ -199,6 +225,10 @@ interface BackendStatus {
 let mainWindow: any = null;
 let pythonProcess: any = null;
 let backendReady = false;
+// Endpoint reported by the backend ready handshake: TCP port (used by the
+// renderer; BACKEND_PORT until then) and Unix socket (used by this process)
+let backendPort = BACKEND_PORT;
+let backendSocket: string | null = null;
 let backendStartAttempts = 0;
 const MAX_BACKEND_ATTEMPTS = 3;
 
@@ -295,6 +325,48 @@ async function validateEnvironment(): Promise<void> {
 // Backend Management
 // ============================================================================
 
+/**
+ * Unix domain socket path for the backend (null on Windows: TCP only)
+ */
+function getBackendSocketPath(): string | null {
+  if (process.platform === 'win32') return null;
+  const socketPath = path.join(app.getPath('userData'), 'backend.sock');
+  // sun_path is limited to ~104 bytes
+  return socketPath.length < 100 ? socketPath : path.join(os.tmpdir(), `amokk-${process.pid}.sock`);
+}
+
+/**
+ * Environment for the backend process: ask for a Unix socket next to the TCP port
+ */
+function getBackendEnv(extra: Record<string, string> = {}): NodeJS.ProcessEnv {
+  const socketPath = getBackendSocketPath();
+  return { ...process.env, ...(socketPath ? { BACKEND_SOCKET: socketPath } : {}), ...extra };
+}
+
+/**
+ * HTTP request to the backend from the main process, over the Unix socket
+ * when the backend reported one, loopback TCP otherwise
+ */
+function backendRequest(method: string, endpoint: string): Promise<{ status: number; body: string }> {
+  return new Promise((resolve, reject) => {
+    const target = backendSocket
+      ? { socketPath: backendSocket }
+      : { host: BACKEND_HOST, port: backendPort };
+    const request = http.request(
+      { ...target, method, path: endpoint, headers: { 'Content-Type': 'application/json' }, timeout: 2000 },
+      (response) => {
+        let body = '';
+        response.setEncoding('utf8');
+        response.on('data', (chunk) => { body += chunk; });
+        response.on('end', () => resolve({ status: response.statusCode || 0, body }));
+      },
+    );
+    request.on('timeout', () => request.destroy(new Error('Backend request timed out')));
+    request.on('error', reject);
+    request.end();
+  });
+}
+
 /**
  * Start the Python backend process
  */
@@ -364,7 +436,7 @@ async function startBackend(): Promise<void> {
           pythonProcess?.removeAllListeners();
 
           // Get launcher.py path (which auto-installs dependencies)
-          const backendLauncher = path.join(path.dirname(backendPath), '..', 'launcher.py');
+          const backendLauncher = launcherPathFor(backendPath);
 
           // Setup Python fallback with retry logic
           const pythonCmds: string[] = [];
@@ -396,7 +468,7 @@ async function startBackend(): Promise<void> {
               cwd: path.dirname(backendLauncher),
               stdio: ['ignore', 'pipe', 'pipe'],
               detached: false,
-              env: { ...process.env },
+              env: getBackendEnv({ LAUNCHER_SUPERVISE: '1' }),
             });
 
             pythonProcess.once('error', () => {
@@ -411,6 +483,7 @@ async function startBackend(): Promise<void> {
         pythonProcess = spawn(backendPath, [], {
           stdio: ['ignore', 'pipe', 'pipe'],
           detached: false,
+          env: getBackendEnv(),
         });
 
         pythonProcess.once('error', handleExeSpawnError);
@@ -432,7 +505,7 @@ async function startBackend(): Promise<void> {
         }
 
         // Use launcher.py which auto-installs dependencies before running main.py
-        const backendLauncher = path.join(path.dirname(backendPath), '..', 'launcher.py');
+        const backendLauncher = launcherPathFor(backendPath);
 
         let pythonCmd = pythonCmds[0];
         let spawnAttempt = 0;
@@ -460,7 +533,7 @@ async function startBackend(): Promise<void> {
             cwd: path.dirname(backendLauncher),
             stdio: ['ignore', 'pipe', 'pipe'],
             detached: false,
-            env: { ...process.env, PYTHONUNBUFFERED: '1' },
+            env: getBackendEnv({ PYTHONUNBUFFERED: '1', LAUNCHER_SUPERVISE: '1' }),
           });
 
           // Capture stdout and stderr for debugging
@@ -517,21 +590,54 @@ async function startBackend(): Promise<void> {
       }
 
       let backendOutput = '';
+      let stdoutLine = '';
       let healthCheckStarted = false;
 
+      const markReady = (source: string) => {
+        if (backendReady) return;
+        backendReady = true;
+        logger.info('BACKEND_START', 'Backend ready', { source, port: backendPort, socket: backendSocket });
+        resolve();
+      };
+
       pythonProcess.stdout?.on('data', (data) => {
         const message = data.toString();
         logger.debug('BACKEND_STDIO', 'Backend stdout', { message: message.trim() });
         backendOutput += message;
 
-        // Check if backend is ready (from log output)
-        if (
-          message.includes('Uvicorn running') ||
-          message.includes('Server running on')
-        ) {
-          logger.info('BACKEND_STDIO', 'Backend ready signal detected from logs');
-          backendReady = true;
-          resolve();
+        // Ready handshake: one JSON line, may arrive split across chunks
+        stdoutLine += message;
+        const lines = stdoutLine.split(/\r?\n/);
+        stdoutLine = lines.pop() || '';
+        for (const line of lines) {
+          if (line.startsWith(BACKEND_SUPERVISOR_PREFIX)) {
+            try {
+              const event = JSON.parse(line.slice(BACKEND_SUPERVISOR_PREFIX.length));
+              if (event.event === 'restarting') {
+                // Not ready until the restarted backend's handshake
+                backendReady = false;
+                logger.warn('BACKEND_SUPERVISOR', 'Backend restarting', event);
+              } else if (event.event === 'gave_up') {
+                backendReady = false;
+                logger.error('BACKEND_SUPERVISOR', 'Backend keeps failing, not restarting it', event);
+              } else {
+                logger.info('BACKEND_SUPERVISOR', `Supervisor ${event.event}`, event);
+              }
+            } catch (e: any) {
+              logger.warn('BACKEND_SUPERVISOR', 'Malformed supervisor event', { line, error: e.message });
+            }
+            continue;
+          }
+          if (!line.startsWith(BACKEND_READY_PREFIX)) continue;
+          try {
+            const ready = JSON.parse(line.slice(BACKEND_READY_PREFIX.length));
+            backendPort = ready.port;
+            backendSocket = ready.socket || null;
+            logger.info('BACKEND_STDIO', 'Backend ready handshake', ready);
+            markReady('handshake');
+          } catch (e: any) {
+            logger.warn('BACKEND_STDIO', 'Malformed ready handshake', { line, error: e.message });
+          }
         }
       });
 
@@ -553,21 +659,23 @@ async function startBackend(): Promise<void> {
         backendReady = false;
       });
 
-      // Start health check after short delay
+      // Fallback if the handshake line is lost (e.g. stdout not piped): poll /readyz
       setTimeout(() => {
-        if (!healthCheckStarted) {
+        if (!healthCheckStarted && !backendReady) {
           healthCheckStarted = true;
-          logger.debug('BACKEND_START', 'Starting health check polling');
-          pollBackendHealth();
+          logger.debug('BACKEND_START', 'No ready handshake yet, polling /readyz');
+          pollBackendHealth(() => markReady('readyz'));
         }
       }, 1000);
 
-      // Timeout for backend startup (20 seconds)
+      // Timeout for backend startup (20 seconds): open the window anyway,
+      // but don't pretend the backend is up (BackendStatus shows it offline)
       const startupTimeout = parseInt(process.env.BACKEND_TIMEOUT || '20000');
       setTimeout(() => {
         if (!backendReady) {
-          logger.warn('BACKEND_START', `Backend startup timeout (${startupTimeout}ms) - assuming it started`);
-          backendReady = true;
+          logger.error('BACKEND_START', `Backend not ready after ${startupTimeout}ms`, {
+            output: backendOutput.slice(-2000),
+          });
           resolve();
         }
       }, startupTimeout);
@@ -580,56 +688,36 @@ async function startBackend(): Promise<void> {
 }
 
 /**
- * Poll backend health to detect when it's ready
+ * Poll backend readiness (fallback when no ready handshake was seen)
  */
-function pollBackendHealth(): void {
-  const maxAttempts = 20; // 20 attempts * 500ms = 10 seconds
+function pollBackendHealth(onReady: () => void): void {
+  const maxAttempts = 190; // 190 attempts * 100ms, within the 20s startup timeout
   let attempts = 0;
 
   const check = async () => {
+    if (backendReady || !pythonProcess) return;
     attempts++;
     try {
-      const response = await fetch(`http://${BACKEND_HOST}:${BACKEND_PORT}/status`);
-      if (response.ok) {
-        logger.info('BACKEND_HEALTH', 'Backend is responsive!', { attempts });
-        backendReady = true;
+      const response = await backendRequest('GET', '/readyz');
+      if (response.status === 200) {
+        logger.info('BACKEND_HEALTH', 'Backend is ready', { attempts });
+        onReady();
         return;
       }
     } catch (e) {
-      // Not ready yet, continue polling
+      // Not listening yet, continue polling
     }
 
     if (attempts < maxAttempts) {
-      setTimeout(check, 500);
+      setTimeout(check, 100);
     } else {
-      logger.warn('BACKEND_HEALTH', 'Health check max attempts reached', { maxAttempts });
-      backendReady = true;
+      logger.warn('BACKEND_HEALTH', 'Readiness polling max attempts reached', { maxAttempts });
     }
   };
 
   check();
 }
 
-/**
- * Call backend logout endpoint before shutdown
- */
-async function callBackendLogout(): Promise<void> {
-  try {
-    logger.info('BACKEND_LOGOUT', 'Calling logout endpoint');
-    const response = await fetch(`http://${BACKEND_HOST}:${BACKEND_PORT}/logout`, {
-      method: 'POST',
-      headers: { 'Content-Type': 'application/json' },
-    });
-    if (response.ok) {
-      logger.info('BACKEND_LOGOUT', 'Logout successful');
-    } else {
-      logger.warn('BACKEND_LOGOUT', 'Logout failed', { status: response.status });
-    }
-  } catch (error: any) {
-    logger.warn('BACKEND_LOGOUT', 'Failed to call logout endpoint', { error: error.message });
-  }
-}
-
 /**
  * Stop the Python backend process
  */
@@ -653,8 +741,8 @@ function stopBackend(): void {
 async function checkBackendHealth(): Promise<boolean> {
   try {
     logger.trace('BACKEND_HEALTH', 'Checking backend health');
-    const response = await fetch(`http://${BACKEND_HOST}:${BACKEND_PORT}/status`);
-    const isHealthy = response.ok;
+    const response = await backendRequest('GET', '/healthz');
+    const isHealthy = response.status === 200;
     logger.trace('BACKEND_HEALTH', 'Backend health check result', { isHealthy, status: response.status });
     return isHealthy;
   } catch (error: any) {
@@ -783,6 +871,11 @@ async function createWindow(): Promise<void> {
     console.log(`📄 Frontend path: ${frontendPath}`);
   }
 
+  // Tell the renderer which TCP port the backend actually bound
+  if (!isFrontendOnly) {
+    loadURL += `?backendPort=${backendPort}`;
+  }
+
   console.log(`📍 Loading URL: ${loadURL}`);
 
   // Capture console messages from renderer process
@@ -870,7 +963,8 @@ function setupIPC(): void {
     const healthy = await checkBackendHealth();
     return {
       running: backendReady && healthy,
-      port: BACKEND_PORT,
+      port: backendPort,
+      socket: backendSocket,
       pid: pythonProcess?.pid,
     };
   });
@@ -888,7 +982,7 @@ function setupIPC(): void {
       version: app.getVersion(),
       platform: process.platform,
       arch: process.arch,
-      backendPort: BACKEND_PORT,
+      backendPort,
       isDev,
     };
   });
@@ -1041,23 +1135,12 @@ app.on('activate', async () => {
 });
 
 /**
- * Handle app will-quit event to call logout before shutdown
+ * Handle app will-quit event
+ * (no logout: the session token is kept so the next start skips the login form)
  */
-let logoutCalled = false;
-app.on('will-quit', async (event) => {
-  if (!logoutCalled) {
-    event.preventDefault();
-    logoutCalled = true;
-
-    logger.separator('AMOKK APPLICATION CLOSING');
-    logger.info('SHUTDOWN', 'App will-quit event triggered');
-
-    // Call backend logout endpoint
-    await callBackendLogout();
-
-    // Now actually quit
-    app.quit();
-  }
+app.on('will-quit', () => {
+  logger.separator('AMOKK APPLICATION CLOSING');
+  logger.info('SHUTDOWN', 'App will-quit event triggered');
 });
 
 /**
@@ -6,6 +6,19 @@
 
 import { useState, useEffect, useRef } from 'react';
 import { useDebug } from '@/context/DebugContext';
+import { BackendLogRecord, getBackendLogs } from '@/lib/api';
+
+// Backend log records kept in the panel, and how often GET /logs is polled
+const MAX_BACKEND_LOGS = 200;
+const BACKEND_LOGS_POLL_MS = 2000;
+
+const LOG_LEVEL_COLORS: Record<string, string> = {
+  DEBUG: 'text-slate-500',
+  INFO: 'text-cyan-400',
+  WARNING: 'text-yellow-300',
+  ERROR: 'text-red-400',
+  CRITICAL: 'text-red-400',
+};
 
 interface TestGuide {
   name: string;
@@ -128,7 +141,9 @@ export function DebugPanel() {
   const { debugData, clearDebugData } = useDebug();
   const [expanded, setExpanded] = useState(false);
   const [isHidden, setIsHidden] = useState(false);
-  const [activeTab, setActiveTab] = useState<'debug' | 'guidelines'>('debug');
+  const [activeTab, setActiveTab] = useState<'debug' | 'backend' | 'guidelines'>('debug');
+  const [backendLogs, setBackendLogs] = useState<BackendLogRecord[]>([]);
+  const lastLogSeq = useRef(0);
   const [position, setPosition] = useState({ x: window.innerWidth - 400, y: 60 });
   const [isDragging, setIsDragging] = useState(false);
   const [dragOffset, setDragOffset] = useState({ x: 0, y: 0 });
@@ -169,6 +184,37 @@ export function DebugPanel() {
     callback();
   };
 
+  // Poll the backend's in-memory log ring buffer while the Backend tab is open
+  useEffect(() => {
+    if (!isDev || !expanded || activeTab !== 'backend') return;
+    let cancelled = false;
+
+    const poll = async () => {
+      try {
+        const data = await getBackendLogs(lastLogSeq.current);
+        if (cancelled || !Array.isArray(data.records)) return;
+        if (data.last < lastLogSeq.current) {
+          // Backend restarted: sequence numbers start over
+          lastLogSeq.current = 0;
+          return;
+        }
+        lastLogSeq.current = data.last;
+        if (data.records.length > 0) {
+          setBackendLogs(prev => [...data.records.reverse(), ...prev].slice(0, MAX_BACKEND_LOGS));
+        }
+      } catch {
+        // Backend not reachable (yet): try again on the next tick
+      }
+    };
+
+    poll();
+    const timer = setInterval(poll, BACKEND_LOGS_POLL_MS);
+    return () => {
+      cancelled = true;
+      clearInterval(timer);
+    };
+  }, [isDev, expanded, activeTab]);
+
   if (!isDev) return null;
 
   // Drag and drop with global event listeners
@@ -259,6 +305,16 @@ export function DebugPanel() {
 
         {/* Buttons */}
         <div className="flex gap-1" onClick={blockEvent}>
+          {expanded && activeTab === 'backend' && backendLogs.length > 0 && (
+            <button
+              onClick={withBlockedEvent(() => setBackendLogs([]))}
+              className="px-2 py-1 text-xs bg-red-900 hover:bg-red-800 text-red-300 rounded border border-red-700 transition-colors"
+              title="Clear backend logs"
+            >
+              Clear
+            </button>
+          )}
+
           {expanded && activeTab === 'debug' && debugData.length > 0 && (
             <button
               onClick={withBlockedEvent(clearDebugData)}
@@ -293,6 +349,16 @@ export function DebugPanel() {
             >
               💾 Debug
             </button>
+            <button
+              onClick={withBlockedEvent(() => setActiveTab('backend'))}
+              className={`flex-1 px-3 py-2 text-xs font-semibold transition-colors ${
+                activeTab === 'backend'
+                  ? 'bg-cyan-900 text-cyan-300 border-b-2 border-cyan-500'
+                  : 'text-slate-400 hover:text-cyan-400'
+              }`}
+            >
+              🖥️ Backend
+            </button>
             <button
               onClick={withBlockedEvent(() => setActiveTab('guidelines'))}
               className={`flex-1 px-3 py-2 text-xs font-semibold transition-colors ${
@@ -329,6 +395,27 @@ export function DebugPanel() {
                   ))
                 )}
               </>
+            ) : activeTab === 'backend' ? (
+              <>
+                {backendLogs.length === 0 ? (
+                  <div className="text-slate-400">Waiting for backend logs...</div>
+                ) : (
+                  backendLogs.map((record) => (
+                    <div key={record.seq} className="bg-slate-800 px-2 py-1 rounded border border-cyan-900">
+                      <div className="flex gap-2">
+                        <span className="text-slate-500">{new Date(record.ts * 1000).toLocaleTimeString()}</span>
+                        <span className={`font-bold ${LOG_LEVEL_COLORS[record.level] || 'text-cyan-400'}`}>
+                          {record.level}
+                        </span>
+                        {record.logger !== 'amokk' && (
+                          <span className="text-slate-500">{record.logger.replace('amokk.', '')}</span>
+                        )}
+                      </div>
+                      <div className="text-cyan-400 whitespace-pre-wrap break-words">{record.msg}</div>
+                    </div>
+                  ))
+                )}
+              </>
             ) : (
               <>
                 {PAGE_GUIDELINES.map((pageGuide) => (
@@ -1,7 +1,13 @@
 import logo from "@/assets/logo.png";
+import { LogOut } from "lucide-react";
+import { Button } from "@/components/ui/button";
 import { useLanguage } from "@/context/LanguageContext";
 
-const DashboardHeader = () => {
+interface DashboardHeaderProps {
+  onLogout: () => void;
+}
+
+const DashboardHeader = ({ onLogout }: DashboardHeaderProps) => {
   const { t } = useLanguage();
 
   return (
@@ -10,6 +16,10 @@ const DashboardHeader = () => {
         <img src={logo} alt="AMOKK" className="h-12 w-12" />
         <h1 className="text-3xl font-bold glow-text">{t('components.dashboard.DashboardHeader.title')}</h1>
       </div>
+      <Button variant="outline" onClick={onLogout}>
+        <LogOut className="h-4 w-4 mr-2" />
+        {t('components.dashboard.DashboardHeader.logout')}
+      </Button>
     </header>
   );
 };
@@ -2,6 +2,8 @@ import { Dialog, DialogContent, DialogDescription, DialogHeader, DialogTitle, Di
 import { Card, CardContent } from "@/components/ui/card";
 import { Sparkles, Rocket, Brain, Swords, Target, Zap } from "lucide-react";
 import { useLanguage } from "@/context/LanguageContext";
+import { useEffect, useState } from "react";
+import { getProgress, ProgressBucket } from "@/lib/api";
 
 interface ProgressDialogProps {
   open: boolean;
@@ -10,6 +12,19 @@ interface ProgressDialogProps {
 
 const ProgressDialog = ({ open, onOpenChange }: ProgressDialogProps) => {
     const { t } = useLanguage();
+    const [week, setWeek] = useState<ProgressBucket | null>(null);
+    const [totalGames, setTotalGames] = useState(0);
+
+    // History rollups of this week (GET /progress), fetched each time the dialog opens
+    useEffect(() => {
+      if (!open) return;
+      getProgress('week', 1)
+        .then((data) => {
+          setWeek(data.buckets[data.buckets.length - 1] ?? null);
+          setTotalGames(data.totals.games);
+        })
+        .catch(() => setWeek(null));
+    }, [open]);
 
     return (
         <Dialog open={open} onOpenChange={onOpenChange}>
@@ -50,6 +65,24 @@ const ProgressDialog = ({ open, onOpenChange }: ProgressDialogProps) => {
               </DialogDescription>
             </DialogHeader>
             <div className="space-y-8 py-6 relative">
+              {week && totalGames > 0 && (
+                <div className="space-y-4 text-center px-4">
+                  <h4 className="text-2xl font-bold text-foreground">{t('components.dashboard.ProgressDialog.stats_title')}</h4>
+                  <div className="grid grid-cols-3 gap-4">
+                    {[
+                      [week.games, 'stats_week_games'],
+                      [Math.round(week.coached_minutes), 'stats_week_coached'],
+                      [totalGames, 'stats_total_games'],
+                    ].map(([value, key]) => (
+                      <div key={key} className="p-4 rounded-2xl bg-gradient-to-br from-primary/20 via-accent/10 to-transparent border border-primary/30">
+                        <p className="text-3xl font-bold bg-gradient-to-r from-primary to-accent bg-clip-text text-transparent">{value}</p>
+                        <p className="text-sm text-muted-foreground">{t(`components.dashboard.ProgressDialog.${key}`)}</p>
+                      </div>
+                    ))}
+                  </div>
+                </div>
+              )}
+
               <div className="space-y-4 text-center px-4">
                 <h4 className="text-2xl font-bold text-foreground">{t('components.dashboard.ProgressDialog.why_title')}</h4>
                 <p className="text-base text-muted-foreground leading-relaxed max-w-2xl mx-auto">
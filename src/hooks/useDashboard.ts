@@ -1,10 +1,12 @@
 import { useState, useEffect, useRef } from "react";
+import { useNavigate } from "react-router-dom";
 import { useDebugPanel } from "@/hooks/useDebugPanel";
 import { logger } from "@/utils/logger";
 import * as api from "@/lib/api";
 
 export const useDashboard = () => {
   const debug = useDebugPanel();
+  const navigate = useNavigate();
   const volumeDebounceRef = useRef<NodeJS.Timeout | null>(null);
 
   const [amokkToggle, setAmokkToggle] = useState(false);
@@ -20,25 +22,24 @@ export const useDashboard = () => {
   const [troubleshootOpen, setTroubleshootOpen] = useState(false);
 
   useEffect(() => {
-    fetchLocalData();
-
-    const interval_id = setInterval(() => {
-      fetchLocalData();
-    }, 10000);
-
-    return () => clearInterval(interval_id);
-  }, []);
-
-  useEffect(() => {
-    const handle_before_unload = () => {
-      clean_exit();
-    };
-
-    window.addEventListener('beforeunload', handle_before_unload);
-
-    return () => {
-      window.removeEventListener('beforeunload', handle_before_unload);
-    };
+    // Snapshot on connect, then only changed fields; EventSource reconnects on its own
+    const unsubscribe = api.subscribeLocalData(
+      (data) => {
+        debug.log('STREAM_LOCAL_DATA', data);
+        applyLocalData(data);
+      },
+      () => {
+        logger.error('STREAM_LOCAL_DATA disconnected, retrying');
+      },
+      () => {
+        // Token expired or revoked: back to the login form
+        logger.error('STREAM_LOCAL_DATA not authenticated, back to login');
+        api.clearAuthToken();
+        navigate("/login");
+      },
+    );
+
+    return unsubscribe;
   }, []);
 
   useEffect(() => {
@@ -49,25 +50,16 @@ export const useDashboard = () => {
     };
   }, []);
 
-  const fetchLocalData = async () => {
-    try {
-      logger.api('GET', '/get_local_data');
-      const data = await api.getLocalData();
-      debug.log('GET_LOCAL_DATA', data);
-      logger.apiResponse('/get_local_data', 200, data);
-
-      if (data.remaining_games !== undefined) setRemainingGames(data.remaining_games);
-      if (data.plan_id !== undefined) setUserPlanId(data.plan_id);
-      if (data.amokk_toggle !== undefined) setAmokkToggle(data.amokk_toggle);
-      if (data.assistant_toggle !== undefined) setAssistantToggle(data.assistant_toggle);
-      if (data.coach_toggle !== undefined) setProactiveCoachEnabled(data.coach_toggle);
-      if (data.ptt_key !== undefined) setPushToTalkKey(data.ptt_key);
-      if (data.tts_volume !== undefined) setVolume([data.tts_volume]);
-      if (data.first_launch === true) setProgressDialogOpen(true);
-    } catch (error) {
-      logger.error('GET_LOCAL_DATA failed', error);
-      debug.log('GET_LOCAL_DATA_ERROR', { error: error instanceof Error ? error.message : 'Unknown error' });
-    }
+  // Accepts a full payload or a partial change event
+  const applyLocalData = (data: Record<string, any>) => {
+    if (data.remaining_games !== undefined) setRemainingGames(data.remaining_games);
+    if (data.plan_id !== undefined) setUserPlanId(data.plan_id);
+    if (data.amokk_toggle !== undefined) setAmokkToggle(data.amokk_toggle);
+    if (data.assistant_toggle !== undefined) setAssistantToggle(data.assistant_toggle);
+    if (data.coach_toggle !== undefined) setProactiveCoachEnabled(data.coach_toggle);
+    if (data.ptt_key !== undefined) setPushToTalkKey(data.ptt_key);
+    if (data.tts_volume !== undefined) setVolume([data.tts_volume]);
+    if (data.first_launch === true) setProgressDialogOpen(true);
   };
 
   const handleAmokkToggle = async (newState: boolean) => {
@@ -190,10 +182,13 @@ export const useDashboard = () => {
     }
   };
 
-  const clean_exit = () => {
+  // Explicit logout only: closing or reloading the window keeps the session,
+  // so the next start skips the login form (GET /auth/session)
+  const handleLogout = () => {
     logger.api('POST', '/logout (beacon)');
     api.logout();
     debug.log('LOGOUT', { status: 'dispatched' });
+    navigate("/login");
   };
 
   const handleTestVolume = () => {
@@ -225,5 +220,6 @@ export const useDashboard = () => {
     selectPlan,
     toggleProactiveCoach,
     contactSupport,
+    handleLogout,
   };
 };
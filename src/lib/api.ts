@@ -1,12 +1,34 @@
 const BACKEND_HOST = import.meta.env.VITE_BACKEND_HOST || '127.0.0.1';
-const BACKEND_PORT = import.meta.env.VITE_BACKEND_PORT || '8000';
-const BACKEND_URL = `http://${BACKEND_HOST}:${BACKEND_PORT}`;
+// Electron passes the port the backend actually bound as ?backendPort=
+const BACKEND_PORT =
+    new URLSearchParams(window.location.search).get('backendPort') || import.meta.env.VITE_BACKEND_PORT || '8000';
+export const BACKEND_URL = `http://${BACKEND_HOST}:${BACKEND_PORT}`;
 
-const apiRequest = async (method: string, endpoint: string, body?: any) => {
+// Session token returned by POST /login, sent with every request
+const AUTH_TOKEN_KEY = 'auth_token';
+export const getAuthToken = () => localStorage.getItem(AUTH_TOKEN_KEY);
+export const setAuthToken = (token: string) => localStorage.setItem(AUTH_TOKEN_KEY, token);
+export const clearAuthToken = () => localStorage.removeItem(AUTH_TOKEN_KEY);
+
+const authHeaders = (): Record<string, string> => {
+    const token = getAuthToken();
+    return token ? { Authorization: `Bearer ${token}` } : {};
+};
+
+// EventSource and sendBeacon can't set headers: the token goes in the query string
+const withAccessToken = (endpoint: string) => {
+    const token = getAuthToken();
+    return token ? `${BACKEND_URL}${endpoint}?access_token=${encodeURIComponent(token)}` : `${BACKEND_URL}${endpoint}`;
+};
+
+// Identifies this window to the backend rate limiter (one id per page load)
+const CLIENT_ID = crypto.randomUUID();
+
+const apiRequest = async (method: string, endpoint: string, body?: any, headers?: Record<string, string>) => {
     const url = `${BACKEND_URL}${endpoint}`;
     const options: RequestInit = {
         method,
-        headers: { 'Content-Type': 'application/json' },
+        headers: { 'Content-Type': 'application/json', 'X-Client-Id': CLIENT_ID, ...authHeaders(), ...headers },
     };
     if (body) {
         options.body = JSON.stringify(body);
@@ -16,21 +38,141 @@ const apiRequest = async (method: string, endpoint: string, body?: any) => {
 }
 
 export const getLocalData = () => apiRequest('GET', '/get_local_data');
-export const toggleAmokkCoach = (active: boolean) => apiRequest('PUT', '/amokk_toggle', { active });
-export const toggleAssistant = (active: boolean) => apiRequest('PUT', '/assistant_toggle', { active });
-export const updateVolume = (volume: number) => apiRequest('PUT', '/update_volume', { volume });
-export const updatePttKey = (ptt_key: string) => apiRequest('PUT', '/update_ptt_key', { ptt_key });
+
+/**
+ * Whether the stored token is still valid (GET /auth/session).
+ * Resolves to { authenticated, email, expires_at }; email is the last
+ * account used on this machine when not authenticated.
+ */
+export const getAuthSession = () => apiRequest('GET', '/auth/session');
+
+// Delay before reopening a stream the server refused (503 shedding, 429...)
+const STREAM_RETRY_MS = 5000;
+
+/**
+ * Subscribe to GET /stream (Server-Sent Events).
+ * onData receives the full snapshot on (re)connect, then partial objects
+ * containing only the fields that changed. Returns an unsubscribe function.
+ *
+ * EventSource reconnects on its own after a dropped connection, but gives
+ * up (readyState CLOSED) on an error status such as 401. The token is then
+ * checked (GET /auth/session): if it is no longer valid, the stream stays
+ * closed and onAuthError is called; otherwise it is reopened after a delay.
+ */
+export const subscribeLocalData = (
+    onData: (data: Record<string, any>) => void,
+    onError?: (event: Event) => void,
+    onAuthError?: () => void,
+) => {
+    let source: EventSource | null = null;
+    let retryTimer: ReturnType<typeof setTimeout> | null = null;
+    let stopped = false;
+    const handle = (event: MessageEvent) => onData(JSON.parse(event.data));
+
+    const connect = () => {
+        const current = new EventSource(withAccessToken('/stream'));
+        source = current;
+        current.addEventListener('snapshot', handle);
+        current.addEventListener('change', handle);
+        current.onerror = async (event) => {
+            onError?.(event);
+            if (stopped || current.readyState !== EventSource.CLOSED) {
+                return;
+            }
+            try {
+                const session = await getAuthSession();
+                if (!session.authenticated) {
+                    stop();
+                    onAuthError?.();
+                    return;
+                }
+            } catch {
+                // Backend unreachable: try again later
+            }
+            if (!stopped) {
+                retryTimer = setTimeout(connect, STREAM_RETRY_MS);
+            }
+        };
+    };
+
+    const stop = () => {
+        stopped = true;
+        if (retryTimer) {
+            clearTimeout(retryTimer);
+        }
+        source?.close();
+    };
+
+    connect();
+    return stop;
+};
+
+export interface ConfigFields {
+    coach_toggle?: boolean;
+    assistant_toggle?: boolean;
+    amokk_toggle?: boolean;
+    proactive_coach_toggle?: boolean;
+    ptt_key?: string;
+    tts_volume?: number;
+}
+
+/**
+ * Apply any subset of the configuration fields in one request (PATCH /config).
+ * Pass the last seen state version to get a 412 instead of overwriting a newer change.
+ */
+export const patchConfig = (fields: ConfigFields, version?: number) =>
+    apiRequest('PATCH', '/config', fields, version !== undefined ? { 'If-Match': `"${version}"` } : undefined);
+
+export const toggleAmokkCoach = (active: boolean) => patchConfig({ amokk_toggle: active });
+export const toggleAssistant = (active: boolean) => patchConfig({ assistant_toggle: active });
+export const updateVolume = (volume: number) => patchConfig({ tts_volume: volume });
+export const updatePttKey = (ptt_key: string) => patchConfig({ ptt_key });
 export const selectPlan = (plan_id: number) => apiRequest('POST', '/mock_select_plan', { plan_id });
-export const toggleProactiveCoach = (active: boolean) => apiRequest('PUT', '/coach_toggle', { active });
+export const getSession = () => apiRequest('GET', '/session');
+
+export interface BackendLogRecord {
+    seq: number;
+    ts: number;  // Unix time (seconds)
+    level: string;
+    logger: string;
+    msg: string;
+    [field: string]: any;  // Structured extras (route, status, duration_ms...)
+}
+
+/**
+ * Recent backend log records newer than `since` (GET /logs), oldest first.
+ * Resolves to { records, last }; pass `last` as `since` on the next call.
+ */
+export const getBackendLogs = (since: number = 0) => apiRequest('GET', `/logs?since=${since}`);
+export interface ProgressBucket {
+    start: string | null;  // First day of the bucket (YYYY-MM-DD)
+    games: number;
+    played_minutes: number;
+    coached_minutes: number;
+    toggles: number;
+}
+
+/**
+ * Games, coached time and toggles of the logged-in account per day or week
+ * (GET /progress), the last `buckets` ones ending today, plus all-time totals.
+ * Resolves to { period, buckets, totals }.
+ */
+export const getProgress = (period: 'day' | 'week' = 'day', buckets: number = 14) =>
+    apiRequest('GET', `/progress?period=${period}&buckets=${buckets}`);
+export const startSession = () => apiRequest('POST', '/session/start');
+export const pauseSession = () => apiRequest('POST', '/session/pause');
+export const endSession = () => apiRequest('POST', '/session/end');
+export const toggleProactiveCoach = (active: boolean) => patchConfig({ coach_toggle: active });
 export const contactSupport = () => {
     window.location.href = 'mailto:contact@amokk.fr';
 };
 export const logout = () => {
-    const url = `${BACKEND_URL}/logout`;
+    const url = withAccessToken('/logout');
     if (navigator.sendBeacon) {
         navigator.sendBeacon(url);
     } else {
         // Fallback for older browsers
         apiRequest('POST', '/logout');
     }
+    clearAuthToken();
 };
@@ -32,11 +32,12 @@ const Dashboard = () => {
     selectPlan,
     toggleProactiveCoach,
     contactSupport,
+    handleLogout,
   } = useDashboard();
 
   return (
     <div className="min-h-screen p-6">
-      <DashboardHeader />
+      <DashboardHeader onLogout={handleLogout} />
 
       <div className="max-w-4xl mx-auto space-y-6">
         <RemainingGamesCard
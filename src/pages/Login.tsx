@@ -7,14 +7,10 @@ import { Card, CardContent, CardDescription, CardHeader, CardTitle } from "@/com
 import { Eye, EyeOff } from "lucide-react";
 import logo from "@/assets/logo.png";
 import { logger } from "@/utils/logger";
+import { BACKEND_URL, getAuthSession, setAuthToken } from "@/lib/api";
 import { useDebugPanel } from "@/hooks/useDebugPanel";
 import { useLanguage } from "@/context/LanguageContext";
 
-// Backend API URL from environment variables
-const BACKEND_HOST = import.meta.env.VITE_BACKEND_HOST || '127.0.0.1';
-const BACKEND_PORT = import.meta.env.VITE_BACKEND_PORT || '8000';
-const BACKEND_URL = `http://${BACKEND_HOST}:${BACKEND_PORT}`;
-
 const Login = () => {
   const navigate = useNavigate();
   const debug = useDebugPanel();
@@ -25,16 +21,20 @@ const Login = () => {
   const [isLoading, setIsLoading] = useState(false);
   const [errorMessage, setErrorMessage] = useState("");
 
-  // Fetch local data to autofill email
+  // Skip the form while the stored token is still valid, otherwise autofill email
   useEffect(() => {
-    const fetch_local_data = async () => {
+    const fetch_auth_session = async () => {
       try {
-        logger.api('GET', '/get_local_data');
-        const response = await fetch(`${BACKEND_URL}/get_local_data`);
-        const data = await response.json();
+        logger.api('GET', '/auth/session');
+        const data = await getAuthSession();
+
+        debug.log('AUTH_SESSION', data);
+        logger.apiResponse('/auth/session', 200, data);
 
-        debug.log('GET_LOCAL_DATA', data);
-        logger.apiResponse('/get_local_data', response.status, data);
+        if (data.authenticated) {
+          navigate("/dashboard");
+          return;
+        }
 
         if (data.email) {
           setEmail(data.email);
@@ -45,10 +45,10 @@ const Login = () => {
           setPassword("admin");
         }
       } catch (error) {
-        logger.error('GET_LOCAL_DATA failed', error);
-        debug.log('GET_LOCAL_DATA_ERROR', {
+        logger.error('AUTH_SESSION failed', error);
+        debug.log('AUTH_SESSION_ERROR', {
           error: error instanceof Error ? error.message : 'Unknown error',
-          url: `${BACKEND_URL}/get_local_data`,
+          url: `${BACKEND_URL}/auth/session`,
           method: 'GET'
         });
 
@@ -60,8 +60,8 @@ const Login = () => {
       }
     };
 
-    fetch_local_data();
-  }, [isDev]);
+    fetch_auth_session();
+  }, [isDev, navigate]);
   const [showPassword, setShowPassword] = useState(false);
 
   const handleLogin = async () => {
@@ -86,8 +86,8 @@ const Login = () => {
       debug.log("LOGIN RESPONSE", data);
       logger.success("Login successful", data);
 
-      // Store token (optional - for future use)
-      localStorage.setItem("auth_token", data.token);
+      // Sent with every later request (Authorization: Bearer <token>)
+      setAuthToken(data.token);
 
       navigate("/dashboard");
     } catch (error) {